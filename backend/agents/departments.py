@@ -0,0 +1,265 @@
+# departments.py
+"""
+Department names: the lookup tables and one shared index over them.
+
+Two lookups map free text to the department dropdown values:
+  - normalize_department(): NER model output / any department string;
+    exact match in EXACT_DEPARTMENTS, else the first key (in table order)
+    that contains or is contained in the text, else keyword rules.
+  - map_department(): text matched by the DEPARTMENT_PATTERNS fallback;
+    the first DEPARTMENT_MAPPING key (in table order) that contains or is
+    contained in the text.
+
+Both used to rebuild / linearly scan their table on every call. DEPARTMENTS
+indexes the keys of both tables once:
+  - `key in text`: a trie of all keys compiled into one regex, tried at
+    every offset of the text; it yields the longest key starting at each
+    offset, and the other keys starting there are exactly the keys that are
+    prefixes of it (precomputed);
+  - `text in key`: a dict from every substring of every key to the first
+    key (per table) containing it.
+Candidates are then ranked by each table's own key order, so results are
+exactly those of the linear scans. Both functions are lru_cached on their
+input string; department strings repeat a lot across documents.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Exact mapping to match your database/dropdown values (used by map_department)
+DEPARTMENT_MAPPING = {
+    'AIML': 'AIML',
+    'AI & ML': 'AIML',
+    'AI&ML': 'AIML',
+    'ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING': 'AIML',
+    'COMPUTER SCIENCE AND ENGINEERING (ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING)': 'AIML',
+    'CSE(AI & ML)': 'AIML',
+    'CSE(AIML)': 'AIML',
+    'CSE (AI&ML)': 'AIML',
+
+    'AEROSPACE': 'AERO',
+    'AERO': 'AERO',
+    'CSE(AEROSPACE)': 'AERO',
+    'COMPUTER SCIENCE AND ENGINEERING (AEROSPACE)': 'AERO',
+
+    'CYBERSECURITY': 'CSE-CY',
+    'CYBER SECURITY': 'CSE-CY',
+    'CYBER': 'CSE-CY',
+    'CSE(CYBERSECURITY)': 'CSE-CY',
+    'COMPUTER SCIENCE AND ENGINEERING (CYBERSECURITY)': 'CSE-CY',
+
+    'DATA SCIENCE': 'CSE-DS',
+    'DS': 'CSE-DS',
+    'CSE(DATA SCIENCE)': 'CSE-DS',
+    'COMPUTER SCIENCE AND ENGINEERING (DATA SCIENCE)': 'CSE-DS',
+
+    'CSE': 'CSE(Core)',
+    'CSE CORE': 'CSE(Core)',
+    'CSE-CORE': 'CSE(Core)',
+    'CSE (CORE)': 'CSE(Core)',
+    'COMPUTER SCIENCE AND ENGINEERING': 'CSE(Core)',
+    'CSE - CORE': 'CSE(Core)',
+
+    'ISE': 'ISE',
+    'INFORMATION SCIENCE': 'ISE',
+    'INFORMATION SCIENCE AND ENGINEERING': 'ISE',
+
+    'ECE': 'ECE',
+    'ELECTRONICS': 'ECE',
+    'ELECTRONICS AND COMMUNICATION': 'ECE',
+    'ELECTRONICS AND COMMUNICATION ENGINEERING': 'ECE',
+}
+
+
+# Exact mapping to valid dropdown values (used by normalize_department)
+EXACT_DEPARTMENTS = {
+    # AIML variants
+    'AIML': 'AIML',
+    'AI & ML': 'AIML',
+    'AI&ML': 'AIML',
+    'AI ML': 'AIML',
+    'ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING': 'AIML',
+    'ARTIFICIAL INTELLIGENCE & MACHINE LEARNING': 'AIML',
+    'COMPUTER SCIENCE AND ENGINEERING (ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING)': 'AIML',
+    'COMPUTER SCIENCE AND ENGINEERING (AI & ML)': 'AIML',
+    'COMPUTER SCIENCE AND ENGINEERING (AIML)': 'AIML',
+    'CSE(AI & ML)': 'AIML',
+    'CSE(AIML)': 'AIML',
+    'CSE (AI&ML)': 'AIML',
+    'CSE ( AIML )': 'AIML',
+    'CSE-AIML': 'AIML',
+    
+    # Aerospace variants
+    'AEROSPACE': 'AERO',
+    'AERO': 'AERO',
+    'AERONAUTICS': 'AERO',
+    'CSE(AEROSPACE)': 'AERO',
+    'CSE (AEROSPACE)': 'AERO',
+    'COMPUTER SCIENCE AND ENGINEERING (AEROSPACE)': 'AERO',
+    'COMPUTER SCIENCE AND ENGINEERING ( AEROSPACE )': 'AERO',
+    
+    # Cybersecurity variants
+    'CYBERSECURITY': 'CSE-CY',
+    'CYBER SECURITY': 'CSE-CY',
+    'CYBER': 'CSE-CY',
+    'CSE-CY': 'CSE-CY',
+    'CSE(CYBERSECURITY)': 'CSE-CY',
+    'CSE (CYBERSECURITY)': 'CSE-CY',
+    'COMPUTER SCIENCE AND ENGINEERING (CYBERSECURITY)': 'CSE-CY',
+    'COMPUTER SCIENCE AND ENGINEERING ( CYBERSECURITY )': 'CSE-CY',
+    'CYBER SECURITY': 'CSE-CY',
+    
+    # Data Science variants
+    'DATA SCIENCE': 'CSE-DS',
+    'DS': 'CSE-DS',
+    'CSE-DS': 'CSE-DS',
+    'CSE(DATA SCIENCE)': 'CSE-DS',
+    'CSE (DATA SCIENCE)': 'CSE-DS',
+    'COMPUTER SCIENCE AND ENGINEERING (DATA SCIENCE)': 'CSE-DS',
+    'COMPUTER SCIENCE AND ENGINEERING ( DATA SCIENCE )': 'CSE-DS',
+    
+    # CSE Core variants
+    'CSE': 'CSE(Core)',
+    'CSE CORE': 'CSE(Core)',
+    'CSE-CORE': 'CSE(Core)',
+    'CSE (CORE)': 'CSE(Core)',
+    'CSE(CORE)': 'CSE(Core)',
+    'COMPUTER SCIENCE': 'CSE(Core)',
+    'COMPUTER SCIENCE AND ENGINEERING': 'CSE(Core)',
+    'COMPUTER SCIENCE AND ENGINEERING (CORE)': 'CSE(Core)',
+    'COMPUTER SCIENCE & ENGINEERING': 'CSE(Core)',
+    'CSE - CORE': 'CSE(Core)',
+    'COMPUTER SCIENCE AND ENGINEERING ( CSE - CORE )': 'CSE(Core)',
+    
+    # ISE variants
+    'ISE': 'ISE',
+    'INFORMATION SCIENCE': 'ISE',
+    'INFORMATION SCIENCE AND ENGINEERING': 'ISE',
+    'INFORMATION SCIENCE & ENGINEERING': 'ISE',
+    
+    # ECE variants
+    'ECE': 'ECE',
+    'ELECTRONICS': 'ECE',
+    'ELECTRONICS AND COMMUNICATION': 'ECE',
+    'ELECTRONICS AND COMMUNICATION ENGINEERING': 'ECE',
+    'ELECTRONICS & COMMUNICATION ENGINEERING': 'ECE',
+}
+
+
+def _trie_regex(keys) -> str:
+    """Regex matching the longest of `keys` at a position, as a trie:
+    shared prefixes are matched once, longer continuations are tried first."""
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        alt = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{alt})?' if '' in node else alt
+
+    return build(trie)
+
+
+class DepartmentIndex:
+    """Containment index over the keys of several ordered {KEY: value} tables."""
+
+    def __init__(self, **tables: Dict[str, str]):
+        self.tables = tables
+        # Per table: key -> position in that table (the linear scans' order)
+        self.rank = {name: {k: i for i, k in enumerate(t)} for name, t in tables.items()}
+        self.values = {name: list(t.values()) for name, t in tables.items()}
+
+        keys = list(dict.fromkeys(k for t in tables.values() for k in t))
+        self.starts_re = re.compile('(?=(' + _trie_regex(keys) + '))')
+        self.prefix_keys = {k: tuple(p for p in keys if k.startswith(p)) for k in keys}
+
+        # Per table: every substring of a key -> best rank of a key containing it
+        self.containing: Dict[str, Dict[str, int]] = {}
+        for name, table in tables.items():
+            best = self.containing[name] = {}
+            for r, key in enumerate(table):
+                for i in range(len(key)):
+                    for j in range(i + 1, len(key) + 1):
+                        best.setdefault(key[i:j], r)
+
+    def exact(self, table: str, text: str) -> Optional[str]:
+        return self.tables[table].get(text)
+
+    def contained(self, table: str, text: str) -> Optional[str]:
+        """Value of the first key of `table` (in table order) for which
+        `key in text or text in key`; None if there is none."""
+        if not text:
+            # '' is contained in every key
+            return next(iter(self.tables[table].values()), None)
+
+        rank = self.rank[table]
+        best = self.containing[table].get(text, len(rank))  # text in key
+        prefix_keys = self.prefix_keys
+        for m in self.starts_re.finditer(text):              # key in text
+            for key in prefix_keys[m.group(1)]:
+                r = rank.get(key, best)
+                if r < best:
+                    best = r
+        return self.values[table][best] if best < len(rank) else None
+
+
+DEPARTMENTS = DepartmentIndex(exact=EXACT_DEPARTMENTS, mapping=DEPARTMENT_MAPPING)
+
+
+@lru_cache(maxsize=2048)
+def normalize_department(dept_text: str) -> str:
+    """Normalize department text to the exact dropdown value ('' if unknown)."""
+    if not dept_text:
+        return ''
+
+    dept_upper = dept_text.upper().strip()
+    dept_clean = re.sub(r'\s+', ' ', dept_upper)
+
+    # Remove common prefixes
+    dept_clean = re.sub(r'^DEPARTMENT\s+OF\s+', '', dept_clean)
+    dept_clean = re.sub(r'^DEPT\.?\s+OF\s+', '', dept_clean)
+
+    # Direct match
+    value = DEPARTMENTS.exact('exact', dept_clean)
+    if value:
+        return value
+
+    # Fuzzy match - first key contained in the text (or containing it)
+    value = DEPARTMENTS.contained('exact', dept_clean)
+    if value:
+        return value
+
+    # Keyword-based fallback
+    if 'AIML' in dept_clean or 'AI' in dept_clean and 'ML' in dept_clean:
+        return 'AIML'
+    elif 'AEROSPACE' in dept_clean or 'AERO' in dept_clean:
+        return 'AERO'
+    elif 'CYBERSECURITY' in dept_clean or 'CYBER' in dept_clean:
+        return 'CSE-CY'
+    elif 'DATA' in dept_clean and 'SCIENCE' in dept_clean:
+        return 'CSE-DS'
+    elif 'ISE' in dept_clean or 'INFORMATION' in dept_clean:
+        return 'ISE'
+    elif 'ECE' in dept_clean or 'ELECTRONICS' in dept_clean:
+        return 'ECE'
+    elif 'CSE' in dept_clean or 'COMPUTER SCIENCE' in dept_clean:
+        return 'CSE(Core)'
+
+    # If nothing matched, return empty (orchestrator will use user's department)
+    return ''
+
+
+@lru_cache(maxsize=2048)
+def map_department(matched_text: str) -> str:
+    """Map text matched by a DEPARTMENT_PATTERNS regex to its dropdown value
+    via DEPARTMENT_MAPPING ('' if no key matches)."""
+    dept_clean = re.sub(r'\s+', ' ', matched_text.strip().upper())
+    dept_clean = re.sub(r'DEPARTMENT\s+OF\s+', '', dept_clean).strip()
+    return DEPARTMENTS.contained('mapping', dept_clean) or ''
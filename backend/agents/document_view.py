@@ -0,0 +1,116 @@
+# document_view.py
+"""
+Shared, preprocessed view of one document for the NerAgent extractors.
+
+Every fallback extractor used to slice its own header (`text[:1500]`,
+`text[:2000]`), split lines and upper-/lower-case the whole document again.
+A DocumentView is built once per NerAgent.predict() call and computes each
+of those on first use only:
+
+  - `header` / `head`  – the first 1500 / 2000 characters
+  - `scan`             – the region the extractors search: the first
+                         `scan_limit` characters, so extraction cost stops
+                         growing with document length
+  - `lines`            – (offset, line) pairs over `scan`
+  - `lower` / `upper`  – case-folded copies of `scan`
+  - `words`            – token index: lower-cased word -> first offset
+  - `hits`             – the precompiled fallback matcher's results on `scan`
+  - `header_hits` / `head_hits` – its results on `header` / `head`
+
+The view is immutable; properties are memoised on the instance.
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+HEADER_CHARS = 1500   # main header section (event-name high-priority patterns)
+HEAD_CHARS = 2000     # first page or so (event-name low-priority patterns)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+class DocumentView:
+    def __init__(self, text: str, matcher=None, scan_limit: Optional[int] = None):
+        text = text or ''
+        if scan_limit:
+            scan_limit = max(scan_limit, HEAD_CHARS)
+        set_ = object.__setattr__
+        set_(self, 'text', text)
+        set_(self, 'matcher', matcher)
+        set_(self, 'scan', text[:scan_limit] if scan_limit and len(text) > scan_limit else text)
+        set_(self, 'truncated', len(self.scan) < len(text))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DocumentView is immutable")
+
+    def __len__(self):
+        return len(self.text)
+
+    # ── regions ──────────────────────────────────────────────────────────
+    @cached_property
+    def header(self) -> str:
+        return self.text[:HEADER_CHARS]
+
+    @cached_property
+    def head(self) -> str:
+        return self.text[:HEAD_CHARS]
+
+    @cached_property
+    def lines(self) -> Tuple[Tuple[int, str], ...]:
+        """(offset, line) for every line of `scan`."""
+        out = []
+        pos = 0
+        for line in self.scan.split('\n'):
+            out.append((pos, line))
+            pos += len(line) + 1
+        return tuple(out)
+
+    # ── folded copies ────────────────────────────────────────────────────
+    @cached_property
+    def lower(self) -> str:
+        # Shared with the matcher so the scan region is folded only once
+        return self.hits.lower if self.matcher is not None else self.scan.lower()
+
+    @cached_property
+    def upper(self) -> str:
+        return self.scan.upper()
+
+    # ── indexes ──────────────────────────────────────────────────────────
+    @cached_property
+    def words(self) -> Dict[str, int]:
+        """Lower-cased \\w+ tokens of `scan` mapped to their first offset."""
+        index: Dict[str, int] = {}
+        for m in _WORD_RE.finditer(self.lower):
+            index.setdefault(m.group(0), m.start())
+        return index
+
+    def has_word(self, *words: str) -> bool:
+        """True if any of `words` occurs as a whole token."""
+        index = self.words
+        return any(w in index for w in words)
+
+    def has_word_prefix(self, *prefixes: str) -> bool:
+        """True if any token starts with one of `prefixes`."""
+        return any(w.startswith(prefixes) for w in self.words)
+
+    @cached_property
+    def hits(self):
+        """Fallback matcher results (ner_matcher.DocumentHits) for `scan`."""
+        return self.matcher.scan(self.scan)
+
+    @cached_property
+    def header_hits(self):
+        """Fallback matcher results for `header`."""
+        return self.matcher.scan(self.header)
+
+    @cached_property
+    def head_hits(self):
+        """Fallback matcher results for `head`."""
+        return self.matcher.scan(self.head)
+
+    @property
+    def simple_case_folding(self) -> bool:
+        """False if the text has characters (?i) folds specially (e.g. the
+        Kelvin sign), in which case token/fold shortcuts must not be used."""
+        return self.hits.anchored if self.matcher is not None else False
@@ -14,22 +14,23 @@ Note: ABSTRACT is handled separately, not by NER.
 """
 
 from typing import List, Dict, Any
+import copy
+import hashlib
 import os
 import re
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
-import torch
-from transformers import (
-    AutoTokenizer,
-    AutoModelForTokenClassification,
-    pipeline
-)
-
 # Import OCR preprocessor
 sys.path.append(str(Path(__file__).parent.parent))
 from ocr_preprocessor import OCRPreprocessor
+from agents.ner_matcher import PatternMatcher
+from agents.document_view import DocumentView
+from agents.departments import DEPARTMENT_MAPPING, map_department, normalize_department
+from caching import TieredCache, get_cache, get_disk_cache
 
 # -------------------------
 # Constants / Labels
@@ -53,6 +54,184 @@ NER_LABELS = [
 ]
 
 
+# -------------------------
+# Regex fallback patterns
+# -------------------------
+# Each pattern is listed with the lower-case literals a match can start
+# with (None = no usable anchor, run as a plain regex); see ner_matcher.py.
+# Quote classes: BOTH ASCII quotes ("/') AND Unicode smart quotes
+_Q = r'["\'\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'  # any quote character
+_NQ = r'[^"\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'  # any non-quote character
+
+# Event names: searched in the document header (first 1500 chars) before
+# EVENT_NAME_PATTERNS; the number is the priority logged with a pick
+EVENT_NAME_HEADER_PATTERNS = [
+    # Pattern 1: Quoted text after "On" (most reliable for FOSS reports)
+    (rf'(?i)\bOn\s*{_Q}({_NQ}{{10,120}}){_Q}', ['on'], 100),
+    # Pattern 2: Text immediately after "On" keyword at doc start
+    (r'(?i)(?:^|\n)\s*On\s*\n\s*([^\n]{10,120}?)(?=\s*\n\s*\d{1,2})', None, 95),
+    # Pattern 3: Between quotes near top (any quote type)
+    (rf'^{_NQ}{{0,300}}{_Q}({_NQ}{{10,120}}){_Q}', None, 90),
+]
+
+# Searched in the whole scan region, scored by position
+EVENT_NAME_PATTERNS = [
+    # Pattern 4: Report/Certificate ON + quoted text (flattened or multiline)
+    (rf'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*{_Q}({_NQ}{{8,120}}){_Q}',
+     ['report', 'certificate']),
+    # Pattern 4b: Report/Certificate ON + unquoted text until next field
+    (r'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*([^\n]{8,150}?)(?=\s*(?:\n\s*\d{1,2}|\n\s*Date|\n\s*Venue|\n\n))',
+     ['report', 'certificate']),
+    # Pattern 4c: titled "..." (common in certificate text)
+    (rf'(?i)\btitled\s+{_Q}({_NQ}{{8,120}}){_Q}', ['titled']),
+    # Pattern 5: Title/Topic/Subject line
+    (r'(?i)(?:title|topic|subject|name of (?:the )?event)\s*[:\-]\s*([^\n]{10,150})',
+     ['title', 'topic', 'subject', 'name of ']),
+    # Pattern 6: On + Capitalized (relaxed case)
+    (r'(?i)(?:^|\n)\s*On\s+([A-Z][^\n]{8,150}?)(?=\s*\n)', None),
+    # Pattern 7: Event/Workshop at line start
+    (r'(?i)^[ \t]*(?:event|workshop|seminar|conference|training|competition)\s*(?:name)?[:\-]?\s*([A-Z][^\n]{10,120})',
+     None),
+]
+
+# Last resort when EVENT_NAME_PATTERNS find nothing (first 2000 chars)
+EVENT_NAME_HEAD_PATTERNS = [
+    # Pattern 8: All caps title (first few lines)
+    (r'(?:^|\n)([A-Z][A-Z\s&\-]{8,100})(?=\n)', None),
+    # Pattern 9: Organized event
+    (r'(?i)organized\s+(?:a|an)?\s*(?:event|workshop|seminar)\s+(?:on|about)?\s*["]?([A-Z][^\n"]{10,120})',
+     ['organized']),
+]
+
+DEPARTMENT_PATTERNS = [
+    (r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*artificial\s+intelligence\s+and\s+machine\s+learning\s*\)', ['department']),
+    (r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*ai\s*&?\s*ml\s*\)', ['department']),
+    (r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*aerospace\s*\)', ['department']),
+    (r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*cybersecurity\s*\)', ['department']),
+    (r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*data\s+science\s*\)', ['department']),
+    (r'(?i)department\s+of\s+(?:computer\s+science|cse)\s*\(?core\)?', ['department']),
+    (r'(?i)department\s+of\s+(?:information\s+science|ise)', ['department']),
+    (r'(?i)department\s+of\s+(?:electronics|ece)', ['department']),
+    (r'(?i)CSE\s*\(\s*AI\s*&?\s*ML\s*\)', ['cse']),
+    (r'(?i)CSE\s*\(\s*AIML\s*\)', ['cse']),
+    (r'(?i)CSE\s*\(\s*AEROSPACE\s*\)', ['cse']),
+    (r'(?i)CSE\s*\(\s*CYBERSECURITY\s*\)', ['cse']),
+    (r'(?i)CSE\s*\(\s*DATA\s+SCIENCE\s*\)', ['cse']),
+    (r'(?i)CSE[\s\-]*CORE', ['cse']),
+    (r'(?i)\b(?:AIML|AI\s*&?\s*ML)\b', ['aiml', 'ai']),
+    (r'(?i)\bAERO(?:SPACE)?\b', ['aero']),
+    (r'(?i)\bCYBER(?:SECURITY)?\b', ['cyber']),
+    (r'(?i)\b(?:DATA\s+SCIENCE|DS)\b', ['data', 'ds']),
+    (r'(?i)\bISE\b', ['ise']),
+    (r'(?i)\bECE\b', ['ece']),
+]
+
+
+# More comprehensive keyword patterns
+CATEGORY_KEYWORDS = {
+    'Workshop / Hands-on / Training': [
+        'workshop', 'hands-on', 'hands on', 'training', 'masterclass',
+        'bootcamp', 'skill development', 'practical session'
+    ],
+    'Seminar': [
+        'seminar', 'webinar', 'panel discussion'
+    ],
+    'Guest Lecture / Expert Talk': [
+        'lecture', 'expert talk', 'guest lecture', 'talk', 'speaker',
+        'guest speaker', 'invited talk', 'keynote'
+    ],
+    'Conference / Symposium': [
+        'conference', 'symposium', 'summit', 'colloquium', 'congress'
+    ],
+    'Competition / Hackathon / Quiz': [
+        'competition', 'hackathon', 'quiz', 'challenge', 'hackfest',
+        'contest', 'coding competition', 'tech fest', 'ideathon'
+    ],
+    'Orientation / Induction / Welcome': [
+        'orientation', 'induction', 'welcome', 'fresher',
+        'inauguration', 'opening ceremony'
+    ],
+    'Research / Report / Paper Presentation': [
+        'research', 'paper presentation', 'presentation', 'thesis',
+        'project presentation', 'poster presentation'
+    ],
+    'General / Department Activity': [
+        'activity', 'appreciation', 'participation', 'certificate',
+        'event', 'program', 'function', 'celebration', 'meetup',
+        'gathering', 'session'
+    ],
+}
+
+DOC_TYPE_KEYWORDS = {
+    'Certificate': ['certificate', 'certification', 'appreciation', 'participation', 'awarded', 'presented to', 'recognition'],
+    'Report': ['report', 'foss', 'submitted by', 'supervision', 'overview', 'event list', 'bachelor of technology'],
+}
+
+
+# Date patterns, tried in order (re.IGNORECASE)
+_MONTHS = 'January|February|March|April|May|June|July|August|September|October|November|December'
+_MONTH_ABBREVS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+DATE_PATTERNS = [
+    # DD/MM/YYYY or DD-MM-YYYY
+    (re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b', re.IGNORECASE), False),
+    # DD.MM.YYYY (common in Indian certificates)
+    (re.compile(r'\b(\d{1,2}\.\d{1,2}\.\d{4})\b', re.IGNORECASE), False),
+    # 30th MARCH 2024, 1st January 2025
+    (re.compile(rf'\b(\d{{1,2}}(?:st|nd|rd|th)?\s+(?:{_MONTHS})\s+\d{{4}})\b', re.IGNORECASE), True),
+    # January 30, 2024
+    (re.compile(rf'\b((?:{_MONTHS})\s+\d{{1,2}},?\s+\d{{4}})\b', re.IGNORECASE), True),
+    # 30 Mar 2024
+    (re.compile(r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b', re.IGNORECASE), True),
+    # ISO format
+    (re.compile(r'\b(\d{4}-\d{2}-\d{2})\b', re.IGNORECASE), False),
+]
+
+
+def build_fallback_matcher() -> PatternMatcher:
+    """Compile every fallback pattern and keyword list into one matcher."""
+    matcher = PatternMatcher()
+    for i, (pattern, anchors, _) in enumerate(EVENT_NAME_HEADER_PATTERNS):
+        matcher.add_pattern('event_name_header', str(i), pattern, anchors, re.MULTILINE)
+    for i, (pattern, anchors) in enumerate(EVENT_NAME_PATTERNS):
+        matcher.add_pattern('event_name', str(i), pattern, anchors, re.MULTILINE)
+    for i, (pattern, anchors) in enumerate(EVENT_NAME_HEAD_PATTERNS):
+        matcher.add_pattern('event_name_head', str(i), pattern, anchors, re.MULTILINE)
+    for i, (pattern, anchors) in enumerate(DEPARTMENT_PATTERNS):
+        matcher.add_pattern('department', str(i), pattern, anchors)
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        matcher.add_keywords('category', category, keywords)
+    for doc_type, keywords in DOC_TYPE_KEYWORDS.items():
+        matcher.add_keywords('doc_type', doc_type, keywords)
+    return matcher
+
+
+# Modules whose code decides predict() output besides the model
+_EXTRACTION_SOURCES = ('ner_agent.py', 'ner_matcher.py', 'document_view.py', 'departments.py')
+
+
+def _checksum_files(paths, root=None) -> str:
+    """SHA-256 over the names (relative to `root`) and contents of `paths`."""
+    h = hashlib.sha256()
+    for path in sorted(paths):
+        h.update(os.path.relpath(path, root or os.path.dirname(path)).encode('utf-8'))
+        h.update(b'\0')
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _directory_checksum(directory: str) -> str:
+    """Checksum of every file under `directory` (weights, config, tokenizer)."""
+    paths = [
+        os.path.join(dirpath, name)
+        for dirpath, dirnames, filenames in os.walk(directory)
+        if '__pycache__' not in dirpath
+        for name in filenames
+    ]
+    return _checksum_files(paths, directory)
+
+
 @dataclass
 class NerPrediction:
     entity_type: str
@@ -68,7 +247,8 @@ class NerAgent:
         ner_model_dir: str = NER_MODEL_DIR,
         ner_base_model: str = NER_MODEL_NAME,
         device: int = None,
-        use_model: bool = None
+        use_model: bool = None,
+        backend: str = None
     ):
         """Initialize NER Agent
         
@@ -76,21 +256,52 @@ class NerAgent:
             use_model: If False, skip loading the BERT model entirely and
                        rely on regex fallback extractors only.
                        Reads USE_NER_MODEL env var / Config when None.
+            backend: 'torch' or 'onnx' (ONNX Runtime, CPU). Reads
+                     NER_BACKEND from Config when None; falls back to torch
+                     if the ONNX export is missing.
         """
+        from config import Config
+
         # Decide whether to load the transformer model
         if use_model is None:
-            from config import Config
             use_model = Config.USE_NER_MODEL
         self.use_model = use_model
 
+        # Sliding-window inference settings (see _predict_windowed)
+        self.window_tokens = min(Config.NER_WINDOW_TOKENS, 512)
+        self.window_stride = Config.NER_WINDOW_STRIDE
+        self.batch_size = max(1, Config.NER_BATCH_SIZE)
+        self.windowed = False
+        self.backend = 'torch'
+        self.onnx_session = None
+
         # Initialize OCR preprocessor for text cleaning
         self.ocr_preprocessor = OCRPreprocessor()
 
+        # Regex fallback patterns / keyword lists, compiled once
+        self.matcher = build_fallback_matcher()
+        self.scan_chars = Config.NER_SCAN_CHARS
+        self._view_memo = threading.local()
+
+        # predict() results, keyed by the text and a fingerprint of the
+        # model, labels, settings and code (see _cache_fingerprint)
+        self.model_path = None
+        self._fingerprint = None
+        self.result_cache = self._build_result_cache(Config)
+
         if not self.use_model:
             self.ner_pipeline = None
             print("[NerAgent] ⚡ Fallback-only mode (USE_NER_MODEL=false) — BERT model NOT loaded")
             return
 
+        # torch / transformers are only needed when the model is used
+        import torch
+        from transformers import (
+            AutoTokenizer,
+            AutoModelForTokenClassification,
+            pipeline
+        )
+
         # Device selection
         if device is None:
             self.device = 0 if torch.cuda.is_available() else -1
@@ -101,6 +312,7 @@ class NerAgent:
 
         # Load NER Model
         ner_path = ner_model_dir if os.path.exists(ner_model_dir) else ner_base_model
+        self.model_path = ner_path
         print(f"[NerAgent] Loading NER model from: {ner_path}")
 
         self.ner_tokenizer = AutoTokenizer.from_pretrained(ner_path)
@@ -113,6 +325,27 @@ class NerAgent:
             device=self.device
         )
 
+        self.ner_model.eval()
+        if self.device >= 0:
+            self.ner_model.to(f"cuda:{self.device}")
+        self.id2label = {int(k): v for k, v in self.ner_model.config.id2label.items()}
+
+        # Windowing needs offset mappings, which only fast tokenizers provide
+        self.windowed = Config.NER_WINDOWED and getattr(self.ner_tokenizer, 'is_fast', False)
+        if self.windowed:
+            print(f"[NerAgent] Windowed NER: {self.window_tokens} tokens/window, "
+                  f"stride {self.window_stride}, batch {self.batch_size}")
+
+        # Optional ONNX Runtime backend (reuses the windowed logits path)
+        if (backend or Config.NER_BACKEND) == 'onnx':
+            if not self.windowed:
+                print("[NerAgent] ⚠ ONNX backend needs windowed NER (fast tokenizer, "
+                      "NER_WINDOWED=true) — using PyTorch")
+            else:
+                self.onnx_session = self._load_onnx_session(ner_model_dir, Config.NER_ONNX_QUANTIZED)
+                if self.onnx_session is not None:
+                    self.backend = 'onnx'
+
         print("[NerAgent] ✅ NER model loaded successfully")
 
     # -------------------------
@@ -123,6 +356,17 @@ class NerAgent:
         if not text or len(text.strip()) < 2:
             return []
 
+        # Text that fits one pass goes through the pipeline unchanged; the
+        # ONNX backend only has the windowed logits path
+        if self.windowed and (self.onnx_session is not None or self._needs_windows(text)):
+            initial = self._predict_windowed(text)
+        else:
+            initial = self._predict_with_pipeline(text)
+
+        return self._merge_adjacent_spans(text, initial)
+
+    def _predict_with_pipeline(self, text: str) -> List[NerPrediction]:
+        """Single-pass HF pipeline inference (truncated to the model max length)."""
         raw = self.ner_pipeline(text)
 
         # Build initial predictions
@@ -137,8 +381,179 @@ class NerAgent:
                 entity_type=label, text=txt,
                 start=start, end=end, score=score
             ))
+        return initial
+
+    # -------------------------
+    # Sliding-window inference
+    # -------------------------
+    def _needs_windows(self, text: str) -> bool:
+        """True when `text` is longer than one window_tokens pass."""
+        n_tokens = len(self.ner_tokenizer(text, truncation=False)['input_ids'])
+        return n_tokens > self.window_tokens
+
+    def _encode_windows(self, text: str):
+        """Tokenize `text` into overlapping windows of window_tokens tokens
+        sharing window_stride tokens, padded to a common length."""
+        return self.ner_tokenizer(
+            text,
+            max_length=self.window_tokens,
+            stride=self.window_stride,
+            truncation=True,
+            padding=True,
+            return_overflowing_tokens=True,
+            return_offsets_mapping=True,
+            return_tensors='np',
+        )
+
+    @staticmethod
+    def _load_onnx_session(model_dir: str, quantized: bool):
+        """Open an ONNX Runtime session for the exported model, or None.
+
+        Looks in <model_dir>/onnx for model.int8.onnx (when `quantized`) or
+        model.onnx, as written by export_ner_onnx.py.
+        """
+        onnx_dir = Path(model_dir) / 'onnx'
+        names = ['model.int8.onnx', 'model.onnx'] if quantized else ['model.onnx']
+        onnx_path = next((onnx_dir / n for n in names if (onnx_dir / n).exists()), None)
+        if onnx_path is None:
+            print(f"[NerAgent] ⚠ No ONNX export in {onnx_dir} — using PyTorch "
+                  f"(run export_ner_onnx.py)")
+            return None
+
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            print("[NerAgent] ⚠ onnxruntime not installed — using PyTorch")
+            return None
+
+        try:
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(str(onnx_path), options,
+                                           providers=['CPUExecutionProvider'])
+        except Exception as e:
+            print(f"[NerAgent] ⚠ ONNX session failed ({str(e)[:150]}) — using PyTorch")
+            return None
+
+        print(f"[NerAgent] ✅ ONNX Runtime backend: {onnx_path.name}")
+        return session
+
+    def _window_logits(self, batch: Dict[str, Any]):
+        """Run the model on one batch of windows and return numpy logits."""
+        if self.onnx_session is not None:
+            feed = {i.name: batch[i.name].astype('int64') for i in self.onnx_session.get_inputs()}
+            return self.onnx_session.run(None, feed)[0]
+
+        import torch
+
+        device = self.ner_model.device
+        inputs = {k: torch.as_tensor(v).to(device) for k, v in batch.items()}
+        with torch.no_grad():
+            return self.ner_model(**inputs).logits.float().cpu().numpy()
+
+    def _predict_windowed(self, text: str) -> List[NerPrediction]:
+        """Token classification over overlapping windows of the whole text.
+
+        Windows run through the model batch_size at a time; BIO tags in each
+        window are grouped into spans, mapped back to character offsets in
+        `text`, and same-type spans that overlap (the shared stride region)
+        are merged.
+        """
+        import numpy as np
+
+        enc = self._encode_windows(text)
+        offsets = enc['offset_mapping']
+        model_inputs = {k: enc[k] for k in ('input_ids', 'attention_mask', 'token_type_ids') if k in enc}
+        n_windows = len(enc['input_ids'])
+
+        spans: List[NerPrediction] = []
+        for b in range(0, n_windows, self.batch_size):
+            batch = {k: v[b:b + self.batch_size] for k, v in model_inputs.items()}
+            logits = self._window_logits(batch)
+            # Softmax over labels
+            logits = logits - logits.max(axis=-1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=-1, keepdims=True)
+
+            for j in range(len(probs)):
+                w = b + j
+                spans.extend(self._decode_window(
+                    text, probs[j], offsets[w], enc.word_ids(batch_index=w)
+                ))
+
+        if n_windows > 1:
+            print(f"[NerAgent] Windowed NER over {n_windows} windows")
+        return self._dedupe_overlapping_spans(text, spans)
+
+    def _decode_window(self, text, probs, offsets, word_ids) -> List[NerPrediction]:
+        """Group one window's BIO tags into character-offset spans.
+
+        Same rules as the pipeline's 'simple' aggregation, token by token
+        with no regard for word boundaries: a token continues the current
+        group when it has the group's entity type and is not tagged B-;
+        anything else (including an O token) starts a new group. O groups
+        are dropped, and a span's score is its mean token probability.
+        Tokens with no word id ([CLS], [SEP], padding) are skipped.
+        """
+        labels = probs.argmax(axis=-1)
+        out: List[NerPrediction] = []
+        cur_type, cur_start, cur_end, cur_scores = None, 0, 0, []
+
+        def flush():
+            if cur_type not in (None, 'O') and cur_end > cur_start:
+                out.append(NerPrediction(
+                    entity_type=cur_type, text=text[cur_start:cur_end],
+                    start=cur_start, end=cur_end,
+                    score=float(sum(cur_scores) / len(cur_scores))
+                ))
+
+        for t, word in enumerate(word_ids):
+            if word is None:
+                continue
+            label = self.id2label.get(int(labels[t]), 'O')
+            tag, etype = label.split('-', 1) if label[:2] in ('B-', 'I-') else ('I', label)
+            start, end = int(offsets[t][0]), int(offsets[t][1])
+            score = float(probs[t][labels[t]])
+
+            if etype == cur_type and tag != 'B':
+                cur_end = end
+                cur_scores.append(score)
+            else:
+                flush()
+                cur_type, cur_start, cur_end, cur_scores = etype, start, end, [score]
+        flush()
+        return out
+
+    @staticmethod
+    def _dedupe_overlapping_spans(text: str, spans: List[NerPrediction]) -> List[NerPrediction]:
+        """Merge same-type spans whose character ranges overlap.
+
+        Consecutive windows see the stride region twice, so one entity can
+        come back as two identical spans, or as a span cut at a window edge
+        plus the complete span from the next window. Overlapping spans of a
+        type are replaced by their union with the higher score.
+        """
+        spans = sorted(spans, key=lambda s: (s.entity_type, s.start, -s.end))
+        out: List[NerPrediction] = []
+        for span in spans:
+            last = out[-1] if out else None
+            if last and last.entity_type == span.entity_type and span.start < last.end:
+                end = max(last.end, span.end)
+                out[-1] = NerPrediction(
+                    entity_type=last.entity_type, text=text[last.start:end],
+                    start=last.start, end=end, score=max(last.score, span.score)
+                )
+            else:
+                out.append(span)
+        out.sort(key=lambda s: s.start)
+        return out
+
+    @staticmethod
+    def _merge_adjacent_spans(text: str, initial: List[NerPrediction]) -> List[NerPrediction]:
+        """Merge adjacent / near-adjacent spans of the same entity type."""
+        if not initial:
+            return []
 
-        # ── Merge adjacent / near-adjacent spans of the same entity type ──
         # The HF pipeline with aggregation_strategy='simple' can still
         # fragment a single real-world entity into multiple B- spans when
         # sub-word tokens sit on boundaries.  We stitch them back together
@@ -197,168 +612,49 @@ class NerAgent:
         - ISE
         - ECE
         - AERO
+
+        See departments.normalize_department (indexed and memoised).
         """
-        if not dept_text:
-            return ''
-        
-        dept_upper = dept_text.upper().strip()
-        dept_clean = re.sub(r'\s+', ' ', dept_upper)
-        
-        # Remove common prefixes
-        dept_clean = re.sub(r'^DEPARTMENT\s+OF\s+', '', dept_clean)
-        dept_clean = re.sub(r'^DEPT\.?\s+OF\s+', '', dept_clean)
-        
-        # Exact mapping to valid dropdown values
-        EXACT_DEPARTMENTS = {
-            # AIML variants
-            'AIML': 'AIML',
-            'AI & ML': 'AIML',
-            'AI&ML': 'AIML',
-            'AI ML': 'AIML',
-            'ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING': 'AIML',
-            'ARTIFICIAL INTELLIGENCE & MACHINE LEARNING': 'AIML',
-            'COMPUTER SCIENCE AND ENGINEERING (ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING)': 'AIML',
-            'COMPUTER SCIENCE AND ENGINEERING (AI & ML)': 'AIML',
-            'COMPUTER SCIENCE AND ENGINEERING (AIML)': 'AIML',
-            'CSE(AI & ML)': 'AIML',
-            'CSE(AIML)': 'AIML',
-            'CSE (AI&ML)': 'AIML',
-            'CSE ( AIML )': 'AIML',
-            'CSE-AIML': 'AIML',
-            
-            # Aerospace variants
-            'AEROSPACE': 'AERO',
-            'AERO': 'AERO',
-            'AERONAUTICS': 'AERO',
-            'CSE(AEROSPACE)': 'AERO',
-            'CSE (AEROSPACE)': 'AERO',
-            'COMPUTER SCIENCE AND ENGINEERING (AEROSPACE)': 'AERO',
-            'COMPUTER SCIENCE AND ENGINEERING ( AEROSPACE )': 'AERO',
-            
-            # Cybersecurity variants
-            'CYBERSECURITY': 'CSE-CY',
-            'CYBER SECURITY': 'CSE-CY',
-            'CYBER': 'CSE-CY',
-            'CSE-CY': 'CSE-CY',
-            'CSE(CYBERSECURITY)': 'CSE-CY',
-            'CSE (CYBERSECURITY)': 'CSE-CY',
-            'COMPUTER SCIENCE AND ENGINEERING (CYBERSECURITY)': 'CSE-CY',
-            'COMPUTER SCIENCE AND ENGINEERING ( CYBERSECURITY )': 'CSE-CY',
-            'CYBER SECURITY': 'CSE-CY',
-            
-            # Data Science variants
-            'DATA SCIENCE': 'CSE-DS',
-            'DS': 'CSE-DS',
-            'CSE-DS': 'CSE-DS',
-            'CSE(DATA SCIENCE)': 'CSE-DS',
-            'CSE (DATA SCIENCE)': 'CSE-DS',
-            'COMPUTER SCIENCE AND ENGINEERING (DATA SCIENCE)': 'CSE-DS',
-            'COMPUTER SCIENCE AND ENGINEERING ( DATA SCIENCE )': 'CSE-DS',
-            
-            # CSE Core variants
-            'CSE': 'CSE(Core)',
-            'CSE CORE': 'CSE(Core)',
-            'CSE-CORE': 'CSE(Core)',
-            'CSE (CORE)': 'CSE(Core)',
-            'CSE(CORE)': 'CSE(Core)',
-            'COMPUTER SCIENCE': 'CSE(Core)',
-            'COMPUTER SCIENCE AND ENGINEERING': 'CSE(Core)',
-            'COMPUTER SCIENCE AND ENGINEERING (CORE)': 'CSE(Core)',
-            'COMPUTER SCIENCE & ENGINEERING': 'CSE(Core)',
-            'CSE - CORE': 'CSE(Core)',
-            'COMPUTER SCIENCE AND ENGINEERING ( CSE - CORE )': 'CSE(Core)',
-            
-            # ISE variants
-            'ISE': 'ISE',
-            'INFORMATION SCIENCE': 'ISE',
-            'INFORMATION SCIENCE AND ENGINEERING': 'ISE',
-            'INFORMATION SCIENCE & ENGINEERING': 'ISE',
-            
-            # ECE variants
-            'ECE': 'ECE',
-            'ELECTRONICS': 'ECE',
-            'ELECTRONICS AND COMMUNICATION': 'ECE',
-            'ELECTRONICS AND COMMUNICATION ENGINEERING': 'ECE',
-            'ELECTRONICS & COMMUNICATION ENGINEERING': 'ECE',
-        }
-        
-        # Direct match
-        if dept_clean in EXACT_DEPARTMENTS:
-            return EXACT_DEPARTMENTS[dept_clean]
-        
-        # Fuzzy match - check if any key is contained in the text
-        for key, value in EXACT_DEPARTMENTS.items():
-            if key in dept_clean or dept_clean in key:
-                return value
-        
-        # Keyword-based fallback
-        if 'AIML' in dept_clean or 'AI' in dept_clean and 'ML' in dept_clean:
-            return 'AIML'
-        elif 'AEROSPACE' in dept_clean or 'AERO' in dept_clean:
-            return 'AERO'
-        elif 'CYBERSECURITY' in dept_clean or 'CYBER' in dept_clean:
-            return 'CSE-CY'
-        elif 'DATA' in dept_clean and 'SCIENCE' in dept_clean:
-            return 'CSE-DS'
-        elif 'ISE' in dept_clean or 'INFORMATION' in dept_clean:
-            return 'ISE'
-        elif 'ECE' in dept_clean or 'ELECTRONICS' in dept_clean:
-            return 'ECE'
-        elif 'CSE' in dept_clean or 'COMPUTER SCIENCE' in dept_clean:
-            return 'CSE(Core)'
-        
-        # If nothing matched, return empty (orchestrator will use user's department)
-        return ''
-    def _extract_event_name_fallback(self, text: str) -> str:
+        return normalize_department(dept_text)
+
+    def _view(self, doc) -> DocumentView:
+        """The DocumentView for `doc` (a DocumentView or raw text).
+
+        predict() passes its view explicitly; called with plain text, the
+        last view built on this thread is reused when the text is the same.
+        """
+        if isinstance(doc, DocumentView):
+            return doc
+        memo = self._view_memo
+        last = getattr(memo, 'view', None)
+        if last is None or (last.text is not doc and last.text != doc):
+            last = memo.view = DocumentView(doc, self.matcher, self.scan_chars)
+        return last
+
+    def _extract_event_name_fallback(self, doc) -> str:
         """Fallback regex extraction for event name with position-aware scoring"""
+        view = self._view(doc)
         
-        # Extract first 1500 chars (main header section — generous for verbose cover pages)
-        header_text = text[:1500] if len(text) > 1500 else text
-        
-        # High-priority patterns (only search header)
-        # Note: Include BOTH ASCII quotes ("/') AND Unicode smart quotes (\u201c\u201d\u2018\u2019)
-        _Q = r'["\'\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'  # any quote character
-        _NQ = r'[^"\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'  # any non-quote character
-        high_priority_patterns = [
-            # Pattern 1: Quoted text after "On" (most reliable for FOSS reports)
-            (rf'(?i)\bOn\s*{_Q}({_NQ}{{10,120}}){_Q}', 100),
-            # Pattern 2: Text immediately after "On" keyword at doc start
-            (r'(?i)(?:^|\n)\s*On\s*\n\s*([^\n]{10,120}?)(?=\s*\n\s*\d{1,2})', 95),
-            # Pattern 3: Between quotes near top (any quote type)
-            (rf'^{_NQ}{{0,300}}{_Q}({_NQ}{{10,120}}){_Q}', 90),
-        ]
-        
-        # Try high-priority patterns in header first
-        for pattern, priority in high_priority_patterns:
-            match = re.search(pattern, header_text, re.MULTILINE)
-            if match:
-                name = match.group(1).strip()
+        # High-priority patterns, searched in the first 1500 chars only (the
+        # main header section — generous for verbose cover pages)
+        header_hits = view.header_hits
+        for i, (_, _, priority) in enumerate(EVENT_NAME_HEADER_PATTERNS):
+            hit = header_hits.first('event_name_header', str(i))
+            if hit:
+                name = hit.match.group(1).strip()
                 name = self._clean_event_name(name)
                 if self._is_valid_event_name(name):
                     print(f"[NerAgent][FALLBACK] Event name (header, priority={priority}): '{name}'")
                     return name
         
-        # Medium-priority patterns (search full text but score by position)
-        medium_priority_patterns = [
-            # Pattern 4: Report/Certificate ON + quoted text (flattened or multiline)
-            rf'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*{_Q}({_NQ}{{8,120}}){_Q}',
-            # Pattern 4b: Report/Certificate ON + unquoted text until next field
-            r'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*([^\n]{8,150}?)(?=\s*(?:\n\s*\d{1,2}|\n\s*Date|\n\s*Venue|\n\n))',
-            # Pattern 4c: titled "..." (common in certificate text)
-            rf'(?i)\btitled\s+{_Q}({_NQ}{{8,120}}){_Q}',
-            # Pattern 5: Title/Topic/Subject line
-            r'(?i)(?:title|topic|subject|name of (?:the )?event)\s*[:\-]\s*([^\n]{10,150})',
-            # Pattern 6: On + Capitalized (relaxed case)
-            r'(?i)(?:^|\n)\s*On\s+([A-Z][^\n]{8,150}?)(?=\s*\n)',
-            # Pattern 7: Event/Workshop at line start
-            r'(?i)^[ \t]*(?:event|workshop|seminar|conference|training|competition)\s*(?:name)?[:\-]?\s*([A-Z][^\n]{10,120})',
-        ]
-        
+        # Medium-priority patterns (search full text but score by position);
+        # EVENT_NAME_PATTERNS, matched through the precompiled matcher
+        hits = view.hits
         candidates = []
-        for pattern in medium_priority_patterns:
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                name = match.group(1).strip()
-                position = match.start()
+        for key in self.matcher.patterns['event_name']:
+            for hit in hits.iter('event_name', key):
+                name = hit.match.group(1).strip()
+                position = hit.start
                 
                 # Calculate position score (prefer earlier positions)
                 # Position 0-500: score 80, 500-1000: score 60, 1000+: score 40
@@ -383,18 +679,11 @@ class NerAgent:
             return best_name
         
         # Low-priority patterns (last resort, only first 2000 chars)
-        low_priority_text = text[:2000] if len(text) > 2000 else text
-        low_priority_patterns = [
-            # Pattern 8: All caps title (first few lines)
-            r'(?:^|\n)([A-Z][A-Z\s&\-]{8,100})(?=\n)',
-            # Pattern 9: Organized event
-            r'(?i)organized\s+(?:a|an)?\s*(?:event|workshop|seminar)\s+(?:on|about)?\s*["]?([A-Z][^\n"]{10,120})',
-        ]
-        
-        for pattern in low_priority_patterns:
-            match = re.search(pattern, low_priority_text, re.MULTILINE)
-            if match:
-                name = match.group(1).strip()
+        head_hits = view.head_hits
+        for i in range(len(EVENT_NAME_HEAD_PATTERNS)):
+            hit = head_hits.first('event_name_head', str(i))
+            if hit:
+                name = hit.match.group(1).strip()
                 name = self._clean_event_name(name)
                 if self._is_valid_event_name(name):
                     print(f"[NerAgent][FALLBACK] Event name (low priority): '{name}'")
@@ -464,25 +753,19 @@ class NerAgent:
         
         return True
 
-    def _extract_date_fallback(self, text: str) -> str:
-        """Fallback regex extraction for dates"""
-        patterns = [
-            # DD/MM/YYYY or DD-MM-YYYY
-            r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
-            # DD.MM.YYYY (common in Indian certificates)
-            r'\b(\d{1,2}\.\d{1,2}\.\d{4})\b',
-            # 30th MARCH 2024, 1st January 2025
-            r'\b(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})\b',
-            # January 30, 2024
-            r'\b((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4})\b',
-            # 30 Mar 2024
-            r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})\b',
-            # ISO format
-            r'\b(\d{4}-\d{2}-\d{2})\b',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+    def _extract_date_fallback(self, doc) -> str:
+        """Fallback regex extraction for dates (DATE_PATTERNS, in order)"""
+        view = self._view(doc)
+
+        # Month-name patterns can only match if some token starts with a
+        # month abbreviation; skip them otherwise (token index lookup)
+        months_seen = (not view.simple_case_folding
+                       or view.has_word_prefix(*_MONTH_ABBREVS))
+
+        for pattern, needs_month in DATE_PATTERNS:
+            if needs_month and not months_seen:
+                continue
+            match = pattern.search(view.scan)
             if match:
                 date_str = match.group(1)
                 normalized = self._normalize_date(date_str)
@@ -491,8 +774,9 @@ class NerAgent:
                 return date_str
         return ''
 
-    def _extract_venue_fallback(self, text: str) -> str:
+    def _extract_venue_fallback(self, doc) -> str:
         """Fallback regex extraction for venue"""
+        text = self._view(doc).scan
         candidates = []
 
         # Pattern group 1: Explicit "Location:" or "Venue:" labels (highest priority)
@@ -529,8 +813,10 @@ class NerAgent:
             return candidates[0][0]
         return ''
 
-    def _extract_organizer_fallback(self, text: str) -> str:
+    def _extract_organizer_fallback(self, doc) -> str:
         """Fallback regex extraction for organizer"""
+        text = self._view(doc).scan
+
         # Primary: explicit label patterns ("Organiser:", "Organized by", etc.)
         label_patterns = [
             r'(?i)(?:organiser|organizer|organized\s+by|conducted\s+by|coordinated\s+by)\s*[:\-]?\s*([^\n]{5,150})',
@@ -568,94 +854,23 @@ class NerAgent:
 
         return ', '.join(organizers[:3]) if organizers else ''
 
-    def _extract_department_fallback(self, text: str) -> str:
+    def _extract_department_fallback(self, doc) -> str:
         """Fallback regex extraction for department"""
-        patterns = [
-            r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*artificial\s+intelligence\s+and\s+machine\s+learning\s*\)',
-            r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*ai\s*&?\s*ml\s*\)',
-            r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*aerospace\s*\)',
-            r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*cybersecurity\s*\)',
-            r'(?i)department\s+of\s+computer\s+science\s+and\s+engineering\s*\(\s*data\s+science\s*\)',
-            r'(?i)department\s+of\s+(?:computer\s+science|cse)\s*\(?core\)?',
-            r'(?i)department\s+of\s+(?:information\s+science|ise)',
-            r'(?i)department\s+of\s+(?:electronics|ece)',
-            r'(?i)CSE\s*\(\s*AI\s*&?\s*ML\s*\)',
-            r'(?i)CSE\s*\(\s*AIML\s*\)',
-            r'(?i)CSE\s*\(\s*AEROSPACE\s*\)',
-            r'(?i)CSE\s*\(\s*CYBERSECURITY\s*\)',
-            r'(?i)CSE\s*\(\s*DATA\s+SCIENCE\s*\)',
-            r'(?i)CSE[\s\-]*CORE',
-            r'(?i)\b(?:AIML|AI\s*&?\s*ML)\b',
-            r'(?i)\bAERO(?:SPACE)?\b',
-            r'(?i)\bCYBER(?:SECURITY)?\b',
-            r'(?i)\b(?:DATA\s+SCIENCE|DS)\b',
-            r'(?i)\bISE\b',
-            r'(?i)\bECE\b',
-        ]
-        
-        # Exact mapping to match your database/dropdown values
-        DEPARTMENT_MAPPING = {
-            'AIML': 'AIML',
-            'AI & ML': 'AIML',
-            'AI&ML': 'AIML',
-            'ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING': 'AIML',
-            'COMPUTER SCIENCE AND ENGINEERING (ARTIFICIAL INTELLIGENCE AND MACHINE LEARNING)': 'AIML',
-            'CSE(AI & ML)': 'AIML',
-            'CSE(AIML)': 'AIML',
-            'CSE (AI&ML)': 'AIML',
-            
-            'AEROSPACE': 'AERO',
-            'AERO': 'AERO',
-            'CSE(AEROSPACE)': 'AERO',
-            'COMPUTER SCIENCE AND ENGINEERING (AEROSPACE)': 'AERO',
-            
-            'CYBERSECURITY': 'CSE-CY',
-            'CYBER SECURITY': 'CSE-CY',
-            'CYBER': 'CSE-CY',
-            'CSE(CYBERSECURITY)': 'CSE-CY',
-            'COMPUTER SCIENCE AND ENGINEERING (CYBERSECURITY)': 'CSE-CY',
-            
-            'DATA SCIENCE': 'CSE-DS',
-            'DS': 'CSE-DS',
-            'CSE(DATA SCIENCE)': 'CSE-DS',
-            'COMPUTER SCIENCE AND ENGINEERING (DATA SCIENCE)': 'CSE-DS',
-            
-            'CSE': 'CSE(Core)',
-            'CSE CORE': 'CSE(Core)',
-            'CSE-CORE': 'CSE(Core)',
-            'CSE (CORE)': 'CSE(Core)',
-            'COMPUTER SCIENCE AND ENGINEERING': 'CSE(Core)',
-            'CSE - CORE': 'CSE(Core)',
-            
-            'ISE': 'ISE',
-            'INFORMATION SCIENCE': 'ISE',
-            'INFORMATION SCIENCE AND ENGINEERING': 'ISE',
-            
-            'ECE': 'ECE',
-            'ELECTRONICS': 'ECE',
-            'ELECTRONICS AND COMMUNICATION': 'ECE',
-            'ELECTRONICS AND COMMUNICATION ENGINEERING': 'ECE',
-        }
+        view = self._view(doc)
+        hits = view.hits
+
+        # Try each of DEPARTMENT_PATTERNS in order
+        for pattern_key in self.matcher.patterns['department']:
+            hit = hits.first('department', pattern_key)
+            if hit:
+                # Map the matched text to a standard department
+                value = map_department(hit.text)
+                if value:
+                    return value
         
-        text_upper = text.upper()
+        text_upper = view.upper
         
-        # Try each pattern
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                # Get the matched text and normalize it
-                dept_raw = match.group(0).strip()
-                dept_upper = dept_raw.upper()
-                dept_clean = re.sub(r'\s+', ' ', dept_upper)
-                dept_clean = re.sub(r'DEPARTMENT\s+OF\s+', '', dept_clean)
-                dept_clean = dept_clean.strip()
-                
-                # Try to map to standard department
-                for key, value in DEPARTMENT_MAPPING.items():
-                    if key in dept_clean or dept_clean in key:
-                        return value
-        
-        # If no pattern matched, try keyword matching in the whole text
+        # If no pattern matched, try keyword matching in the scanned text
         if 'AIML' in text_upper or 'AI & ML' in text_upper or 'AI&ML' in text_upper or 'ARTIFICIAL INTELLIGENCE' in text_upper:
             return 'AIML'
         elif 'AEROSPACE' in text_upper or 'AERO' in text_upper:
@@ -674,53 +889,15 @@ class NerAgent:
         # Default fallback
         return ''
 
-    def _extract_category_fallback(self, text: str) -> str:
+    def _extract_category_fallback(self, doc) -> str:
         """Fallback keyword-based category detection with better pattern matching"""
-        text_lower = text.lower()
-        
-        # More comprehensive keyword patterns
-        category_keywords = {
-            'Workshop / Hands-on / Training': [
-                'workshop', 'hands-on', 'hands on', 'training', 'masterclass',
-                'bootcamp', 'skill development', 'practical session'
-            ],
-            'Seminar': [
-                'seminar', 'webinar', 'panel discussion'
-            ],
-            'Guest Lecture / Expert Talk': [
-                'lecture', 'expert talk', 'guest lecture', 'talk', 'speaker',
-                'guest speaker', 'invited talk', 'keynote'
-            ],
-            'Conference / Symposium': [
-                'conference', 'symposium', 'summit', 'colloquium', 'congress'
-            ],
-            'Competition / Hackathon / Quiz': [
-                'competition', 'hackathon', 'quiz', 'challenge', 'hackfest',
-                'contest', 'coding competition', 'tech fest', 'ideathon'
-            ],
-            'Orientation / Induction / Welcome': [
-                'orientation', 'induction', 'welcome', 'fresher',
-                'inauguration', 'opening ceremony'
-            ],
-            'Research / Report / Paper Presentation': [
-                'research', 'paper presentation', 'presentation', 'thesis',
-                'project presentation', 'poster presentation'
-            ],
-            'General / Department Activity': [
-                'activity', 'appreciation', 'participation', 'certificate',
-                'event', 'program', 'function', 'celebration', 'meetup',
-                'gathering', 'session'
-            ],
-        }
+        hits = self._view(doc).hits
         
         scores = {}
-        for category, keywords in category_keywords.items():
-            score = 0
-            for kw in keywords:
-                if kw in text_lower:
-                    # Give higher weight to longer, more specific keywords
-                    weight = len(kw.split())  # Multi-word phrases get more weight
-                    score += weight
+        for category in CATEGORY_KEYWORDS:
+            # Give higher weight to longer, more specific keywords
+            # (multi-word phrases get more weight)
+            score = sum(len(kw.split()) for kw in hits.keywords_present('category', category))
             
             if score > 0:
                 scores[category] = score
@@ -732,29 +909,69 @@ class NerAgent:
         
         return 'General / Department Activity'
 
-    def _extract_doc_type_fallback(self, text: str) -> str:
+    def _extract_doc_type_fallback(self, doc) -> str:
         """Fallback keyword-based doc type detection"""
-        text_lower = text.lower()
-        
-        cert_keywords = ['certificate', 'certification', 'appreciation', 'participation', 'awarded', 'presented to', 'recognition']
-        report_keywords = ['report', 'foss', 'submitted by', 'supervision', 'overview', 'event list', 'bachelor of technology']
+        hits = self._view(doc).hits
         
-        cert_score = sum(1 for kw in cert_keywords if kw in text_lower)
-        report_score = sum(1 for kw in report_keywords if kw in text_lower)
+        cert_score = len(hits.keywords_present('doc_type', 'Certificate'))
+        report_score = len(hits.keywords_present('doc_type', 'Report'))
         
         if cert_score > report_score:
             return 'Certificate'
         return 'Report'
 
+    # -------------------------
+    # Cheap field probe (used for early-exit OCR)
+    # -------------------------
+    def probe_fields(self, text: str, fields: List[str]) -> Dict[str, float]:
+        """Run only the regex fallback extractors for `fields` and return a
+        rough confidence in [0, 1] per field.
+
+        This is a cheap stand-in for a full predict() that the OCR stage can
+        call after every page to decide whether it has seen enough.
+        """
+        view = self._view(text)
+        scores = {}
+        for field in fields:
+            if field == 'event_name':
+                name = self._extract_event_name_fallback(view)
+                scores[field] = 0.9 if self._is_valid_event_name(name) else 0.0
+            elif field == 'date':
+                raw = self._extract_date_fallback(view)
+                # An ISO result means the date parsed cleanly
+                scores[field] = 0.9 if re.fullmatch(r'\d{4}-\d{2}-\d{2}', raw or '') else (0.5 if raw else 0.0)
+            elif field == 'department':
+                scores[field] = 0.9 if self._extract_department_fallback(view) else 0.0
+            elif field == 'venue':
+                venue = self._extract_venue_fallback(view)
+                if not venue:
+                    scores[field] = 0.0
+                else:
+                    # A labelled "Venue:"/"Location:" line beats a bare room reference
+                    labelled = re.search(r'(?i)\b(?:venue|location|place|held at|conducted at|organized at)\b', view.scan)
+                    scores[field] = 0.9 if labelled else 0.6
+            elif field == 'organizer':
+                scores[field] = 0.8 if self._extract_organizer_fallback(view) else 0.0
+            else:
+                scores[field] = 0.0
+        return scores
+
+    def fields_found(self, text: str, fields: List[str], min_confidence: float = 0.8) -> bool:
+        """True once every field in `fields` probes at >= min_confidence."""
+        scores = self.probe_fields(text, fields)
+        print(f"[NerAgent] Field probe: " + ", ".join(f"{k}={v:.1f}" for k, v in scores.items()))
+        return all(score >= min_confidence for score in scores.values())
+
     # -------------------------
     # Field consolidation
     # -------------------------
     def _consolidate_fields(
         self,
-        text: str,
+        doc,
         preds: List[NerPrediction]
     ) -> Dict[str, Any]:
         """Map predicted entities to final fields with regex fallback"""
+        view = self._view(doc)
         out = {
             'event_name': '',
             'date': '',
@@ -959,7 +1176,7 @@ class NerAgent:
 
         # Event Name
         if not out['event_name']:
-            fallback = self._extract_event_name_fallback(text)
+            fallback = self._extract_event_name_fallback(view)
             if fallback:
                 out['event_name'] = fallback
                 log_fallback("EVENT_NAME", fallback)
@@ -968,7 +1185,7 @@ class NerAgent:
 
         # Date
         if not out['date']:
-            fallback = self._extract_date_fallback(text)
+            fallback = self._extract_date_fallback(view)
             if fallback:
                 out['date'] = fallback
                 log_fallback("DATE", fallback)
@@ -977,7 +1194,7 @@ class NerAgent:
 
         # Venue
         if not out['venue']:
-            fallback = self._extract_venue_fallback(text)
+            fallback = self._extract_venue_fallback(view)
             if fallback:
                 out['venue'] = fallback
                 log_fallback("VENUE", fallback)
@@ -986,7 +1203,7 @@ class NerAgent:
 
         # Organizer
         if not out['organizer']:
-            fallback = self._extract_organizer_fallback(text)
+            fallback = self._extract_organizer_fallback(view)
             if fallback:
                 out['organizer'] = fallback
                 log_fallback("ORGANIZER", fallback)
@@ -995,7 +1212,7 @@ class NerAgent:
 
         # Department
         if not out['department']:
-            fallback = self._extract_department_fallback(text)
+            fallback = self._extract_department_fallback(view)
             if fallback:
                 out['department'] = fallback
                 log_fallback("DEPARTMENT", fallback)
@@ -1011,7 +1228,7 @@ class NerAgent:
 
         # Category
         if not out['category']:
-            fallback = self._extract_category_fallback(text)
+            fallback = self._extract_category_fallback(view)
             if fallback:
                 out['category'] = fallback
                 log_fallback("CATEGORY", fallback)
@@ -1020,7 +1237,7 @@ class NerAgent:
 
         # Doc Type
         if not out['doc_type']:
-            fallback = self._extract_doc_type_fallback(text)
+            fallback = self._extract_doc_type_fallback(view)
             if fallback:
                 out['doc_type'] = fallback
                 log_fallback("DOC_TYPE", fallback)
@@ -1038,7 +1255,23 @@ class NerAgent:
     # Main pipeline
     # -------------------------
     def predict(self, text: str, title: str = '') -> Dict[str, Any]:
-        """Main prediction pipeline"""
+        """Main prediction pipeline.
+
+        Results are cached per document text (duplicate uploads, re-runs,
+        reprocessing); callers get their own copy of the fields.
+        """
+        key = self._result_cache_key(text)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            print(f"[NerAgent] ♻️  Result cache hit — skipping NER model and fallbacks")
+            return copy.deepcopy(cached)
+
+        t0 = time.perf_counter()
+        fields = self._predict_uncached(text)
+        self.result_cache.put(key, copy.deepcopy(fields), cost=time.perf_counter() - t0)
+        return fields
+
+    def _predict_uncached(self, text: str) -> Dict[str, Any]:
         print(f"[NerAgent] Starting prediction pipeline...")
 
         # Extract entities (empty list when model is disabled → all fields use fallback)
@@ -1049,14 +1282,68 @@ class NerAgent:
             preds = []
             print(f"[NerAgent] ⚡ Skipping BERT model — using regex fallbacks only")
 
+        # One shared view of the document for every fallback extractor
+        view = DocumentView(text, self.matcher, self.scan_chars)
+
         # Consolidate fields (with fallbacks)
-        fields = self._consolidate_fields(text, preds)
+        fields = self._consolidate_fields(view, preds)
 
         print(f"[NerAgent] 📄 Document Type: {fields['doc_type']}")
         print(f"[NerAgent] 🎯 Category: {fields['category']}")
 
         return fields
 
+    # -------------------------
+    # Result cache
+    # -------------------------
+    @staticmethod
+    def _build_result_cache(config) -> TieredCache:
+        """Process-wide LRU, plus the shared SQLite level if NER_CACHE_PATH is set."""
+        disk = None
+        if config.NER_CACHE_PATH and config.NER_CACHE_MAX_MB > 0:
+            try:
+                disk = get_disk_cache('ner_results_disk', config.NER_CACHE_PATH,
+                                      config.NER_CACHE_MAX_MB * 1024 * 1024)
+            except Exception as e:
+                print(f"[NerAgent] ⚠ On-disk result cache disabled: {str(e)[:150]}")
+        return TieredCache(get_cache('ner_results', config.NER_CACHE_SIZE), disk)
+
+    def _cache_fingerprint(self) -> str:
+        """Everything besides the text that predict() output depends on.
+
+        The model directory checksum and label set change when the model
+        is retrained, so old cache entries are simply never looked up again.
+        """
+        from config import Config
+
+        model, labels = 'fallback-only', []
+        if self.use_model and self.ner_pipeline is not None:
+            if self.model_path and os.path.isdir(self.model_path):
+                model = _directory_checksum(self.model_path)
+            else:
+                model = f"hub:{self.model_path}"
+            labels = [self.id2label[i] for i in sorted(self.id2label)]
+
+        settings = [self.backend, self.windowed, self.window_tokens, self.window_stride, self.scan_chars]
+        if self.backend == 'onnx':
+            settings.append(Config.NER_ONNX_QUANTIZED)
+
+        agents_dir = Path(__file__).resolve().parent
+        code = _checksum_files([str(agents_dir / name) for name in _EXTRACTION_SOURCES])
+        return hashlib.sha256(repr((model, labels, settings, code)).encode('utf-8')).hexdigest()
+
+    def _result_cache_key(self, text: str) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = self._cache_fingerprint()
+        h = hashlib.sha256(self._fingerprint.encode('ascii'))
+        h.update(b'\0')
+        h.update((text or '').encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def result_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/time-saved counters of the predict() cache levels."""
+        return self.result_cache.stats()
+
     # -------------------------
     # Helpers
     # -------------------------
@@ -0,0 +1,222 @@
+# ner_matcher.py
+"""
+Precompiled multi-pattern matcher for the NerAgent regex fallbacks.
+
+The fallback extractors used to run every pattern with re.search over the
+whole document, and to upper-/lower-case the text again on every call. Most
+of those patterns are case-insensitive and begin with an alternation
+(`(?i)(?:REPORT|CERTIFICATE)...`, `(?i)department\\s+of...`), so `re` cannot
+use its literal-prefix fast path and attempts a match at every offset of
+the document.
+
+Here every pattern is compiled once, together with the literal "anchors"
+that any match must start with. A scan folds the document to lower case
+once, finds the anchors with str.find (a C loop, faster in CPython than a
+big alternation or a pure-Python Aho-Corasick automaton), and tries the
+compiled pattern only at those offsets. Keyword lists are checked against
+the same folded text.
+
+Results are identical to re.search / re.finditer on the original text: the
+anchors cover every way a match can start, `pattern.match(text, pos)` still
+sees the characters before `pos` for `\\b`, and documents containing the
+few characters whose case-insensitive matching is not a simple lower-case
+fold (e.g. the Kelvin sign or long s) take the plain regex path.
+"""
+
+import heapq
+import re
+import string
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Characters that (?i) matches against an ASCII letter although their
+# lower-case form differs from it (or changes the string length)
+_UNSAFE_FOLD = ('\u0130', '\u0131', '\u017f', '\u212a')
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+@dataclass(frozen=True)
+class Hit:
+    field: str
+    key: str
+    start: int
+    end: int
+    match: Optional[re.Match] = None  # None for keyword hits
+
+    @property
+    def text(self) -> str:
+        return self.match.group(0) if self.match else ''
+
+
+class AnchoredPattern:
+    """A compiled regex plus the lower-case literals its matches start with.
+
+    `anchors=None` marks a pattern with no usable anchor (e.g. one that
+    starts at `^`); it is always run as a plain regex.
+    """
+
+    def __init__(self, key: str, pattern: str, anchors: Optional[Sequence[str]], flags: int = 0):
+        self.key = key
+        self.regex = re.compile(pattern, flags)
+        self.anchors = tuple(a.lower() for a in anchors) if anchors else None
+
+
+class PatternMatcher:
+    """Patterns and keyword lists grouped by field, compiled once."""
+
+    def __init__(self):
+        self.patterns: Dict[str, Dict[str, AnchoredPattern]] = {}
+        self.keywords: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+
+    def add_pattern(self, field: str, key: str, pattern: str,
+                    anchors: Optional[Sequence[str]], flags: int = 0) -> None:
+        self.patterns.setdefault(field, {})[key] = AnchoredPattern(key, pattern, anchors, flags)
+
+    def add_keywords(self, field: str, key: str, keywords: Sequence[str]) -> None:
+        self.keywords.setdefault(field, {})[key] = tuple(k.lower() for k in keywords)
+
+    def scan(self, text: str) -> 'DocumentHits':
+        return DocumentHits(self, text)
+
+
+class DocumentHits:
+    """Matcher results for one document, computed per pattern on first use.
+
+    Anchor offsets are found once per distinct anchor and shared by every
+    pattern using it.
+    """
+
+    def __init__(self, matcher: PatternMatcher, text: str):
+        self.matcher = matcher
+        self.text = text
+        self._lower = None
+        self._fold = None
+        self._positions: Dict[str, Tuple[List[int], List[bool]]] = {}
+        self._first: Dict[Tuple[str, str], Optional[Hit]] = {}
+        self.anchored = text.isascii() or not any(c in text for c in _UNSAFE_FOLD)
+
+    # ── folded copies ────────────────────────────────────────────────────
+    @property
+    def lower(self) -> str:
+        """text.lower(), computed once (keyword lists are matched against it)."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def fold(self) -> str:
+        """A lower-case copy with the same offsets as `text`."""
+        if self._fold is None:
+            lower = self.lower
+            self._fold = lower if len(lower) == len(self.text) else self.text.translate(_ASCII_LOWER)
+        return self._fold
+
+    def _anchor_positions(self, anchor: str) -> Iterator[int]:
+        """Offsets of `anchor` in the folded text, ascending.
+
+        Found lazily with str.find and cached, so a pattern whose first
+        candidate matches never looks at the rest of the document, and
+        patterns sharing an anchor reuse the offsets already found.
+        """
+        state = self._positions.get(anchor)
+        if state is None:
+            state = self._positions[anchor] = ([], [False])
+        found, done = state
+        find = self.fold.find
+        i = 0
+        while True:
+            if i < len(found):
+                yield found[i]
+                i += 1
+                continue
+            if done[0]:
+                return
+            j = find(anchor, found[-1] + 1 if found else 0)
+            if j == -1:
+                done[0] = True
+                return
+            found.append(j)
+
+    def _candidates(self, pattern: AnchoredPattern) -> Iterator[int]:
+        if len(pattern.anchors) == 1:
+            return self._anchor_positions(pattern.anchors[0])
+        return self._merged_positions(pattern.anchors)
+
+    def _merged_positions(self, anchors: Sequence[str]) -> Iterator[int]:
+        last = -1
+        for pos in heapq.merge(*(self._anchor_positions(a) for a in anchors)):
+            if pos != last:
+                yield pos
+                last = pos
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def first(self, field: str, key: str) -> Optional[Hit]:
+        """Leftmost match of one pattern (same as re.search on the text)."""
+        cache_key = (field, key)
+        if cache_key in self._first:
+            return self._first[cache_key]
+
+        pattern = self.matcher.patterns[field][key]
+        hit = None
+        if self.anchored and pattern.anchors:
+            match = pattern.regex.match
+            for pos in self._candidates(pattern):
+                m = match(self.text, pos)
+                if m:
+                    hit = Hit(field, key, m.start(), m.end(), m)
+                    break
+        else:
+            m = pattern.regex.search(self.text)
+            if m:
+                hit = Hit(field, key, m.start(), m.end(), m)
+
+        self._first[cache_key] = hit
+        return hit
+
+    def iter(self, field: str, key: str) -> Iterator[Hit]:
+        """Non-overlapping matches of one pattern (same as re.finditer)."""
+        pattern = self.matcher.patterns[field][key]
+        if not (self.anchored and pattern.anchors):
+            for m in pattern.regex.finditer(self.text):
+                yield Hit(field, key, m.start(), m.end(), m)
+            return
+
+        match = pattern.regex.match
+        last_end = 0
+        for pos in self._candidates(pattern):
+            if pos < last_end:
+                continue
+            m = match(self.text, pos)
+            if m:
+                last_end = m.end()
+                yield Hit(field, key, m.start(), m.end(), m)
+
+    def keywords_present(self, field: str, key: str) -> List[str]:
+        """The keywords of one list that occur in the text (case-insensitively),
+        in list order."""
+        lower = self.lower
+        return [k for k in self.matcher.keywords[field][key] if k in lower]
+
+    def keyword_hits(self, field: str) -> List[Hit]:
+        """First occurrence of every keyword of `field`.
+
+        Offsets are into the lower-cased text, which only differs from the
+        original for the rare characters whose lower case is longer.
+        """
+        lower = self.lower
+        hits = []
+        for key, keywords in self.matcher.keywords.get(field, {}).items():
+            for kw in keywords:
+                i = lower.find(kw)
+                if i != -1:
+                    hits.append(Hit(field, f"{key}:{kw}", i, i + len(kw)))
+        hits.sort(key=lambda h: h.start)
+        return hits
+
+    def hits(self, field: str) -> List[Hit]:
+        """Every pattern's leftmost hit plus every keyword hit for `field`,
+        ordered by offset."""
+        out = [self.first(field, key) for key in self.matcher.patterns.get(field, {})]
+        out = [h for h in out if h is not None] + self.keyword_hits(field)
+        out.sort(key=lambda h: h.start)
+        return out
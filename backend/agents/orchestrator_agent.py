@@ -5,12 +5,9 @@ Orchestrator coordinates the complete document processing pipeline.
 Pipeline: OCR → NER (with categorization) → Abstract Generation → Database Persistence
 """
 
-from annotated_types import doc
-from agents.ocr_agent import OcrAgent
-from agents.ner_agent import NerAgent
-from agents.abstract_generator_agent import AbstractGeneratorAgent
 from models import db, Document, Event, ExtractedEntity
 import os
+import threading
 from datetime import datetime, date
 from config import Config
 
@@ -33,36 +30,90 @@ def _safe_default_extraction(doc):
     }
 
 class OrchestratorAgent:
+    """Runs the pipeline; each agent (and its models) is built on first use.
+
+    The agent modules pull in torch, transformers, docTR, OpenCV and the
+    Gemini client, so nothing is imported or loaded until a document is
+    actually processed (or preload() is called).
+    """
+
+    _UNSET = object()
+
     def __init__(self):
-        try:
-            self.ocr_agent = OcrAgent()
-            print("[Orchestrator] ✅ OCR Agent initialized")
-        except Exception as e:
-            print(f"[Orchestrator] ⚠️ OCR init failed: {e}")
-            self.ocr_agent = None
-        
-        try:
-            self.ner_agent = NerAgent()
-            print("[Orchestrator] ✅ Enhanced NER Agent initialized (with categorization)")
-        except Exception as e:
-            print(f"[Orchestrator] ⚠️ NER Agent init failed: {e}")
-            self.ner_agent = None
-        
-        # Initialize Abstract Generator only if enabled in config
-        if Config.USE_ABSTRACT_AGENT:
-            try:
-                self.abstract_generator = AbstractGeneratorAgent(method='gemini')
-                print("[Orchestrator] ✅ Abstract Generator initialized (Gemini API)")
-            except Exception as e:
-                print(f"[Orchestrator] ⚠️ Abstract Generator init failed: {e}")
-                self.abstract_generator = None
-        else:
-            self.abstract_generator = None
-            print("[Orchestrator] ℹ️ Abstract Generator DISABLED (USE_ABSTRACT_AGENT=false)")
-
-        print("[Orchestrator] ✅ Ready to process documents")
-
-    def process_document(self, doc_id, file_path=None):
+        self._lock = threading.RLock()
+        self._ocr_agent = self._UNSET
+        self._ner_agent = self._UNSET
+        self._abstract_generator = self._UNSET
+        print("[Orchestrator] ✅ Ready to process documents (agents load on first use)")
+
+    @property
+    def ocr_agent(self):
+        if self._ocr_agent is self._UNSET:
+            with self._lock:
+                if self._ocr_agent is self._UNSET:
+                    try:
+                        from agents.ocr_agent import OcrAgent
+                        self._ocr_agent = OcrAgent()
+                        print("[Orchestrator] ✅ OCR Agent initialized")
+                    except Exception as e:
+                        print(f"[Orchestrator] ⚠️ OCR init failed: {e}")
+                        self._ocr_agent = None
+        return self._ocr_agent
+
+    @property
+    def ner_agent(self):
+        if self._ner_agent is self._UNSET:
+            with self._lock:
+                if self._ner_agent is self._UNSET:
+                    try:
+                        from agents.ner_agent import NerAgent
+                        self._ner_agent = NerAgent()
+                        print("[Orchestrator] ✅ Enhanced NER Agent initialized (with categorization)")
+                    except Exception as e:
+                        print(f"[Orchestrator] ⚠️ NER Agent init failed: {e}")
+                        self._ner_agent = None
+        return self._ner_agent
+
+    @property
+    def abstract_generator(self):
+        if self._abstract_generator is self._UNSET:
+            with self._lock:
+                if self._abstract_generator is self._UNSET:
+                    # Initialize Abstract Generator only if enabled in config
+                    if Config.USE_ABSTRACT_AGENT:
+                        try:
+                            from agents.abstract_generator_agent import AbstractGeneratorAgent
+                            self._abstract_generator = AbstractGeneratorAgent(method='gemini')
+                            print("[Orchestrator] ✅ Abstract Generator initialized (Gemini API)")
+                        except Exception as e:
+                            print(f"[Orchestrator] ⚠️ Abstract Generator init failed: {e}")
+                            self._abstract_generator = None
+                    else:
+                        self._abstract_generator = None
+                        print("[Orchestrator] ℹ️ Abstract Generator DISABLED (USE_ABSTRACT_AGENT=false)")
+        return self._abstract_generator
+
+    def preload(self):
+        """Build every agent now instead of on first use (see serve.py)."""
+        self.ocr_agent
+        self.ner_agent
+        self.abstract_generator
+        return self
+
+    def _early_exit_probe(self):
+        """Return the OCR early-exit probe, or None when incremental OCR is off.
+
+        The probe runs the NER agent's cheap regex extractors over the text
+        gathered so far and is satisfied once every OCR_EARLY_EXIT_FIELDS
+        field reaches OCR_EARLY_EXIT_CONFIDENCE.
+        """
+        if not Config.OCR_EARLY_EXIT or not self.ner_agent:
+            return None
+        fields = Config.OCR_EARLY_EXIT_FIELDS
+        threshold = Config.OCR_EARLY_EXIT_CONFIDENCE
+        return lambda text: self.ner_agent.fields_found(text, fields, threshold)
+
+    def process_document(self, doc_id, file_path=None, progress=None):
         """
         Complete document processing pipeline:
         1. OCR - Extract text from PDF/image
@@ -73,7 +124,12 @@ class OrchestratorAgent:
         Args:
             doc_id (int): Document ID from database
             file_path (str, optional): Path to uploaded file
+            progress (callable, optional): progress(stage, **detail) hook called
+                on every stage transition ('ocr', 'ner', 'abstract',
+                'persisted', 'failed'); OCR also reports page n/N.
         """
+        progress = progress or (lambda stage, **detail: None)
+
         print(f"\n{'='*70}")
         print(f"[Orchestrator] 🚀 STARTING PROCESSING - Document ID: {doc_id}")
         print(f"{'='*70}\n")
@@ -91,7 +147,7 @@ class OrchestratorAgent:
 
         # Resolve file path
         upload_folder = getattr(Config, "UPLOAD_FOLDER", "static/uploads")
-        file_path = file_path or os.path.join(upload_folder, doc.filename)
+        file_path = file_path or os.path.join(upload_folder, doc.stored_filename)
         
         if not os.path.exists(file_path):
             error_msg = f"File not found: {file_path}"
@@ -99,6 +155,7 @@ class OrchestratorAgent:
             doc.status = "failed"
             doc.last_error = error_msg
             db.session.commit()
+            progress("failed", error=error_msg)
             return
 
         print(f"[Orchestrator] 📂 File path: {file_path}")
@@ -111,8 +168,13 @@ class OrchestratorAgent:
             print("[Orchestrator] 📄 STEP 1: Running OCR...")
             print(f"{'─'*70}")
             
-            ocr = self.ocr_agent or OcrAgent()
-            ocr_output = ocr.extract_text(file_path)
+            progress("ocr")
+            ocr = self.ocr_agent
+            if ocr is None:
+                from agents.ocr_agent import OcrAgent
+                ocr = OcrAgent()
+            ocr_output = ocr.extract_text(file_path, progress=progress,
+                                          probe=self._early_exit_probe())
 
             # Handle both dict and string output
             if isinstance(ocr_output, dict):
@@ -139,6 +201,8 @@ class OrchestratorAgent:
             print("[Orchestrator] 🔍 STEP 2: Running Enhanced NER Agent...")
             print(f"{'─' * 70}")
 
+            progress("ner")
+
             # Enhanced NER does both categorization and entity extraction
             if self.ner_agent:
                 try:
@@ -165,7 +229,8 @@ class OrchestratorAgent:
             venue = ner_result.get("venue") or "Venue not specified"
             organizer = ner_result.get("organizer") or "Organizer not specified"
             department = ner_result.get("department")
-            if not department or department == "General":
+            department_extracted = bool(department) and department != "General"
+            if not department_extracted:
                 # Use the uploader's department as fallback
                 department = doc.department or "General"
                 print(f"[Orchestrator] Using uploader's department: {department}")
@@ -178,9 +243,19 @@ class OrchestratorAgent:
             print(f"[Orchestrator] 📝 STEP 3: Abstract Generation for {doc_type}...")
             print(f"{'─'*70}")
             
+            progress("abstract")
+
             # Generate abstracts for both Reports and Certificates since both contain event details
             # Note: Abstract generation can be disabled via USE_ABSTRACT_AGENT config flag
             if self.abstract_generator and (not abstract or len(abstract.strip()) < 100):
+                # Early-exit OCR may have skipped pages; the abstract needs the whole document
+                if isinstance(ocr_output, dict) and ocr_output.get("pending_pages"):
+                    try:
+                        ocr_output = ocr.complete_pending_pages(file_path, ocr_output, progress=progress)
+                        raw_text = ocr_output.get("text", raw_text)
+                        print(f"[Orchestrator] ✅ Deferred pages OCR'd ({len(raw_text)} chars total)")
+                    except Exception as e:
+                        print(f"[Orchestrator] ⚠️ Deferred page OCR failed: {e}")
                 try:
                     generated_abstract = self.abstract_generator.generate(raw_text, max_length=500)
                     if generated_abstract and len(generated_abstract) > len(abstract):
@@ -295,12 +370,17 @@ class OrchestratorAgent:
                         entity_value=str(entity_value),
                         confidence=float(confidence)
                     )
+                    # Confidence 0 marks the uploader's department, which
+                    # reuse_results() must not hand to another uploader
+                    if entity_type == "department" and not department_extracted:
+                        entity.confidence = 0.0
 
                     db.session.add(entity)
                     saved_count += 1
 
             # Commit all changes to database
             db.session.commit()
+            progress("persisted", event_id=event.id)
             
             print(f"[Orchestrator] ✅ Saved {saved_count} entities:")
             for key in entities_to_save.keys():
@@ -341,7 +421,83 @@ class OrchestratorAgent:
             doc.status = "failed"
             doc.last_error = error_msg
             db.session.commit()
+            progress("failed", error=error_msg)
             
             # Re-raise for debugging if needed
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
+    # ========================================
+    # Duplicate uploads
+    # ========================================
+    @staticmethod
+    def find_processed_duplicate(content_hash, exclude_id=None):
+        """Return the latest successfully processed document with the same
+        uploaded bytes, or None.
+
+        Only documents that made it through the pipeline (raw text saved and
+        an event created) count; queued, failed or half-deleted ones do not.
+        """
+        if not content_hash:
+            return None
+        query = Document.query.filter(
+            Document.content_hash == content_hash,
+            Document.status.in_(["needs_review", "saved"]),
+            Document.raw_text.isnot(None)
+        )
+        if exclude_id is not None:
+            query = query.filter(Document.id != exclude_id)
+        for source in query.order_by(Document.id.desc()):
+            if source.events:
+                return source
+        return None
+
+    def reuse_results(self, doc, source, progress=None):
+        """Give `doc` the results already extracted for `source`, an earlier
+        upload of the same file, instead of running OCR and NER again.
+
+        Raw text, category, the event and the extracted entities are copied;
+        review state is not, so the new event goes to the IQC queue as
+        pending like any fresh upload. The department is only copied when
+        NER found it in the text; otherwise `doc` keeps its own uploader's,
+        as process_document() would. Returns the new event.
+        """
+        progress = progress or (lambda stage, **detail: None)
+        src_event = source.events[0]
+
+        extracted = next((e for e in source.entities
+                          if e.entity_type == "department" and e.confidence), None)
+        department = extracted.entity_value if extracted else (doc.department or "General")
+
+        doc.raw_text = source.raw_text
+        doc.department = department
+        doc.category = source.category
+        doc.status = "needs_review"
+        doc.last_error = None
+        db.session.add(doc)
+        db.session.flush()
+
+        event = Event(
+            document_id=doc.id,
+            name=src_event.name,
+            date=src_event.date,
+            department=department,
+            category=src_event.category,
+            validated=False,
+            type=src_event.type,
+            status="pending"
+        )
+        db.session.add(event)
+        for entity in source.entities:
+            is_fallback = entity.entity_type == "department" and not extracted
+            db.session.add(ExtractedEntity(
+                document_id=doc.id,
+                entity_type=entity.entity_type,
+                entity_value=department if is_fallback else entity.entity_value,
+                confidence=entity.confidence
+            ))
+        db.session.commit()
+        progress("persisted", event_id=event.id, duplicate_of=source.id)
+
+        print(f"[Orchestrator] ♻️ Document {doc.id} is a duplicate of {source.id}; "
+              f"reused its text and {len(source.entities)} entities (event {event.id})")
+        return event
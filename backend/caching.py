@@ -0,0 +1,303 @@
+"""
+backend/caching.py
+
+Caches shared by the agents.
+
+LRUCache is a bounded, thread-safe least-recently-used map. Background job
+threads share one process-wide instance per name (see get_cache), so
+entries carry over from one document to the next within a worker.
+
+SqliteLRUCache is the on-disk counterpart for results too expensive to lose
+on a restart (OCR pages): JSON values in a small SQLite file shared by every
+process on the host, evicted least-recently-used once the stored values
+exceed a byte budget (see get_disk_cache). TieredCache puts an LRUCache
+in front of an optional SqliteLRUCache.
+
+Every cache keeps hit/miss counters. Callers can also pass the cost (in
+seconds) of computing a value when they store it; every later hit on that
+entry then adds the same cost to `saved_seconds`, i.e. the time the cache
+saved. cache_stats() returns the counters of all named caches.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss/time-saved counters."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (value, cost)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[1]
+            return entry[0]
+
+    def put(self, key, value, cost=0.0):
+        """Store `value`; `cost` is the seconds it took to compute."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, cost)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+            self.saved_seconds = 0.0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'saved_seconds': round(self.saved_seconds, 3),
+        }
+
+
+class SqliteLRUCache:
+    """Size-bounded LRU cache of JSON values in a SQLite file.
+
+    Same get/put/stats interface as LRUCache. `max_bytes` bounds the total
+    size of the stored (JSON-encoded) values; the least recently used
+    entries are evicted when a put goes over it. The hit/miss/saved-time
+    counters are per process, the entries are shared.
+    """
+
+    def __init__(self, db_path, max_bytes=512 * 1024 * 1024):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        # Autocommit mode; every call is a single statement or transaction
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entry (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    cost REAL NOT NULL DEFAULT 0,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entry_last_used "
+                "ON cache_entry (last_used)"
+            )
+        finally:
+            conn.close()
+
+    def get(self, key, default=None):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, cost FROM cache_entry WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE cache_entry SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.saved_seconds += row[1]
+        return json.loads(row[0])
+
+    def put(self, key, value, cost=0.0):
+        """Store JSON-serialisable `value`; `cost` is the seconds it took to compute."""
+        if self.max_bytes <= 0:
+            return
+        data = json.dumps(value, separators=(',', ':'))
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, bytes, cost, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode('utf-8')), cost, time.time())
+            )
+            # Keep the most recently used entries that fit in max_bytes
+            conn.execute("""
+                DELETE FROM cache_entry WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(bytes) OVER (
+                            ORDER BY last_used DESC, rowid DESC
+                        ) AS running FROM cache_entry
+                    ) WHERE running > ?
+                )
+            """, (self.max_bytes,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def __contains__(self, key):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT 1 FROM cache_entry WHERE key = ?", (key,)
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def __len__(self):
+        return self._totals()[0]
+
+    def _totals(self):
+        conn = self._connect()
+        try:
+            count, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM cache_entry"
+            ).fetchone()
+            return count, size
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache_entry")
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits = self.misses = 0
+            self.saved_seconds = 0.0
+
+    def stats(self):
+        count, size = self._totals()
+        lookups = self.hits + self.misses
+        return {
+            'size': count,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'saved_seconds': round(self.saved_seconds, 3),
+        }
+
+
+class TieredCache:
+    """An in-process LRUCache in front of an optional SqliteLRUCache.
+
+    Lookups try memory first, then disk (promoting disk hits into memory);
+    puts go to both. A failing disk level only logs a warning, so callers
+    never see disk errors.
+    """
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key, _MISSING)
+            except Exception as e:
+                print(f"[Cache] ⚠ Disk cache read failed: {str(e)[:150]}")
+                value = _MISSING
+            if value is not _MISSING:
+                self.memory.put(key, value)
+                return value
+        return default
+
+    def put(self, key, value, cost=0.0):
+        self.memory.put(key, value, cost)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, value, cost)
+            except Exception as e:
+                print(f"[Cache] ⚠ Disk cache write failed: {str(e)[:150]}")
+
+    def stats(self):
+        return {
+            'memory': self.memory.stats(),
+            'disk': self.disk.stats() if self.disk is not None else None,
+        }
+
+
+# =====================================================================
+# Process-wide named caches
+# =====================================================================
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, maxsize):
+    """Return the process-wide cache `name`, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = LRUCache(maxsize)
+        return cache
+
+
+def get_disk_cache(name, db_path, max_bytes):
+    """Return the process-wide SqliteLRUCache `name`, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = SqliteLRUCache(db_path, max_bytes)
+        return cache
+
+
+def cache_stats():
+    """{name: counters} for every named cache created in this process."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
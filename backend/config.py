@@ -12,6 +12,8 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', f"sqlite:///{BASE_DIR/'app.db'}")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', str(BASE_DIR/'static'/'uploads'))
+    MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '50'))  # Largest accepted upload; enforced while the file streams to disk (0 = no limit)
+    MAX_CONTENT_LENGTH = (MAX_UPLOAD_MB + 1) * 1024 * 1024 if MAX_UPLOAD_MB > 0 else None  # Whole-request cap (file + form overhead); larger requests are refused before reading
     JWT_SECRET = os.environ.get('JWT_SECRET', 'jwt-secret-key')
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
     USE_ABSTRACT_AGENT = os.environ.get('USE_ABSTRACT_AGENT', 'false').lower() == 'true'  # Set to 'true' to enable Gemini abstract generation
@@ -19,7 +21,42 @@ class Config:
 
     # NER settings
     USE_NER_MODEL = os.environ.get('USE_NER_MODEL', 'true').lower() == 'false'  # Set to 'false' to skip BERT and use regex fallbacks only
+    NER_WINDOWED = os.environ.get('NER_WINDOWED', 'true').lower() == 'true'  # Run NER over overlapping token windows when a text is longer than NER_WINDOW_TOKENS (shorter texts take one pipeline pass)
+    NER_WINDOW_TOKENS = int(os.environ.get('NER_WINDOW_TOKENS', '512'))  # Tokens per window, including [CLS]/[SEP] (model max is 512)
+    NER_WINDOW_STRIDE = int(os.environ.get('NER_WINDOW_STRIDE', '128'))  # Tokens shared by consecutive windows
+    NER_BATCH_SIZE = int(os.environ.get('NER_BATCH_SIZE', '8'))  # Windows per forward pass
+    NER_BACKEND = os.environ.get('NER_BACKEND', 'torch').lower()  # 'torch' or 'onnx' (ONNX Runtime on CPU; export with export_ner_onnx.py, falls back to torch)
+    NER_ONNX_QUANTIZED = os.environ.get('NER_ONNX_QUANTIZED', 'true').lower() == 'true'  # Prefer the int8 ONNX graph when it has been exported
+    NER_SCAN_CHARS = int(os.environ.get('NER_SCAN_CHARS', '20000'))  # Regex fallbacks only search this many leading characters (0 = whole document)
+    NER_CACHE_SIZE = int(os.environ.get('NER_CACHE_SIZE', '1024'))  # predict() results memoised per process, keyed by text + model checksum (0 = no cache)
+    NER_CACHE_PATH = os.environ.get('NER_CACHE_PATH', '')  # Optional SQLite file sharing predict() results across processes and restarts ('' = in-process only)
+    NER_CACHE_MAX_MB = int(os.environ.get('NER_CACHE_MAX_MB', '64'))  # Least recently used results are evicted beyond this size
 
     # OCR settings
     MAX_OCR_PAGES = int(os.environ.get('MAX_OCR_PAGES', '8'))  # Max pages to OCR (scanned images); digital text pages are always processed
     OCR_DPI = int(os.environ.get('OCR_DPI', '200'))  # DPI for rendering scanned pages (200 is sufficient for most docs)
+    OCR_BATCH_PAGES = int(os.environ.get('OCR_BATCH_PAGES', '4'))  # Scanned pages sent to docTR per predictor call (higher = faster, more RAM)
+    OCR_PARALLEL_PAGES = os.environ.get('OCR_PARALLEL_PAGES', 'false').lower() == 'true'  # OCR scanned PDF pages across a process pool (CPU-only nodes)
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', str(min(4, os.cpu_count() or 1))))  # Processes in the page-parallel OCR pool (each loads its own docTR model)
+    OCR_EARLY_EXIT = os.environ.get('OCR_EARLY_EXIT', 'false').lower() == 'true'  # OCR scanned pages incrementally and stop once the required fields are found
+    OCR_EARLY_EXIT_FIELDS = [f.strip() for f in os.environ.get('OCR_EARLY_EXIT_FIELDS', 'event_name,date,department,venue').split(',') if f.strip()]  # Fields that must be found before OCR stops early
+    OCR_EARLY_EXIT_CONFIDENCE = float(os.environ.get('OCR_EARLY_EXIT_CONFIDENCE', '0.8'))  # Min regex-probe confidence for a field to count as found
+    SYMSPELL_DICTIONARY = os.environ.get('SYMSPELL_DICTIONARY', str(BASE_DIR/'frequency_dictionary_en_82_765.txt'))  # Spelling dictionary; its prebuilt index is cached next to it (symspell_cache.py)
+    SPELLING_CACHE_SIZE = int(os.environ.get('SPELLING_CACHE_SIZE', '50000'))  # Words whose SymSpell correction is memoised per process (0 = no cache)
+    OCR_CACHE_PATH = os.environ.get('OCR_CACHE_PATH', str(BASE_DIR/'ocr_cache.db'))  # SQLite file caching raw OCR output per page, shared by all processes ('' = no cache)
+    OCR_CACHE_MAX_MB = int(os.environ.get('OCR_CACHE_MAX_MB', '512'))  # Least recently used pages are evicted beyond this size (0 = no cache)
+
+    # Background processing queue
+    JOB_QUEUE_PATH = os.environ.get('JOB_QUEUE_PATH', str(BASE_DIR/'job_queue.db'))  # SQLite file holding the durable upload queue
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))  # Background worker threads per process (0 = enqueue only, no processing)
+    JOB_WORKERS_AUTOSTART = os.environ.get('JOB_WORKERS_AUTOSTART', 'true').lower() == 'true'  # Start workers on the app's first request; serve.py starts them after fork instead
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1.0'))  # Seconds an idle worker waits before polling the queue again
+    JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', '1800'))  # Running jobs older than this are assumed dead and requeued
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))  # Give up on a job after this many crashed attempts
+    PROGRESS_STREAM_TIMEOUT = int(os.environ.get('PROGRESS_STREAM_TIMEOUT', '900'))  # Max seconds a progress event stream stays open
+
+    # Production serving (serve.py)
+    SERVE_BIND = os.environ.get('SERVE_BIND', '0.0.0.0:5000')  # Address gunicorn listens on
+    SERVE_WORKERS = int(os.environ.get('SERVE_WORKERS', '4'))  # Forked worker processes sharing the preloaded models
+    SERVE_THREADS = int(os.environ.get('SERVE_THREADS', '8'))  # Request threads per worker (progress streams hold one each)
+    SERVE_TIMEOUT = int(os.environ.get('SERVE_TIMEOUT', '300'))  # Seconds before gunicorn restarts a silent worker
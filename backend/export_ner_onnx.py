@@ -0,0 +1,122 @@
+"""
+export_ner_onnx.py
+
+Export the fine-tuned NER model to ONNX for the CPU inference backend
+(NER_BACKEND=onnx), optionally with dynamic int8 quantisation.
+
+The exported graph takes the same padded token windows NerAgent builds for
+windowed inference (batch and sequence axes are dynamic) and returns the
+token-classification logits.
+
+Usage:
+    # FP32 export to ml_models/ner_model/onnx/model.onnx
+    python export_ner_onnx.py
+
+    # FP32 + int8 (ml_models/ner_model/onnx/model.int8.onnx)
+    python export_ner_onnx.py --quantize
+
+    # Custom paths
+    python export_ner_onnx.py --model-dir ml_models/ner_model \\
+                              --output-dir ml_models/ner_model/onnx \\
+                              --quantize
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForTokenClassification
+
+DEFAULT_MODEL_DIR = str(Path(__file__).parent / 'ml_models' / 'ner_model')
+ONNX_FP32_NAME = 'model.onnx'
+ONNX_INT8_NAME = 'model.int8.onnx'
+
+
+def export_onnx(model_dir: str, output_dir: str, opset: int = 14) -> Path:
+    """Export the token-classification model to <output_dir>/model.onnx."""
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForTokenClassification.from_pretrained(model_dir)
+    model.eval()
+
+    sample = tokenizer(
+        ["Department of CSE (AI & ML) report on a workshop", "Venue: Seminar Hall"],
+        padding=True, return_tensors='pt'
+    )
+    input_names = [k for k in ('input_ids', 'attention_mask', 'token_type_ids') if k in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch', 1: 'sequence'}
+
+    onnx_path = output / ONNX_FP32_NAME
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(onnx_path),
+            input_names=input_names,
+            output_names=['logits'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    # Keep the tokenizer and label map next to the graph
+    tokenizer.save_pretrained(output)
+    model.config.save_pretrained(output)
+
+    print(f"✅ Exported ONNX graph: {onnx_path} ({onnx_path.stat().st_size / 1e6:.1f} MB)")
+    return onnx_path
+
+
+def quantize_onnx(onnx_path: Path) -> Path:
+    """Dynamically quantise the graph's weights to int8 (activations stay FP32)."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    int8_path = onnx_path.with_name(ONNX_INT8_NAME)
+    quantize_dynamic(str(onnx_path), str(int8_path), weight_type=QuantType.QInt8)
+    print(f"✅ Quantised int8 graph: {int8_path} ({int8_path.stat().st_size / 1e6:.1f} MB)")
+    return int8_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the NER model to ONNX')
+    parser.add_argument('--model-dir', type=str, default=DEFAULT_MODEL_DIR,
+                        help='Fine-tuned model directory')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Where to write the ONNX files (default: <model-dir>/onnx)')
+    parser.add_argument('--quantize', action='store_true',
+                        help='Also write a dynamically int8-quantised graph')
+    parser.add_argument('--opset', type=int, default=14,
+                        help='ONNX opset version')
+    parser.add_argument('--clean', action='store_true',
+                        help='Remove the output directory before exporting')
+
+    args = parser.parse_args()
+    output_dir = args.output_dir or str(Path(args.model_dir) / 'onnx')
+
+    print("=" * 70)
+    print("NER Model ONNX Export")
+    print("=" * 70)
+    print(f"   Model Directory: {args.model_dir}")
+    print(f"   Output Directory: {output_dir}")
+    print(f"   Quantize: {'int8' if args.quantize else 'no'}")
+
+    if args.clean and Path(output_dir).exists():
+        shutil.rmtree(output_dir)
+
+    onnx_path = export_onnx(args.model_dir, output_dir, opset=args.opset)
+    if args.quantize:
+        quantize_onnx(onnx_path)
+
+    print("\nNext steps:")
+    print("1. Enable the backend in your .env file:")
+    print("   NER_BACKEND=onnx")
+    print("2. Compare against PyTorch:")
+    print("   python ../test/compare_ner_backends.py")
+
+
+if __name__ == '__main__':
+    main()
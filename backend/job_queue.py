@@ -0,0 +1,474 @@
+"""
+backend/job_queue.py
+
+Durable, SQLite-backed job queue for document processing.
+
+Uploads only enqueue a job and return; a pool of background worker threads
+claims jobs one at a time and runs the orchestrator pipeline inside its own
+Flask app context (and therefore its own scoped SQLAlchemy session).
+
+Stage transitions reported by the pipeline (queued → ocr page n/N → ner →
+abstract → persisted/failed) are appended to a `job_event` table in the same
+file, which the progress stream endpoint tails.
+
+The queue lives in its own small SQLite file (JOB_QUEUE_PATH) so it is
+shared by every process on the host and survives restarts: jobs that were
+running when a process died are put back on the queue after
+JOB_STALE_SECONDS, by whichever worker next finds itself idle.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Pipeline stages that end a document's progress stream
+TERMINAL_STAGES = ("persisted", "failed")
+
+# Progress events older than this are pruned when new jobs are queued
+EVENT_RETENTION_SECONDS = 24 * 3600
+
+# Idle workers look for jobs orphaned by a dead process this often
+STALE_CHECK_SECONDS = 60
+
+STALE_JOB_ERROR = "Worker died too many times while processing"
+
+
+class JobQueue:
+    """Minimal persistent FIFO of document processing jobs."""
+
+    def __init__(self, db_path, max_attempts=3, stale_seconds=1800):
+        self.db_path = str(db_path)
+        self.max_attempts = max_attempts
+        self.stale_seconds = stale_seconds
+        # Set whenever a job is enqueued so idle workers in this process
+        # wake up immediately instead of waiting for the next poll.
+        self.new_job = threading.Event()
+        # Notified on every progress event so stream readers in this
+        # process see it at once; other processes pick it up on their poll.
+        self.progress_changed = threading.Condition()
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._init_schema()
+
+    # ------------------------------------------------------------------
+    # Connection / schema
+    # ------------------------------------------------------------------
+    def _connect(self):
+        # Autocommit mode; transactions are opened explicitly where needed.
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS processing_job (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    document_id INTEGER NOT NULL,
+                    file_path TEXT,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL,
+                    claimed_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_processing_job_status_id "
+                "ON processing_job (status, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_processing_job_document_id "
+                "ON processing_job (document_id)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_event (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    document_id INTEGER NOT NULL,
+                    stage TEXT NOT NULL,
+                    detail TEXT,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_job_event_document_id_id "
+                "ON job_event (document_id, id)"
+            )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.utcnow().isoformat()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, document_id, file_path=None):
+        """Add a job for `document_id` and return its job id."""
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                "INSERT INTO processing_job (document_id, file_path, status, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (document_id, file_path, QUEUED, self._now())
+            )
+            job_id = cur.lastrowid
+        finally:
+            conn.close()
+
+        self.new_job.set()
+        self.record_progress(document_id, "queued", {"job_id": job_id})
+        self.prune_events()
+        print(f"[JobQueue] 📥 Job {job_id} queued for document {document_id}")
+        return job_id
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def claim(self, worker_name):
+        """Atomically take the oldest queued job, or return None."""
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock up front so two workers
+            # (threads or processes) can never claim the same row.
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM processing_job WHERE status = ? ORDER BY id LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE processing_job SET status = ?, worker = ?, claimed_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, worker_name, self._now(), row["id"])
+            )
+            conn.execute("COMMIT")
+            job = dict(row)
+            job["attempts"] += 1
+            return job
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, job_id):
+        self._finish(job_id, DONE, None)
+
+    def fail(self, job_id, error):
+        self._finish(job_id, FAILED, error)
+
+    def _finish(self, job_id, status, error):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE processing_job SET status = ?, last_error = ?, finished_at = ? "
+                "WHERE id = ?",
+                (status, error, self._now(), job_id)
+            )
+        finally:
+            conn.close()
+
+    def requeue_stale(self):
+        """Put back jobs whose worker died mid-run (crash, redeploy, OOM).
+
+        Jobs that already used up `max_attempts` are marked failed instead
+        of looping forever.  Returns `(requeued, failed)`, where `failed` is
+        a list of `(job_id, document_id)` for the jobs given up on.
+        """
+        cutoff = datetime.utcfromtimestamp(time.time() - self.stale_seconds).isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            failed = [
+                (row["id"], row["document_id"]) for row in conn.execute(
+                    "SELECT id, document_id FROM processing_job "
+                    "WHERE status = ? AND claimed_at < ? AND attempts >= ?",
+                    (RUNNING, cutoff, self.max_attempts)
+                )
+            ]
+            conn.executemany(
+                "UPDATE processing_job SET status = ?, finished_at = ?, last_error = ? "
+                "WHERE id = ?",
+                [(FAILED, self._now(), STALE_JOB_ERROR, job_id) for job_id, _ in failed]
+            )
+            cur = conn.execute(
+                "UPDATE processing_job SET status = ?, worker = NULL "
+                "WHERE status = ? AND claimed_at < ?",
+                (QUEUED, RUNNING, cutoff)
+            )
+            conn.execute("COMMIT")
+            requeued = cur.rowcount
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if requeued:
+            print(f"[JobQueue] ♻️ Requeued {requeued} stale job(s)")
+            self.new_job.set()
+        if failed:
+            print(f"[JobQueue] ❌ Gave up on {len(failed)} stale job(s) after {self.max_attempts} attempts")
+        return requeued, failed
+
+    # ------------------------------------------------------------------
+    # Progress events
+    # ------------------------------------------------------------------
+    def record_progress(self, document_id, stage, detail=None):
+        """Append a stage transition for a document and wake stream readers."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO job_event (document_id, stage, detail, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (document_id, stage, json.dumps(detail or {}), self._now())
+            )
+        finally:
+            conn.close()
+
+        with self.progress_changed:
+            self.progress_changed.notify_all()
+
+    def progress_reporter(self, document_id):
+        """Return a `progress(stage, **detail)` callback bound to one document."""
+        def report(stage, **detail):
+            try:
+                self.record_progress(document_id, stage, detail)
+            except Exception as e:
+                # Progress is best-effort; never fail a job because of it
+                print(f"[JobQueue] ⚠️ Could not record progress for document {document_id}: {e}")
+        return report
+
+    def events_since(self, document_ids, after_id=0):
+        """Return progress events for `document_ids` with id > `after_id`, oldest first."""
+        if not document_ids:
+            return []
+        placeholders = ",".join("?" for _ in document_ids)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT id, document_id, stage, detail, created_at FROM job_event "
+                f"WHERE document_id IN ({placeholders}) AND id > ? ORDER BY id",
+                (*document_ids, after_id)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._event_dict(r) for r in rows]
+
+    def latest_events(self, document_ids):
+        """Return {document_id: latest progress event} for `document_ids`."""
+        if not document_ids:
+            return {}
+        placeholders = ",".join("?" for _ in document_ids)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT id, document_id, stage, detail, created_at FROM job_event "
+                f"WHERE id IN (SELECT MAX(id) FROM job_event "
+                f"WHERE document_id IN ({placeholders}) GROUP BY document_id)",
+                tuple(document_ids)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {r["document_id"]: self._event_dict(r) for r in rows}
+
+    def wait_for_progress(self, timeout):
+        """Block until a progress event is recorded in this process or `timeout` passes."""
+        with self.progress_changed:
+            self.progress_changed.wait(timeout)
+
+    def prune_events(self):
+        cutoff = datetime.utcfromtimestamp(time.time() - EVENT_RETENTION_SECONDS).isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM job_event WHERE created_at < ?", (cutoff,))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _event_dict(row):
+        event = dict(row)
+        event["detail"] = json.loads(event["detail"] or "{}")
+        return event
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def latest_job(self, document_id):
+        """Return the most recent job row for a document as a dict, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM processing_job WHERE document_id = ? ORDER BY id DESC LIMIT 1",
+                (document_id,)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def pending_count(self):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM processing_job WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+
+class JobWorkerPool:
+    """Background threads that drain a JobQueue.
+
+    Each job runs inside a fresh `app.app_context()`, so Flask-SQLAlchemy
+    hands the thread its own scoped session, which is removed again when the
+    context is popped.
+    """
+
+    def __init__(self, app, queue, process_fn, num_workers=2, poll_interval=1.0):
+        self.app = app
+        self.queue = queue
+        self.process_fn = process_fn
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._threads = []
+        self._stale_lock = threading.Lock()
+        self._next_stale_check = 0.0
+
+    def start(self):
+        """Start the worker threads (idempotent and safe to call concurrently)."""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self.requeue_stale()
+            threads = []
+            for i in range(self.num_workers):
+                name = f"doc-worker-{os.getpid()}-{i + 1}"
+                t = threading.Thread(target=self._run, args=(name,), name=name, daemon=True)
+                t.start()
+                threads.append(t)
+            self._threads = threads
+        print(f"[JobQueue] ✅ Started {self.num_workers} background worker(s)")
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self.queue.new_job.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_name):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(worker_name)
+            except Exception as e:
+                print(f"[JobQueue] ⚠️ {worker_name} could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                self.requeue_stale()
+                self.queue.new_job.wait(self.poll_interval)
+                self.queue.new_job.clear()
+                continue
+
+            self._run_job(worker_name, job)
+
+    def requeue_stale(self):
+        """Requeue orphaned jobs and fail the documents of exhausted ones.
+
+        Runs at most once per STALE_CHECK_SECONDS across this pool's
+        threads, so idle workers can call it on every poll.
+        """
+        if not self._stale_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() < self._next_stale_check:
+                return
+            self._next_stale_check = time.monotonic() + STALE_CHECK_SECONDS
+            _, failed = self.queue.requeue_stale()
+            for job_id, doc_id in failed:
+                self._fail_stale_document(job_id, doc_id)
+        except Exception as e:
+            print(f"[JobQueue] ⚠️ Could not requeue stale jobs: {e}")
+        finally:
+            self._stale_lock.release()
+
+    def _fail_stale_document(self, job_id, doc_id):
+        from models import db, Document
+
+        # A newer job (reprocess) owns the document now; leave it alone
+        latest = self.queue.latest_job(doc_id)
+        if latest is not None and latest["id"] != job_id:
+            return
+
+        with self.app.app_context():
+            try:
+                doc = db.session.get(Document, doc_id)
+                if doc is not None:
+                    doc.status = "failed"
+                    doc.last_error = STALE_JOB_ERROR
+                    db.session.commit()
+            finally:
+                db.session.remove()
+        self.queue.record_progress(doc_id, "failed", {"error": STALE_JOB_ERROR})
+
+    def _run_job(self, worker_name, job):
+        from models import db, Document
+
+        doc_id = job["document_id"]
+        print(f"[JobQueue] 🚀 {worker_name} picked job {job['id']} "
+              f"(document {doc_id}, attempt {job['attempts']})")
+
+        with self.app.app_context():
+            try:
+                self.process_fn(
+                    doc_id,
+                    file_path=job["file_path"],
+                    progress=self.queue.progress_reporter(doc_id)
+                )
+
+                # process_document records its own failures on the Document
+                doc = db.session.get(Document, doc_id)
+                if doc is None:
+                    self.queue.fail(job["id"], f"Document {doc_id} no longer exists")
+                elif doc.status == "failed":
+                    self.queue.fail(job["id"], doc.last_error)
+                else:
+                    self.queue.complete(job["id"])
+            except Exception as e:
+                traceback.print_exc()
+                db.session.rollback()
+                doc = db.session.get(Document, doc_id)
+                if doc is not None:
+                    doc.status = "failed"
+                    doc.last_error = str(e)
+                    db.session.commit()
+                self.queue.fail(job["id"], str(e))
+                self.queue.record_progress(doc_id, "failed", {"error": str(e)})
+            finally:
+                db.session.remove()
@@ -1,13 +1,16 @@
-import os, datetime, jwt
-from flask import Flask, request, jsonify, send_file
+import os, datetime, jwt, json, time, threading, gzip, hashlib
+from flask import Flask, request, jsonify, send_file, Response
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload
 from flask_migrate import Migrate
 from config import Config
-from models import db, User, Document, ExtractedEntity, Event
+from models import db, User, Document, ExtractedEntity, Event, DepartmentStats
 from werkzeug.utils import secure_filename
-from agents.orchestrator_agent import OrchestratorAgent
+from werkzeug.exceptions import RequestEntityTooLarge
+from job_queue import JobQueue, JobWorkerPool, TERMINAL_STAGES
+from upload_storage import UploadRequest, store_upload, upload_limit_bytes
 from functools import wraps
 from flask_cors import CORS
-from fpdf import FPDF
 from io import BytesIO
 import secrets
 from werkzeug.security import generate_password_hash
@@ -18,11 +21,17 @@ validator_agent = ValidatorAgent()
 
 
 ALLOWED_EXT = {'pdf', 'png', 'jpg', 'jpeg', 'tiff'}
+MAX_STATUS_IDS = 100  # cap on ?ids= for the status / progress endpoints
+DEFAULT_PAGE_SIZE = 50  # ?limit= default for keyset-paginated lists
+MAX_PAGE_SIZE = 200
+GZIP_MIN_BYTES = 1024  # smaller document texts are sent uncompressed
 
 
 def create_app():
     app = Flask(__name__, static_folder='static', template_folder='templates')
     app.config.from_object(Config)
+    # Uploaded files stream to disk and are hashed as they arrive
+    app.request_class = UploadRequest
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     db.init_app(app)
     migrate = Migrate(app, db)
@@ -38,7 +47,42 @@ def create_app():
 
 
 
-    orchestrator = OrchestratorAgent()
+    # The orchestrator (and every model behind it) is built on first use, so
+    # the CLI, migrations and read-only endpoints start without torch/docTR
+    orchestrator_lock = threading.Lock()
+
+    def get_orchestrator():
+        if 'orchestrator' not in app.extensions:
+            with orchestrator_lock:
+                if 'orchestrator' not in app.extensions:
+                    from agents.orchestrator_agent import OrchestratorAgent
+                    app.extensions['orchestrator'] = OrchestratorAgent()
+        return app.extensions['orchestrator']
+
+    def process_document(doc_id, **kwargs):
+        return get_orchestrator().process_document(doc_id, **kwargs)
+
+    # Uploads are processed in the background; see job_queue.py
+    job_queue = JobQueue(
+        app.config['JOB_QUEUE_PATH'],
+        max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+        stale_seconds=app.config['JOB_STALE_SECONDS']
+    )
+    job_workers = JobWorkerPool(
+        app, job_queue, process_document,
+        num_workers=app.config['JOB_WORKERS'],
+        poll_interval=app.config['JOB_POLL_INTERVAL']
+    )
+    app.extensions['get_orchestrator'] = get_orchestrator
+    app.extensions['job_queue'] = job_queue
+    app.extensions['job_workers'] = job_workers
+
+    # Workers start with the first request rather than in create_app(), so
+    # CLI commands (flask db upgrade, ...) never claim and abandon a job
+    if app.config['JOB_WORKERS'] > 0 and app.config['JOB_WORKERS_AUTOSTART']:
+        @app.before_request
+        def start_job_workers():
+            job_workers.start()
 
     # ---------------- AUTH HELPERS ---------------- #
     def token_required(f):
@@ -81,10 +125,33 @@ def create_app():
             return wrapped
         return decorator
 
+    # ---------------- PAGINATION ---------------- #
+    def parse_page_args():
+        """Parse keyset pagination ?after=<id>&limit=<n>.
+
+        Returns (after, limit) with after None on the first page and limit
+        clamped to 1..MAX_PAGE_SIZE, or None if either is not an integer.
+        """
+        try:
+            after = request.args.get('after')
+            after = int(after) if after not in (None, '') else None
+            limit = int(request.args.get('limit') or DEFAULT_PAGE_SIZE)
+        except ValueError:
+            return None
+        return after, max(1, min(limit, MAX_PAGE_SIZE))
+
     @app.route('/api/ping')
     def ping():
         return jsonify({'message':'pong'})
 
+    @app.route('/api/stats/caches', methods=['GET'])
+    @token_required
+    @role_required(['iqc'])
+    def caches_stats(current_user):
+        """Hit/miss/time-saved counters of this worker process's caches."""
+        from caching import cache_stats
+        return jsonify({'pid': os.getpid(), 'caches': cache_stats()}), 200
+
     @app.route('/api/auth/login', methods=['POST'])
     def login():
         data = request.json or {}
@@ -115,13 +182,21 @@ def create_app():
     @role_required(['student','teacher'])
     def upload(current_user):
         """
-        Handle file upload and trigger document processing.
+        Handle file upload and queue the document for background processing.
         
         Args:
             current_user: User object injected by @token_required decorator
             
         Returns:
-            JSON response with success status and document_id
+            JSON response with success status and document_id. OCR, NER and
+            the DB writes run later on a background worker, which moves
+            Document.status from 'queued' to 'processing' and then to
+            'needs_review' or 'failed'.
+
+            The file is stored under its SHA-256 (upload_storage.py). If the
+            same bytes were already processed, the new document reuses those
+            results at once (201, status 'needs_review', 'duplicate_of')
+            instead of being queued.
         """
         try:
             # Check if file is in request
@@ -142,45 +217,73 @@ def create_app():
                 print(f"[Upload] ❌ Invalid file type: .{ext}")
                 return jsonify({'message':f'File type .{ext} not allowed. Allowed: {", ".join(ALLOWED_EXT)}'}), 400
 
-            # Secure filename and create path
+            # Secure filename (kept for display; the file is stored by hash).
+            # Document.stored_filename takes the extension from it, so it must
+            # survive: secure_filename('报告.pdf') == 'pdf'
             filename = secure_filename(file.filename)
+            if not filename.lower().endswith(f".{ext}"):
+                filename = f"upload.{ext}"
             upload_folder = app.config.get('UPLOAD_FOLDER', 'static/uploads')
             os.makedirs(upload_folder, exist_ok=True)
-            file_path = os.path.join(upload_folder, filename)
             
             print(f"[Upload] 📂 Saving file: {filename}")
-            print(f"[Upload] 📍 Path: {file_path}")
             print(f"[Upload] 👤 Uploaded by: {current_user.username}")
             print(f"[Upload] 🏢 User department: {current_user.department}")
             
-            # Save file to disk
-            file.save(file_path)
-            print(f"[Upload] ✅ File saved successfully")
+            # Move the streamed, already hashed file into place
+            stored = store_upload(file, upload_folder, ext, upload_limit_bytes(app.config))
+            file_path = stored.path
+            print(f"[Upload] ✅ File saved as {stored.filename} ({stored.size} bytes"
+                  f"{', already stored' if stored.existed else ''})")
 
             # Create document record in database
             doc = Document(
                 filename=filename, 
                 uploaded_by=current_user.username,
-                status='needs_review',
-                department=current_user.department  # Pre-populate from user
+                status='queued',
+                department=current_user.department,  # Pre-populate from user
+                content_hash=stored.content_hash
             )
             db.session.add(doc)
             db.session.commit()
             
             print(f"[Upload] 💾 Document record created (ID: {doc.id})")
 
-            # Trigger orchestration with explicit file_path parameter
-            print(f"[Upload] 🚀 Triggering orchestration...")
-            orchestrator.process_document(doc.id, file_path=file_path)
+            # Same bytes already through OCR/NER: reuse the results
+            orchestrator = get_orchestrator()
+            source = orchestrator.find_processed_duplicate(stored.content_hash, exclude_id=doc.id)
+            if source is not None:
+                event = orchestrator.reuse_results(
+                    doc, source, progress=job_queue.progress_reporter(doc.id)
+                )
+                return jsonify({
+                    "success": True,
+                    "message": f"Document '{filename}' was already processed; results reused",
+                    "document_id": doc.id,
+                    "event_id": event.id,
+                    "duplicate_of": source.id,
+                    "status": doc.status
+                }), 201
+
+            # Hand the document to the background workers and return at once
+            job_id = job_queue.enqueue(doc.id, file_path=file_path)
             
-            print(f"[Upload] ✅ Processing initiated for document {doc.id}")
+            print(f"[Upload] ✅ Document {doc.id} queued for processing (job {job_id})")
 
             return jsonify({
                 "success": True,
                 "message": f"Document '{filename}' uploaded and queued for processing",
                 "document_id": doc.id,
-                "status": "processing"
-            }), 200
+                "job_id": job_id,
+                "status": "queued"
+            }), 202
+
+        except RequestEntityTooLarge as e:
+            print(f"[Upload] ❌ Upload too large: {e.description}")
+            return jsonify({
+                "success": False,
+                "message": e.description
+            }), 413
 
         except Exception as e:
             print(f"[Upload] ❌ Upload failed: {e}")
@@ -197,32 +300,202 @@ def create_app():
     @app.route('/api/documents', methods=['GET'])
     @token_required
     def get_documents(current_user):
-        query = Document.query
+        """Documents visible to the user, newest first, one page at a time.
+
+        Query args (all optional):
+            status       one or more statuses, comma-separated
+            department   only this department
+            from, to     upload date range, YYYY-MM-DD, both inclusive
+            limit/after  keyset pagination as in parse_page_args(); pass
+                         the response's next_after as ?after=
+
+        Reads only the listed columns (never raw_text), so the response
+        size and memory use depend on the page size, not on history.
+        """
+        page = parse_page_args()
+        if page is None:
+            return jsonify({'message': 'after and limit must be integers'}), 400
+        after, limit = page
+        try:
+            date_from = datetime.date.fromisoformat(request.args['from']) if request.args.get('from') else None
+            date_to = datetime.date.fromisoformat(request.args['to']) if request.args.get('to') else None
+        except ValueError:
+            return jsonify({'message': 'from and to must be dates (YYYY-MM-DD)'}), 400
+
+        # Documents without an upload time sort last, as in the validation queue
+        uploaded_at = func.coalesce(Document.uploaded_at, datetime.datetime.min)
+        query = db.session.query(
+            Document.id, Document.filename, Document.status, Document.uploaded_at,
+            Document.uploaded_by, Document.department
+        )
 
         # 🧠 Filter by role
         if current_user.role == 'student':
-            query = query.filter_by(uploaded_by=current_user.username)
+            query = query.filter(Document.uploaded_by == current_user.username)
         elif current_user.role == 'teacher':
-            query = query.filter_by(department=current_user.department)
+            query = query.filter(Document.department == current_user.department)
         elif current_user.role == 'iqc':
             pass  # IQC sees all
 
-        documents = query.order_by(Document.uploaded_at.desc()).all()
+        statuses = [x.strip() for x in request.args.get('status', '').split(',') if x.strip()]
+        if statuses:
+            query = query.filter(Document.status.in_(statuses))
+        if request.args.get('department'):
+            query = query.filter(Document.department == request.args['department'])
+        if date_from:
+            query = query.filter(Document.uploaded_at >= datetime.datetime.combine(date_from, datetime.time.min))
+        if date_to:
+            query = query.filter(Document.uploaded_at < datetime.datetime.combine(
+                date_to + datetime.timedelta(days=1), datetime.time.min))
+
+        # Keyset: continue after the (upload time, id) of the ?after= document
+        if after is not None:
+            cursor = db.session.query(uploaded_at).filter(Document.id == after).scalar_subquery()
+            query = query.filter(or_(
+                uploaded_at < cursor,
+                and_(uploaded_at == cursor, Document.id < after)
+            ))
+
+        rows = query.order_by(uploaded_at.desc(), Document.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return jsonify({
+            "documents": [{
+                "id": d.id,
+                "filename": d.filename,
+                "status": d.status,
+                "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None,
+                "uploaded_by": d.uploaded_by,
+                "department": d.department
+            } for d in rows],
+            "next_after": rows[-1].id if has_more else None,
+            "limit": limit
+        })
+
 
-        return jsonify([{
-            "id": d.id,
-            "filename": d.filename,
-            "status": d.status,
-            "uploaded_at": d.uploaded_at.isoformat(),
-            "uploaded_by": d.uploaded_by,
-            "department": d.department
-        } for d in documents])
+    # ---------------- PROCESSING STATUS ---------------- #
+    def parse_document_ids(current_user):
+        """Parse ?ids=1,2,3 and keep only documents the user may see.
+
+        Reads just the id column, never raw_text.
+        """
+        raw = request.args.get('ids', '')
+        try:
+            ids = [int(x) for x in raw.split(',') if x.strip()][:MAX_STATUS_IDS]
+        except ValueError:
+            return None
+        if not ids:
+            return []
+
+        query = db.session.query(Document.id).filter(Document.id.in_(ids))
+        if current_user.role == 'student':
+            query = query.filter(Document.uploaded_by == current_user.username)
+        elif current_user.role == 'teacher':
+            query = query.filter(Document.department == current_user.department)
+        return [row.id for row in query]
+
+    @app.route('/api/documents/status', methods=['GET'])
+    @token_required
+    def documents_status(current_user):
+        """Batched status lookup for ?ids=1,2,3 (status columns only)."""
+        ids = parse_document_ids(current_user)
+        if ids is None:
+            return jsonify({'message': 'ids must be a comma-separated list of integers'}), 400
+
+        rows = db.session.query(
+            Document.id, Document.status, Document.last_error
+        ).filter(Document.id.in_(ids)).all() if ids else []
+        stages = job_queue.latest_events(ids)
+
+        return jsonify({"documents": [{
+            "id": r.id,
+            "status": r.status,
+            "last_error": r.last_error,
+            "stage": stages[r.id]["stage"] if r.id in stages else None,
+            "detail": stages[r.id]["detail"] if r.id in stages else {}
+        } for r in rows]}), 200
+
+    @app.route('/api/documents/events', methods=['GET'])
+    @token_required
+    def documents_events(current_user):
+        """Server-Sent Events stream of pipeline stage transitions for ?ids=.
+
+        Each event is `{"document_id", "stage", "detail"}` with stage one of
+        queued, ocr (detail has page/pages), ner, abstract, persisted, failed.
+        The stream closes once every document reached persisted/failed.
+        Pass the JWT as ?token= since EventSource cannot set headers.
+        """
+        ids = parse_document_ids(current_user)
+        if ids is None:
+            return jsonify({'message': 'ids must be a comma-separated list of integers'}), 400
+        if not ids:
+            return jsonify({'message': 'No accessible documents in ids'}), 404
+
+        try:
+            last_id = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+        except ValueError:
+            last_id = 0
+        poll_interval = app.config['JOB_POLL_INTERVAL']
+        max_seconds = app.config['PROGRESS_STREAM_TIMEOUT']
+
+        # Only wait on documents that are still in the pipeline
+        in_flight = {row.id for row in db.session.query(Document.id).filter(
+            Document.id.in_(ids), Document.status.in_(['queued', 'processing'])
+        )}
+
+        def stream():
+            nonlocal last_id
+            pending = set(in_flight)
+            started = last_sent = time.monotonic()
+            yield f"retry: {int(poll_interval * 1000)}\n\n"
+
+            while True:
+                for ev in job_queue.events_since(ids, last_id):
+                    last_id = ev["id"]
+                    if ev["stage"] in TERMINAL_STAGES:
+                        pending.discard(ev["document_id"])
+                    payload = {
+                        "document_id": ev["document_id"],
+                        "stage": ev["stage"],
+                        "detail": ev["detail"]
+                    }
+                    yield f"id: {ev['id']}\nevent: stage\ndata: {json.dumps(payload)}\n\n"
+                    last_sent = time.monotonic()
+
+                if not pending or time.monotonic() - started > max_seconds:
+                    break
+                if time.monotonic() - last_sent > 15:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                job_queue.wait_for_progress(poll_interval)
+
+            yield "event: end\ndata: {}\n\n"
+
+        return Response(stream(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
 
 
     @app.route('/api/document/<int:doc_id>', methods=['GET'])
     @token_required
     def doc_detail(current_user, doc_id):
-        d = Document.query.get_or_404(doc_id)
+        """Document, its entities and events, loaded in one query.
+
+        raw_text is not included; fetch it from /api/document/<id>/text.
+        """
+        d = Document.query.options(
+            joinedload(Document.entities), joinedload(Document.events)
+        ).filter(Document.id == doc_id).first()
+        if d is None:
+            abort(404)
+
+        # Entity values by (lower-case) type; the first of each type wins
+        entity_values = {}
+        for e in d.entities:
+            if e.entity_type:
+                entity_values.setdefault(e.entity_type.lower(), e.entity_value)
 
         # Basic entities
         ents = [{
@@ -242,28 +515,49 @@ def create_app():
             "type": ev.type 
         } for ev in d.events]
 
-        # 🧩 New helper — fetch entity value by name
-        def get_entity_value(name):
-            for e in d.entities:
-                if e.entity_type.lower() == name.lower():
-                    return e.entity_value
-            return ""
-
         # 🧩 Return all + new fields (abstract, venue, organizer)
         return jsonify({
             "document": {
                 "id": d.id,
                 "filename": d.filename,
-                "status": d.status,
-                "raw_text": d.raw_text
+                "status": d.status
             },
             "entities": ents,
+            "entity_values": entity_values,
             "events": evs,
-            "abstract": get_entity_value("abstract"),
-            "venue": get_entity_value("venue"),
-            "organizer": get_entity_value("organizer")
+            "abstract": entity_values.get("abstract") or "",
+            "venue": entity_values.get("venue") or "",
+            "organizer": entity_values.get("organizer") or ""
         })
 
+    @app.route('/api/document/<int:doc_id>/text', methods=['GET'])
+    @token_required
+    def document_text(current_user, doc_id):
+        """The document's extracted text as UTF-8 text/plain.
+
+        Supports byte ranges (Range / If-Range, 206) and ETag revalidation
+        (304). Whole-text responses are gzip-compressed when the client
+        accepts it; ranges always refer to the uncompressed bytes.
+        """
+        row = db.session.query(Document.raw_text).filter(Document.id == doc_id).first()
+        if row is None:
+            abort(404)
+        data = (row.raw_text or "").encode("utf-8")
+        use_gzip = ('Range' not in request.headers and len(data) >= GZIP_MIN_BYTES
+                    and 'gzip' in request.accept_encodings)
+
+        response = Response(data, mimetype="text/plain")
+        # Each encoding is its own representation, with its own ETag
+        response.set_etag(hashlib.sha256(data).hexdigest() + ('-gzip' if use_gzip else ''))
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+
+        if use_gzip and response.status_code == 200:
+            response.set_data(gzip.compress(data))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+
 
 
 
@@ -287,20 +581,50 @@ def create_app():
     @token_required
     @role_required(["teacher", "iqc"])
     def list_pending_events(current_user):
+        """Unvalidated events, oldest upload first, one page at a time.
+
+        ?limit= events per page (default DEFAULT_PAGE_SIZE); pass the
+        response's next_after as ?after= for the next page (null on the last
+        one). One query per page: the uploader comes from a join, and only
+        the listed columns are read.
+        """
         try:
+            page = parse_page_args()
+            if page is None:
+                return jsonify({"message": "after and limit must be integers"}), 400
+            after, limit = page
+
+            # Events without a document (none are created today) sort first
+            uploaded_at = func.coalesce(Document.uploaded_at, datetime.datetime.min)
+            query = db.session.query(
+                Event.id, Event.name, Event.date, Event.category, Event.department,
+                Event.type, Event.document_id, Event.validated, Document.uploaded_by
+            ).outerjoin(Document, Event.document_id == Document.id).filter(Event.validated == False)
+
             # 🧑‍🏫 Teachers → See only events from their department that are unvalidated
             if current_user.role == "teacher":
-                events = Event.query.filter_by(validated=False, department=current_user.department).all()
+                query = query.filter(Event.department == current_user.department)
             
             # 🧑‍💼 IQC → See all unvalidated events from all departments
-            elif current_user.role == "iqc":
-                events = Event.query.filter_by(validated=False).all()
-            
-            else:
+            elif current_user.role != "iqc":
                 return jsonify({"message": "Forbidden"}), 403
 
+            # Keyset: continue after the (upload time, id) of the ?after= event
+            if after is not None:
+                cursor = db.session.query(uploaded_at).select_from(Event).outerjoin(
+                    Document, Event.document_id == Document.id
+                ).filter(Event.id == after).scalar_subquery()
+                query = query.filter(or_(
+                    uploaded_at > cursor,
+                    and_(uploaded_at == cursor, Event.id > after)
+                ))
+
+            rows = query.order_by(uploaded_at, Event.id).limit(limit + 1).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
             event_list = []
-            for e in events:
+            for e in rows:
                 event_list.append({
                     "id": e.id,
                     "name": e.name,
@@ -309,11 +633,15 @@ def create_app():
                     "department": e.department,
                     "type": e.type,
                     "document_id": e.document_id,
-                    "uploaded_by": e.document.uploaded_by if e.document else "Unknown",
+                    "uploaded_by": e.uploaded_by or "Unknown",
                     "validated": e.validated
                 })
 
-            return jsonify({"events": event_list}), 200
+            return jsonify({
+                "events": event_list,
+                "next_after": rows[-1].id if has_more else None,
+                "limit": limit
+            }), 200
 
         except Exception as e:
             print("[Error] Event fetch failed:", e)
@@ -324,7 +652,7 @@ def create_app():
     @token_required
     def document_file(current_user, doc_id):
         d = Document.query.get_or_404(doc_id)
-        filename = d.filename
+        filename = d.stored_filename
         upload_dir = app.config.get('UPLOAD_FOLDER', 'uploads')
         try:
             # Determine mimetype
@@ -367,10 +695,16 @@ def create_app():
                 "AERO": 10
             }
 
+            # One read of the rollup instead of a COUNT over event per department
+            stats = {
+                s.department: s for s in
+                DepartmentStats.query.filter(DepartmentStats.department.in_(departments))
+            }
+
             result = {}
 
             for dept, fixed_total in departments.items():
-                validated = Event.query.filter_by(department=dept, validated=True).count()
+                validated = stats[dept].validated if dept in stats else 0
 
                 # ✅ progress = validated / fixed_total
                 progress = round((validated / fixed_total) * 100, 2) if fixed_total > 0 else 0
@@ -986,10 +1320,19 @@ def create_app():
             print(f"[Delete] Error: {e}")
             return jsonify({"message": "Delete failed", "error": str(e)}), 500
 
-    
+
+    @app.cli.command('rebuild-department-stats')
+    def rebuild_department_stats():
+        """Recount the IQC tracker's department_stats rollup from the event table."""
+        DepartmentStats.rebuild()
+        print(f"[Stats] ✅ Rebuilt counters for {DepartmentStats.query.count()} departments")
+
     return app
 
-app = create_app()
+# Worker processes started with multiprocessing 'spawn' (e.g. the OCR page
+# pool) re-import this module as __mp_main__; they must not build an app.
+if __name__ != '__mp_main__':
+    app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,55 @@
+"""department stats rollup
+
+Per-department event counters read by the IQC tracker, filled from the
+event table with one GROUP BY and maintained on every event change by
+models._track_department_stats().
+
+Revision ID: 00242a742ea8
+Revises: 8ff2c2d9bdcb
+Create Date: 2026-10-16 12:20:08.113574
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '00242a742ea8'
+down_revision = '8ff2c2d9bdcb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'department_stats' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    stats = op.create_table('department_stats',
+    sa.Column('department', sa.String(length=120), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.Column('validated', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.Column('rejected', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('department')
+    )
+    event = sa.table('event', sa.column('department', sa.String()),
+                     sa.column('validated', sa.Boolean()), sa.column('status', sa.String()))
+    validated = sa.func.coalesce(event.c.validated, sa.false())
+    status = sa.func.coalesce(event.c.status, 'pending')
+    counts = (
+        sa.select(
+            event.c.department,
+            sa.func.count(),
+            sa.func.sum(sa.case((validated, 1), else_=0)),
+            sa.func.sum(sa.case(((~validated) & (status == 'pending'), 1), else_=0)),
+            sa.func.sum(sa.case((status == 'rejected', 1), else_=0)),
+        )
+        .where(event.c.department.isnot(None))
+        .group_by(event.c.department)
+    )
+    op.execute(stats.insert().from_select(
+        ['department', 'events', 'validated', 'pending', 'rejected'], counts
+    ))
+
+
+def downgrade():
+    op.drop_table('department_stats')
@@ -0,0 +1,39 @@
+"""document content hash
+
+Revision ID: 23481020dd05
+Revises: 1eea89f60ea7
+Create Date: 2026-10-16 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '23481020dd05'
+down_revision = '1eea89f60ea7'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Existing databases were partly migrated by hand, so only add what is missing
+    with op.batch_alter_table('document', schema=None) as batch_op:
+        if 'content_hash' not in _columns('document'):
+            batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        if 'ix_document_content_hash' not in _indexes('document'):
+            batch_op.create_index(batch_op.f('ix_document_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('document', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_document_content_hash'))
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,29 @@
+"""document uploaded_at index
+
+IQC's document list (all departments, newest first) and its date-range
+filter page through document by uploaded_at.
+
+Revision ID: 35e877bcd523
+Revises: 00242a742ea8
+Create Date: 2026-10-16 13:41:55.902316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '35e877bcd523'
+down_revision = '00242a742ea8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    indexes = {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('document')}
+    if 'ix_document_uploaded_at' not in indexes:
+        op.create_index('ix_document_uploaded_at', 'document', ['uploaded_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_document_uploaded_at', table_name='document')
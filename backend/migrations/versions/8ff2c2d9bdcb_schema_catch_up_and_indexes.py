@@ -0,0 +1,101 @@
+"""schema catch-up and hot-path indexes
+
+Brings a database created by the init migration up to models.py (columns
+that were added by hand since: user.plain_password, document.category /
+department, event.type / status / reviewer_comment, and extracted_entity's
+label/text renamed to entity_type/entity_value), then adds the indexes the
+tracker, validation and document list queries filter on.
+
+Databases that were already altered by hand only get what they lack.
+The downgrade therefore only drops the indexes: it cannot tell columns this
+revision added from ones that held data before it, so the catch-up is
+irreversible.
+
+Revision ID: 8ff2c2d9bdcb
+Revises: 23481020dd05
+Create Date: 2026-10-16 11:02:17.540913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8ff2c2d9bdcb'
+down_revision = '23481020dd05'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_event_department_validated_status', 'event', ['department', 'validated', 'status']),
+    ('ix_event_document_id', 'event', ['document_id']),
+    ('ix_document_uploaded_by', 'document', ['uploaded_by']),
+    ('ix_document_department_uploaded_at', 'document', ['department', 'uploaded_at']),
+    ('ix_extracted_entity_document_id_entity_type', 'extracted_entity', ['document_id', 'entity_type']),
+]
+
+ADDED_COLUMNS = {
+    'user': [sa.Column('plain_password', sa.String(length=120), nullable=True)],
+    'document': [
+        sa.Column('category', sa.String(length=120), nullable=True),
+        sa.Column('department', sa.String(length=120), nullable=True),
+    ],
+    'event': [
+        sa.Column('type', sa.String(length=50), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('reviewer_comment', sa.Text(), nullable=True),
+    ],
+}
+
+RENAMED_COLUMNS = {
+    'extracted_entity': [
+        ('label', 'entity_type', sa.String(length=100)),
+        ('text', 'entity_value', sa.Text()),
+    ],
+}
+
+
+def _columns(table):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for table, columns in ADDED_COLUMNS.items():
+        existing = _columns(table)
+        missing = [c for c in columns if c.name not in existing]
+        if missing:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                for column in missing:
+                    batch_op.add_column(column)
+
+    for table, renames in RENAMED_COLUMNS.items():
+        existing = _columns(table)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for old, new, type_ in renames:
+                if new in existing:
+                    continue
+                if old in existing:
+                    batch_op.alter_column(old, new_column_name=new, existing_type=type_)
+                else:
+                    batch_op.add_column(sa.Column(new, type_, nullable=True))
+
+    # Events from before the review workflow: derive status from validated
+    op.execute("UPDATE event SET status = CASE WHEN validated THEN 'validated' ELSE 'pending' END "
+               "WHERE status IS NULL")
+    op.execute("UPDATE event SET type = 'Report' WHERE type IS NULL")
+
+    for name, table, columns in INDEXES:
+        if name not in _indexes(table):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    # Columns and renames stay: see the module docstring
+    for name, table, _ in reversed(INDEXES):
+        if name in _indexes(table):
+            op.drop_index(name, table_name=table)
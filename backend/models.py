@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import case, event as sa_event, false, func, insert, inspect, select, update
+from sqlalchemy.orm import Session, deferred
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
@@ -22,19 +24,44 @@ class User(db.Model):
         return check_password_hash(self.password_hash, password)
 
 class Document(db.Model):
+    # Document lists: a student's own uploads, a department's or everyone's newest first
+    __table_args__ = (
+        db.Index('ix_document_department_uploaded_at', 'department', 'uploaded_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(400), nullable=False)
-    uploaded_by = db.Column(db.String(120), nullable=True)
-    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(50), default='uploaded')  # uploaded, processing, needs_review, saved, failed
-    raw_text = db.Column(db.Text, nullable=True)
+    uploaded_by = db.Column(db.String(120), nullable=True, index=True)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    status = db.Column(db.String(50), default='uploaded')  # uploaded, queued, processing, needs_review, saved, failed
+    # Whole OCR text, often hundreds of KB: only loaded when accessed
+    raw_text = deferred(db.Column(db.Text, nullable=True))
     last_error = db.Column(db.Text, nullable=True)
 
     # ----- NEW: fields used by orchestrator -----
     category = db.Column(db.String(120), nullable=True)
     department = db.Column(db.String(120), nullable=True)
 
+    # SHA-256 of the uploaded bytes; the file is stored as <content_hash>.<ext>
+    # (upload_storage.py). NULL for documents uploaded before that
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+
+    @property
+    def stored_filename(self):
+        """Name of the uploaded file inside UPLOAD_FOLDER."""
+        if not self.content_hash:
+            return self.filename
+        # Uploads always have an extension; a dotless name is what
+        # secure_filename() left of an all non-ASCII one ('报告.pdf' -> 'pdf')
+        ext = self.filename.rsplit('.', 1)[-1].lower()
+        return f"{self.content_hash}.{ext}" if ext else self.content_hash
+
 class ExtractedEntity(db.Model):
+    # A document's entities, optionally of one type
+    __table_args__ = (
+        db.Index('ix_extracted_entity_document_id_entity_type', 'document_id', 'entity_type'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False)
     entity_type = db.Column(db.String(100))  # EVENT_NAME, DATE, DEPARTMENT, CATEGORY
@@ -44,8 +71,13 @@ class ExtractedEntity(db.Model):
     document = db.relationship('Document', backref='entities')
 
 class Event(db.Model):
+    # Tracker and validation queues: a department's validated / pending events
+    __table_args__ = (
+        db.Index('ix_event_department_validated_status', 'department', 'validated', 'status'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=True)
+    document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=True, index=True)
     name = db.Column(db.String(500))
     date = db.Column(db.Date)
     department = db.Column(db.String(120))
@@ -59,3 +91,138 @@ class Event(db.Model):
 
     document = db.relationship('Document', backref='events')
 
+
+class DepartmentStats(db.Model):
+    """Per-department event counters for the IQC tracker.
+
+    Kept in step with the event table by _track_department_stats() below,
+    in the same transaction as the change, so the tracker reads one row per
+    department instead of counting events. Bulk Query.update()/delete() on
+    events bypasses it; rebuild() recounts everything with one GROUP BY.
+    """
+    __tablename__ = 'department_stats'
+
+    department = db.Column(db.String(120), primary_key=True)
+    events = db.Column(db.Integer, nullable=False, default=0)
+    validated = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)   # not validated, status "pending"
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+
+    COUNTERS = ('events', 'validated', 'pending', 'rejected')
+
+    @classmethod
+    def rebuild(cls):
+        """Recount every department from the event table (one GROUP BY)."""
+        db.session.query(cls).delete()
+        db.session.execute(insert(cls.__table__).from_select(
+            ['department', *cls.COUNTERS], count_department_stats(Event.__table__)
+        ))
+        db.session.commit()
+
+
+def count_department_stats(event):
+    """SELECT department, events, validated, pending, rejected FROM `event`
+    GROUP BY department.
+
+    `event` is Event.__table__. Migration 00242a742ea8 backfills the table
+    with its own frozen copy of this query.
+    """
+    validated = func.coalesce(event.c.validated, false())
+    status = func.coalesce(event.c.status, 'pending')
+    return (
+        select(
+            event.c.department,
+            func.count(),
+            func.sum(case((validated, 1), else_=0)),
+            func.sum(case(((~validated) & (status == 'pending'), 1), else_=0)),
+            func.sum(case((status == 'rejected', 1), else_=0)),
+        )
+        .where(event.c.department.isnot(None))
+        .group_by(event.c.department)
+    )
+
+
+def _event_counts(department, validated, status):
+    """(department, counter increments) one event row contributes."""
+    validated = bool(validated)
+    status = status or "pending"   # column defaults, not yet applied to new rows
+    return department, (1, int(validated), int(not validated and status == "pending"), int(status == "rejected"))
+
+
+def _committed_value(event, key):
+    history = inspect(event).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(event, key)
+
+
+_STAT_KEYS = ('department', 'validated', 'status')
+
+# Load the old value when these are assigned, so a flush always knows
+# which counters an update moves out of
+for _key in _STAT_KEYS:
+    sa_event.listen(getattr(Event, _key), 'set', lambda *args: None, active_history=True)
+
+
+@sa_event.listens_for(Session, 'before_flush')
+def _track_department_stats(session, flush_context, instances):
+    """Apply the counter changes of the events being flushed."""
+    deltas = {}
+
+    def add(counts, sign):
+        department, increments = counts
+        if department is None:
+            return
+        totals = deltas.setdefault(department, [0] * len(increments))
+        for i, n in enumerate(increments):
+            totals[i] += sign * n
+
+    for obj in session.new:
+        if isinstance(obj, Event):
+            add(_event_counts(*(getattr(obj, k) for k in _STAT_KEYS)), +1)
+    for obj in session.deleted:
+        if isinstance(obj, Event):
+            add(_event_counts(*(_committed_value(obj, k) for k in _STAT_KEYS)), -1)
+    for obj in session.dirty:
+        if isinstance(obj, Event) and obj not in session.deleted and session.is_modified(obj):
+            old = _event_counts(*(_committed_value(obj, k) for k in _STAT_KEYS))
+            new = _event_counts(*(getattr(obj, k) for k in _STAT_KEYS))
+            if old != new:
+                add(old, -1)
+                add(new, +1)
+
+    for department, increments in deltas.items():
+        if any(increments):
+            _add_department_stats(session.connection(), department,
+                                  dict(zip(DepartmentStats.COUNTERS, increments)))
+
+
+def _add_department_stats(connection, department, increments):
+    """Add `increments` to a department's counters, creating its row if needed."""
+    table = DepartmentStats.__table__
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(department=department, **increments)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.department],
+            set_={c: table.c[c] + stmt.excluded[c] for c in increments}
+        ))
+    elif dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table).values(department=department, **increments)
+        connection.execute(stmt.on_duplicate_key_update(
+            {c: table.c[c] + stmt.inserted[c] for c in increments}
+        ))
+    else:
+        updated = connection.execute(
+            update(table).where(table.c.department == department)
+            .values({c: table.c[c] + n for c, n in increments.items()})
+        )
+        if not updated.rowcount:
+            connection.execute(insert(table).values(department=department, **increments))
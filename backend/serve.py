@@ -0,0 +1,172 @@
+"""
+serve.py
+
+Production entry point: gunicorn with the app (and every model) preloaded in
+the master process.
+
+The master builds the OrchestratorAgent once (docTR, the NER model, SymSpell),
+freezes it, and then forks SERVE_WORKERS workers. Workers never write to the
+model pages, so they share them copy-on-write instead of each loading its own
+copy:
+  - torch modules are put in eval mode with gradients disabled;
+  - gc.freeze() moves every object allocated so far into the permanent
+    generation, so the cyclic GC in the workers never touches (and therefore
+    never copies) their pages.
+
+Background job workers are threads and threads do not survive fork, so they
+are started in each worker after the fork (post_fork), not in the master.
+
+Each worker prints its RSS and PSS once it is up; PSS divides shared pages
+between the processes sharing them, so sum(PSS) is the real footprint.
+
+Usage (Linux):
+    python serve.py
+    SERVE_WORKERS=4 SERVE_BIND=0.0.0.0:5000 python serve.py
+"""
+
+import gc
+import os
+
+# Workers start their job threads after fork; the master must not
+os.environ.setdefault('JOB_WORKERS_AUTOSTART', 'false')
+
+from gunicorn.app.base import BaseApplication
+
+from config import Config
+
+
+# =====================================================================
+# Model freezing
+# =====================================================================
+def _torch_modules(orchestrator):
+    """Yield every torch module the orchestrator's agents hold."""
+    ocr = getattr(orchestrator, 'ocr_agent', None)
+    ner = getattr(orchestrator, 'ner_agent', None)
+    candidates = [
+        getattr(ocr, 'doctr_model', None),
+        getattr(getattr(ocr, 'easyocr_reader', None), 'detector', None),
+        getattr(getattr(ocr, 'easyocr_reader', None), 'recognizer', None),
+        getattr(ner, 'ner_model', None),
+    ]
+    for module in candidates:
+        if module is not None and hasattr(module, 'parameters'):
+            yield module
+
+
+def freeze_models(orchestrator):
+    """Make the loaded models read-only so forked workers share their pages."""
+    frozen = 0
+    for module in _torch_modules(orchestrator):
+        module.eval()
+        for param in module.parameters():
+            param.requires_grad_(False)
+        frozen += 1
+
+    gc.collect()
+    gc.freeze()
+    print(f"[Serve] 🧊 Froze {frozen} model(s); {gc.get_freeze_count()} objects "
+          f"moved to the permanent GC generation")
+
+
+# =====================================================================
+# Memory reporting
+# =====================================================================
+def memory_usage():
+    """Return {'rss': MB, 'pss': MB, 'shared': MB} for this process (Linux).
+
+    Uses /proc/self/smaps_rollup; PSS is None where the kernel lacks it.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        fields['Rss'] = int(line.split()[1])
+        except OSError:
+            return {}
+
+    def mb(key):
+        return round(fields[key] / 1024, 1) if key in fields else None
+
+    shared = None
+    if 'Shared_Clean' in fields or 'Shared_Dirty' in fields:
+        shared = round((fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)) / 1024, 1)
+    return {'rss': mb('Rss'), 'pss': mb('Pss'), 'shared': shared}
+
+
+def report_memory(label):
+    usage = memory_usage()
+    if not usage:
+        print(f"[Serve] {label}: memory usage unavailable on this platform")
+        return
+    print(f"[Serve] 📊 {label} (pid {os.getpid()}): RSS {usage['rss']} MB, "
+          f"PSS {usage['pss']} MB, shared {usage['shared']} MB")
+
+
+# =====================================================================
+# Gunicorn hooks
+# =====================================================================
+def post_fork(server, worker):
+    from main import app
+    from models import db
+
+    # Don't reuse database connections inherited from the master
+    with app.app_context():
+        db.engine.dispose()
+
+    job_workers = app.extensions['job_workers']
+    if app.config['JOB_WORKERS'] > 0:
+        job_workers.start()
+
+
+def post_worker_init(worker):
+    report_memory(f"Worker {worker.age} ready")
+
+
+class PreloadedApplication(BaseApplication):
+    """Gunicorn application serving an already-built Flask app."""
+
+    def __init__(self, app, options=None):
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    print("[Serve] 🚀 Preloading models in the master process...")
+    from main import app
+
+    orchestrator = app.extensions['get_orchestrator']().preload()
+    freeze_models(orchestrator)
+    report_memory("Master after preload")
+
+    options = {
+        'bind': Config.SERVE_BIND,
+        'workers': Config.SERVE_WORKERS,
+        'worker_class': 'gthread',
+        'threads': Config.SERVE_THREADS,
+        'timeout': Config.SERVE_TIMEOUT,
+        'preload_app': True,
+        'post_fork': post_fork,
+        'post_worker_init': post_worker_init,
+    }
+    PreloadedApplication(app, options).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+symspell_cache.py
+
+Prebuilt SymSpell index for the OCR agent's spelling correction.
+
+Building SymSpell from frequency_dictionary_en_82_765.txt means parsing
+~83k entries and generating every delete within the edit distance, which
+takes seconds on every OcrAgent start. load_symspell() instead loads the
+finished index from a pickle next to the dictionary (SymSpell's own
+save_pickle/load_pickle format), and only builds it from the text
+dictionary when that cache is missing or stale.
+
+The cache file name carries everything the index depends on: the
+dictionary's content hash, the SymSpell settings and the symspellpy
+version, e.g.
+
+    frequency_dictionary_en_82_765.d2p7.3f9c0a1b2c4d.symspellpy-6.7.0.pkl
+
+so editing the dictionary or upgrading symspellpy simply misses the old
+cache. Stale caches of the same dictionary are removed when a new one is
+written.
+
+Usage (build step, e.g. in the Docker image or after editing the dictionary):
+    python symspell_cache.py
+    python symspell_cache.py --dictionary path/to/dictionary.txt --force
+"""
+
+import argparse
+import gc
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from symspellpy import SymSpell
+
+try:
+    from importlib.metadata import version as _package_version
+    SYMSPELL_VERSION = _package_version('symspellpy')
+except Exception:
+    SYMSPELL_VERSION = 'unknown'
+
+DEFAULT_DICTIONARY = str(Path(__file__).resolve().parent / 'frequency_dictionary_en_82_765.txt')
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+CACHE_SUFFIX = '.pkl'
+
+
+def dictionary_digest(dictionary_path):
+    """Short content hash of the dictionary file."""
+    h = hashlib.sha1()
+    with open(dictionary_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def cache_path_for(dictionary_path, max_edit_distance=MAX_EDIT_DISTANCE,
+                   prefix_length=PREFIX_LENGTH):
+    """The cache file for this dictionary content, settings and symspellpy."""
+    path = Path(dictionary_path)
+    return path.with_name(
+        f"{path.stem}.d{max_edit_distance}p{prefix_length}."
+        f"{dictionary_digest(path)}.symspellpy-{SYMSPELL_VERSION}{CACHE_SUFFIX}"
+    )
+
+
+def build_symspell(dictionary_path, max_edit_distance=MAX_EDIT_DISTANCE,
+                   prefix_length=PREFIX_LENGTH):
+    """Build the index from the text dictionary (slow path)."""
+    symspell = SymSpell(max_dictionary_edit_distance=max_edit_distance, prefix_length=prefix_length)
+    if not symspell.load_dictionary(str(dictionary_path), 0, 1):
+        raise ValueError(f"Could not load SymSpell dictionary {dictionary_path}")
+    return symspell
+
+
+def write_cache(symspell, cache_path):
+    """Atomically write the pickle and drop stale caches of the same dictionary."""
+    cache_path = Path(cache_path)
+    fd, tmp = tempfile.mkstemp(dir=str(cache_path.parent), suffix='.tmp')
+    os.close(fd)
+    try:
+        symspell.save_pickle(tmp, compressed=False)
+        os.replace(tmp, cache_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    stem = cache_path.name.split('.', 1)[0]
+    for old in cache_path.parent.glob(f"{stem}.d*.symspellpy-*{CACHE_SUFFIX}"):
+        if old != cache_path:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _load_pickle(symspell, cache_path):
+    """symspell.load_pickle() with the cyclic GC paused: the index is ~700k
+    dict entries and lists, and collections triggered while allocating them
+    would otherwise more than double the load time."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return symspell.load_pickle(str(cache_path), compressed=False)
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def load_symspell(dictionary_path=DEFAULT_DICTIONARY, max_edit_distance=MAX_EDIT_DISTANCE,
+                  prefix_length=PREFIX_LENGTH, write=True):
+    """Return a ready SymSpell for `dictionary_path`, or None if it is missing.
+
+    Loads the pickled index when it is up to date; otherwise builds it from
+    the dictionary and (if `write`) saves the cache for the next start.
+    """
+    if not dictionary_path or not os.path.exists(dictionary_path):
+        return None
+
+    cache_path = cache_path_for(dictionary_path, max_edit_distance, prefix_length)
+    if cache_path.exists():
+        symspell = SymSpell(max_dictionary_edit_distance=max_edit_distance, prefix_length=prefix_length)
+        try:
+            if _load_pickle(symspell, cache_path):
+                return symspell
+        except Exception as e:
+            print(f"[SymSpell] ⚠ Ignoring unreadable cache {cache_path.name}: {str(e)[:120]}")
+
+    symspell = build_symspell(dictionary_path, max_edit_distance, prefix_length)
+    if write:
+        try:
+            write_cache(symspell, cache_path)
+            print(f"[SymSpell] 💾 Index cached to {cache_path.name}")
+        except OSError as e:
+            # Read-only deployments just rebuild on every start
+            print(f"[SymSpell] ⚠ Could not write index cache: {e}")
+    return symspell
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prebuild the SymSpell index cache')
+    parser.add_argument('--dictionary', default=DEFAULT_DICTIONARY, help='Frequency dictionary (term count per line)')
+    parser.add_argument('--max-edit-distance', type=int, default=MAX_EDIT_DISTANCE)
+    parser.add_argument('--prefix-length', type=int, default=PREFIX_LENGTH)
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the cache is up to date')
+    args = parser.parse_args()
+
+    cache_path = cache_path_for(args.dictionary, args.max_edit_distance, args.prefix_length)
+    if cache_path.exists() and not args.force:
+        print(f"[SymSpell] ✅ Cache up to date: {cache_path}")
+        return
+
+    t0 = time.perf_counter()
+    symspell = build_symspell(args.dictionary, args.max_edit_distance, args.prefix_length)
+    print(f"[SymSpell] Built index from {Path(args.dictionary).name} in {time.perf_counter() - t0:.2f}s")
+    write_cache(symspell, cache_path)
+    print(f"[SymSpell] ✅ Wrote {cache_path} ({cache_path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
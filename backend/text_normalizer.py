@@ -0,0 +1,249 @@
+"""
+text_normalizer.py
+
+One regex normalisation engine for OCR and digital text.
+
+The OCR agent (character cleanup, digital-text and OCR spacing) and the
+NER agent's OCRPreprocessor each ran their own chains of re.sub calls,
+with the pattern strings looked up (or recompiled) on every call. Here every
+cleanup is a declarative table of rules, compiled once at import:
+
+    Rule(pattern, repl, flags)   one re.sub pass; repl is a template, or a
+                                 dict mapping the matched text to its
+                                 replacement
+    Rule(..., guard=pattern)     the same, skipped unless `guard` (a cheap
+                                 search every match must contain) occurs
+    any callable str -> str      a non-regex step (strip, word fixes, ...)
+
+The rules are written for the way re scans text. A pattern that starts with
+a literal or a character class lets re jump straight to the candidate
+characters; one that starts with a lookbehind, \b or an alternation is tried
+at every offset of the text. So lookbehinds are moved after the character
+they guard ('(?<=[A-Za-z])1' becomes '1(?<=[A-Za-z]1)'), \b before a word
+character becomes a negative lookbehind, and rules that fire on the same
+characters are merged into one pass with a dict replacement. Merges are only
+made where the merged pass gives exactly the same text as the separate ones
+(each says why); rules that interact stay separate, in their original order.
+OCR spacing also skips no-op matches (a single space "collapsed" to a single
+space): same output, far fewer replacements.
+
+test/bench_text_normalizer.py checks every pipeline against the original
+implementations on the Label Studio corpus and on fuzzed input.
+"""
+
+import re
+from typing import Callable, List, Mapping, NamedTuple, Optional, Sequence, Union
+
+
+class Rule(NamedTuple):
+    pattern: str
+    repl: Union[str, Mapping[str, str]]
+    flags: int = 0
+    guard: Optional[str] = None
+
+
+class _Pass:
+    """One compiled re.sub pass."""
+
+    def __init__(self, rule: Rule):
+        self.regex = re.compile(rule.pattern, rule.flags)
+        if isinstance(rule.repl, str):
+            self.repl = rule.repl
+        else:
+            table = dict(rule.repl)
+            self.repl = lambda m: table[m.group()]
+        self.guard = re.compile(rule.guard, rule.flags) if rule.guard else None
+
+    def __call__(self, text: str) -> str:
+        if self.guard is not None and not self.guard.search(text):
+            return text
+        return self.regex.sub(self.repl, text)
+
+
+Step = Union[Rule, Callable[[str], str]]
+
+
+class Pipeline:
+    """A compiled, ordered list of normalisation steps."""
+
+    def __init__(self, name: str, steps: Sequence[Step]):
+        self.name = name
+        self.steps: List[Callable[[str], str]] = [
+            _Pass(step) if isinstance(step, Rule) else step for step in steps
+        ]
+
+    def __call__(self, text: str) -> str:
+        for step in self.steps:
+            text = step(text)
+        return text
+
+
+# =====================================================================
+# OCR agent
+# =====================================================================
+# Context-aware character fixes for OCR output: substitutions only fire in
+# the character context where they are clearly OCR errors
+SAFE_CHARACTER_CLEANUP = Pipeline('safe_character_cleanup', [
+    # '0' → 'O' when surrounded by letters, or leading before lowercase
+    # ("0rganizer"). Merged: both only turn a '0' into 'O', and '0'/'O' are
+    # alike for \b and for [a-z]/[A-Za-z] lookarounds
+    Rule(r'0(?:(?<=[A-Za-z]0)(?=[A-Za-z])|(?<!\w0)(?=[a-z]{2,}))', 'O'),
+    # '1' → 'l' when surrounded by letters (not in numbers/dates)
+    Rule(r'1(?<=[A-Za-z]1)(?=[a-z])', 'l'),
+    # Leading '1' before lowercase: "1nnovation" → "Innovation". Not merged
+    # with the rule above: its 'l' can complete this rule's [a-z]{2,}
+    Rule(r'1(?<!\w1)(?=[a-z]{2,})', 'I'),
+    # '|' → 'I' next to letters. Merged: a '|' replaced for a following
+    # letter can never be the left neighbour another '|' needs
+    Rule(r'\|(?:(?=[A-Za-z])|(?<=[A-Za-z]\|))', 'I'),
+    # 'O' → '0' / 'l' → '1' inside numbers. Merged: both need digits on
+    # both sides, so neither can be next to a character the other changes
+    Rule(r'[Ol](?<=[0-9][Ol])(?=[0-9])', {'O': '0', 'l': '1'}),
+    # Stray symbols that are clearly OCR noise
+    Rule(r'[~`^]', ''),
+    # Broken hyphenation across lines. \b only skips starts inside a word,
+    # which can never be the leftmost match
+    Rule(r'\b(\w+)-\s*\n\s*(\w+)', r'\1\2'),
+])
+
+# Digital PDF text: collapse horizontal whitespace, trim it around
+# newlines and cap blank lines, preserving the line structure
+DIGITAL_TEXT = Pipeline('digital_text', [
+    Rule(r'[^\S\n]+', ' '),
+    Rule(r' *\n *', '\n'),
+    Rule(r'\n{3,}', '\n\n'),
+    str.strip,
+])
+
+# Final spacing of OCR text: every whitespace run becomes one space (this
+# also removes newlines, so the old follow-up '\n{3,}' pass was a no-op)
+OCR_SPACING = Pipeline('ocr_spacing', [
+    Rule(r'\s{2,}|[^\S ]', ' '),
+    str.strip,
+])
+
+
+# =====================================================================
+# OCRPreprocessor (NER text cleaning)
+# =====================================================================
+WHITESPACE = Pipeline('whitespace', [
+    # Multiple spaces → one; 3+ newlines → two
+    Rule(r' {2,}', ' '),
+    Rule(r'\n{3,}', '\n\n'),
+    # Remove spaces before punctuation
+    Rule(r'\s+([,.:;!?])', r'\1'),
+    # Add space after punctuation if missing
+    Rule(r'([,.:;])(?=[A-Za-z])', r'\1 '),
+    # Fix broken words across lines (hyphenation)
+    Rule(r'\b(\w+)-\s*\n\s*(\w+)', r'\1\2'),
+    str.strip,
+])
+
+ARTIFACTS = Pipeline('artifacts', [
+    # Page numbers (standalone numbers on lines)
+    Rule(r'^\s*\d+\s*$', '', re.MULTILINE),
+    # "Page N" markers
+    Rule(r'[Pp](?<!\w[Pp])age\s+\d+\b', ''),
+    # Excessive punctuation
+    Rule(r'[.,;:]{2,}', ','),
+    # Standalone special characters
+    Rule(r'\s[*#@$%^&]{1,2}\s', ' '),
+    # Excessive dashes/underscores
+    Rule(r'[-_]{3,}', ''),
+])
+
+CHARACTER_ERRORS = Pipeline('character_errors', [
+    Rule(r'0(?<!\w0)(?=[a-z])', 'O', re.IGNORECASE),  # 0rganizer → Organizer
+    Rule(r'1(?<!\w1)(?=[a-z])', 'I', re.IGNORECASE),  # 1nnovation → Innovation
+    Rule(r'(\w)1e', r'\1le', re.IGNORECASE),          # Hal1 → Hall, Tab1e → Table
+    Rule(r'(\w)1(\w)', r'\1l\2', re.IGNORECASE),      # General word-internal 1→l
+    # 2O25 → 2025, 20l5 → 2015 (either case). Merged: both need digits on
+    # both sides
+    Rule(r'[ol](?<=[0-9][ol])(?=[0-9])', {'O': '0', 'o': '0', 'l': '1', 'L': '1'}, re.IGNORECASE),
+    Rule(r'rn', 'm', re.IGNORECASE),                    # 'rn' often misread as 'm'
+])
+
+# Common word-level mistakes
+WORD_FIXES = {
+    'arid': 'and',
+    'oi': 'of',
+    '0f': 'of',
+    'tne': 'the',
+    'ine': 'the',
+    't0': 'to',
+    'tc': 'to',
+    'rneet': 'meet',
+    'rnachine': 'machine',
+    'cornputer': 'computer',
+}
+
+
+def fix_word_errors(text: str) -> str:
+    """Replace WORD_FIXES words, preserving their capitalisation.
+    (Also joins all whitespace into single spaces, as it always has.)"""
+    fixed_words = []
+    for word in text.split():
+        replacement = WORD_FIXES.get(word.lower())
+        if replacement is None:
+            fixed_words.append(word)
+            continue
+        if word.isupper():
+            replacement = replacement.upper()
+        elif word[0].isupper():
+            replacement = replacement.capitalize()
+        fixed_words.append(replacement)
+    return ' '.join(fixed_words)
+
+
+DATES = Pipeline('dates', [
+    # Incomplete years: "20th March 202" → "20th March 2024", "March 202" → "March 2024".
+    # Both are tried at every word; most documents have no truncated year at all
+    Rule(r'(\d{1,2}(?:st|nd|rd|th)?\s+\w+\s+)202(?!\d)', r'\g<1>2024', re.IGNORECASE, guard=r'202(?!\d)'),
+    Rule(r'(\w+\s+)202(?!\d)', r'\g<1>2024', re.IGNORECASE, guard=r'202(?!\d)'),
+])
+
+ABBREVIATIONS = Pipeline('abbreviations', [
+    # Department abbreviations. Merged: no expansion contains another
+    # abbreviation, and each starts and ends with a letter like the
+    # abbreviation it replaces, so word boundaries are unchanged. (\b after
+    # IT keeps "IT'S" but not "ITS" from expanding, as (?![\w]) did)
+    Rule(r'\b(?:CSE|ECE|IT|MCA|MBA)\b', {
+        'CSE': 'Computer Science Engineering',
+        'IT': 'Information Technology',
+        'ECE': 'Electronics and Communication Engineering',
+        'MCA': 'Computer Applications',
+        'MBA': 'Business Administration',
+    }),
+])
+
+
+def standardize_case(text: str) -> str:
+    """Strip lines; Title Case all-caps lines of more than 3 words (headings)."""
+    processed_lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.isupper() and len(line.split()) > 3:
+            line = line.title()
+        processed_lines.append(line)
+    return '\n'.join(processed_lines)
+
+
+CLEAN = Pipeline('clean', [
+    *WHITESPACE.steps,
+    *ARTIFACTS.steps,
+    *CHARACTER_ERRORS.steps,
+    fix_word_errors,
+    *DATES.steps,
+    *WHITESPACE.steps,
+])
+
+CLEAN_AGGRESSIVE = Pipeline('clean_aggressive', [
+    *WHITESPACE.steps,
+    *ARTIFACTS.steps,
+    *CHARACTER_ERRORS.steps,
+    fix_word_errors,
+    *DATES.steps,
+    *ABBREVIATIONS.steps,
+    standardize_case,
+    *WHITESPACE.steps,
+])
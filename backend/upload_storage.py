@@ -0,0 +1,152 @@
+"""
+upload_storage.py
+
+Content-addressed storage for uploaded documents.
+
+Werkzeug used to buffer a file part in memory (or a temp file) and the
+upload endpoint then copied it to UPLOAD_FOLDER under its client-supplied
+name, so the same certificate uploaded twice was stored twice, and went
+through OCR and NER twice. Here the multipart parser writes every file part
+straight to a `.part` file in UPLOAD_FOLDER, hashing (SHA-256) and counting
+the bytes as they arrive:
+
+    HashingFileStream   the stream the parser writes into; aborts with
+                        413 once the part grows past MAX_UPLOAD_MB
+    UploadRequest       Flask request class that hands out those streams
+    store_upload()      renames the finished part to `<sha256>.<ext>`;
+                        when that file already exists the part is dropped
+
+Document.content_hash records the hash, so main.upload() can find an earlier
+document with the same bytes and reuse its extraction results.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import NamedTuple, Optional
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StoredUpload(NamedTuple):
+    content_hash: str
+    filename: str      # name inside the upload folder: <sha256>.<ext>
+    path: str
+    size: int
+    existed: bool      # the same bytes were already stored
+
+
+class HashingFileStream:
+    """A file-like sink that hashes, counts and spools bytes to disk.
+
+    The `.part` file is removed on close() unless commit() moved it into
+    place first, so aborted and rejected uploads leave nothing behind.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix='upload-', suffix='.part', dir=directory)
+        self._file = os.fdopen(fd, 'w+b')
+        self._sha256 = hashlib.sha256()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.committed = False
+
+    # ---- writing (multipart parser) ----
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            self.close()
+            raise RequestEntityTooLarge(
+                f"File exceeds the upload limit of {self.max_bytes // (1024 * 1024)} MB"
+            )
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    @property
+    def content_hash(self) -> str:
+        return self._sha256.hexdigest()
+
+    # ---- reading (FileStorage.save / .read) ----
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if not self.committed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def commit(self, directory: str, ext: str) -> StoredUpload:
+        """Move the spooled bytes to `<directory>/<sha256>.<ext>`."""
+        self._file.close()  # Windows cannot rename an open file
+        filename = f"{self.content_hash}.{ext}" if ext else self.content_hash
+        dest = os.path.join(directory, filename)
+        existed = os.path.exists(dest)
+        if existed:
+            os.remove(self.path)
+        else:
+            os.replace(self.path, dest)
+        self.committed = True
+        return StoredUpload(self.content_hash, filename, dest, self.size, existed)
+
+
+def upload_limit_bytes(config) -> Optional[int]:
+    """MAX_UPLOAD_MB in bytes, or None for no limit."""
+    max_mb = config.get('MAX_UPLOAD_MB') or 0
+    return max_mb * 1024 * 1024 if max_mb > 0 else None
+
+
+class UploadRequest(Request):
+    """Request whose multipart file parts stream into HashingFileStreams."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        return HashingFileStream(config['UPLOAD_FOLDER'], upload_limit_bytes(config))
+
+
+def store_upload(file_storage, directory: str, ext: str, max_bytes: Optional[int] = None) -> StoredUpload:
+    """Store an uploaded FileStorage under its content hash.
+
+    Parts parsed by UploadRequest are already hashed on disk and are just
+    renamed; any other stream is copied through a HashingFileStream first.
+    """
+    stream = file_storage.stream
+    if not isinstance(stream, HashingFileStream):
+        spool = HashingFileStream(directory, max_bytes)
+        try:
+            shutil.copyfileobj(stream, spool, CHUNK_SIZE)
+        except BaseException:
+            spool.close()
+            raise
+        stream = spool
+    return stream.commit(directory, ext)
@@ -1,5 +1,5 @@
 // src/pages/Upload.js
-import React, { useState, useContext, useRef } from "react";
+import React, { useState, useContext, useRef, useEffect } from "react";
 import axios from "axios";
 import { AuthContext } from "../context/AuthContext";
 
@@ -10,6 +10,37 @@ export default function Upload() {
   const [message, setMessage] = useState("");
   const [isDragging, setIsDragging] = useState(false);
   const fileInputRef = useRef(null);
+  const [stage, setStage] = useState(null);
+  const eventSourceRef = useRef(null);
+
+  // Close any open progress stream when leaving the page
+  useEffect(() => () => eventSourceRef.current?.close(), []);
+
+  const describeStage = ({ stage, detail }) => {
+    switch (stage) {
+      case "queued": return "Queued for processing...";
+      case "ocr": return detail?.pages ? `Reading page ${detail.page} of ${detail.pages}...` : "Reading document...";
+      case "ner": return "Extracting event details...";
+      case "abstract": return "Preparing abstract...";
+      case "persisted": return "Processing complete — sent for validation!";
+      case "failed": return `Processing failed: ${detail?.error || "unknown error"}`;
+      default: return stage;
+    }
+  };
+
+  // Follow pipeline stages for an uploaded document via Server-Sent Events
+  const watchProgress = (documentId) => {
+    eventSourceRef.current?.close();
+    const source = new EventSource(
+      `http://localhost:5000/api/documents/events?ids=${documentId}&token=${token}`
+    );
+    source.addEventListener("stage", (e) => setStage(JSON.parse(e.data)));
+    source.addEventListener("end", () => source.close());
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) source.close();
+    };
+    eventSourceRef.current = source;
+  };
 
   const handleUpload = async (e) => {
     e.preventDefault();
@@ -21,6 +52,7 @@ export default function Upload() {
     try {
       setUploading(true);
       setMessage("");
+      setStage(null);
 
       const res = await axios.post("http://localhost:5000/api/upload", formData, {
         headers: {
@@ -30,8 +62,9 @@ export default function Upload() {
       });
 
       if (res.data.success) {
-        setMessage("File uploaded successfully and sent for validation!");
+        setMessage("File uploaded successfully and queued for processing!");
         setFile(null);
+        watchProgress(res.data.document_id);
       } else {
         setMessage("Upload completed but failed to process.");
       }
@@ -228,6 +261,9 @@ export default function Upload() {
               "alert-warning"
             }`}>
               <p className="font-medium">{message}</p>
+              {stage && (
+                <p className="text-sm mt-1">{describeStage(stage)}</p>
+              )}
             </div>
           )}
         </div>
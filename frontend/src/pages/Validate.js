@@ -28,6 +28,8 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
   const [doc, setDoc] = useState(null);
   const [loading, setLoading] = useState(false);
   const [errors, setErrors] = useState([]);
+  const [showText, setShowText] = useState(false);
+  const [rawText, setRawText] = useState(null);
 
   const [form, setForm] = useState({
     name: "",
@@ -43,6 +45,8 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
   useEffect(() => {
     if (!open || !docId) return;
     setLoading(true);
+    setShowText(false);
+    setRawText(null);
     (async () => {
       try {
         const res = await axios.get(`http://localhost:5000/api/document/${docId}`, {
@@ -51,13 +55,9 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
         const data = res.data;
         setDoc(data);
 
-        // Helper function to get entity value by type
-        const getEntityValue = (entityType) => {
-          const entity = data.entities?.find(
-            (e) => e.entity_type.toLowerCase() === entityType.toLowerCase()
-          );
-          return entity?.entity_value || "";
-        };
+        // Entity values keyed by lower-case type
+        const getEntityValue = (entityType) =>
+          data.entity_values?.[entityType.toLowerCase()] || "";
 
         if (data.events?.[0]) {
           const ev = data.events[0];
@@ -79,6 +79,24 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
     })();
   }, [open, docId, token]);
 
+  // The extracted text can be long, so it is only fetched when expanded
+  const toggleText = async () => {
+    const next = !showText;
+    setShowText(next);
+    if (next && rawText === null) {
+      try {
+        const res = await axios.get(`http://localhost:5000/api/document/${docId}/text`, {
+          headers: { Authorization: `Bearer ${token}` },
+          responseType: "text",
+        });
+        setRawText(res.data || "");
+      } catch (err) {
+        console.error("Failed to load document text", err);
+        setRawText("");
+      }
+    }
+  };
+
   const handleChange = (field, value) => {
     setForm((prev) => ({ ...prev, [field]: value }));
   };
@@ -314,6 +332,21 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
               rows={4}
             />
           </label>
+
+          <div>
+            <button
+              type="button"
+              onClick={toggleText}
+              className="text-indigo-600 hover:text-indigo-800 underline text-sm font-medium"
+            >
+              {showText ? "Hide extracted text" : "Show extracted text"}
+            </button>
+            {showText && (
+              <pre className="mt-2 border p-2 rounded bg-gray-50 text-xs whitespace-pre-wrap max-h-64 overflow-auto">
+                {rawText === null ? "Loading..." : rawText || "No text extracted."}
+              </pre>
+            )}
+          </div>
         </div>
 
 
@@ -363,6 +396,7 @@ function DocumentModal({ open, onClose, docId, token, onValidated }) {
 export default function Validate() {
   const { token } = useAuth();
   const [events, setEvents] = useState([]);
+  const [nextAfter, setNextAfter] = useState(null);
   const [modalOpen, setModalOpen] = useState(false);
   const [selectedDocId, setSelectedDocId] = useState(null);
 
@@ -370,12 +404,16 @@ export default function Validate() {
     fetchEvents();
   }, [token]);
 
-  const fetchEvents = async () => {
+  // The queue is paginated (oldest upload first); `after` continues from a previous page
+  const fetchEvents = async (after = null) => {
     try {
       const res = await axios.get("http://localhost:5000/api/validate/events", {
         headers: { Authorization: `Bearer ${token}` },
+        params: after ? { after } : {},
       });
-      setEvents(res.data.events || []);
+      const page = res.data.events || [];
+      setEvents((prev) => (after ? [...prev, ...page] : page));
+      setNextAfter(res.data.next_after ?? null);
     } catch (err) {
       console.error("Error fetching events", err);
     }
@@ -446,6 +484,16 @@ export default function Validate() {
           </tbody>
         </table>
       )}
+      {nextAfter && (
+        <div className="mt-4 text-center">
+          <button
+            onClick={() => fetchEvents(nextAfter)}
+            className="bg-gray-200 hover:bg-gray-300 px-4 py-2 rounded"
+          >
+            Load more
+          </button>
+        </div>
+      )}
       <DocumentModal
         open={modalOpen}
         onClose={() => setModalOpen(false)}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Import-time benchmark for the backend's light entry points.
+
+Each entry point is imported in a fresh interpreter with `-X importtime`.
+The script reports the total import time and the slowest modules, and fails
+if any heavy ML module (torch, transformers, docTR, OpenCV, ...) was
+imported. Models must only load when a document is processed.
+test_import_time.py runs the heavy-import check under pytest.
+
+Usage:
+    python test/bench_import_time.py [--top 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+# Entry points that must stay light: the app factory (flask run / flask db
+# upgrade / tests), the models and config used by scripts
+ENTRY_POINTS = {
+    'app': 'import main',
+    'models': 'import models',
+    'config': 'import config',
+    'validator': 'from agents.validator_agent import ValidatorAgent',
+}
+
+HEAVY_MODULES = (
+    'torch', 'transformers', 'doctr', 'easyocr', 'cv2', 'fitz',
+    'symspellpy', 'onnxruntime', 'google.generativeai',
+)
+
+
+def measure(statement):
+    """Import `statement` in a fresh interpreter; return (seconds, {module: cumulative_us})."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{Path(tmp) / 'bench.db'}",
+            JOB_QUEUE_PATH=str(Path(tmp) / 'job_queue.db'),
+            UPLOAD_FOLDER=str(Path(tmp) / 'uploads'),
+        )
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', statement],
+            cwd=str(BACKEND_DIR), env=env, capture_output=True, text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+
+    top_level = [us for name, us in modules.items() if '.' not in name]
+    return sum(top_level) / 1e6, modules
+
+
+def heavy_imports(modules):
+    return sorted(
+        name for name in modules
+        if any(name == h or name.startswith(h + '.') for h in HEAVY_MODULES)
+    )
+
+
+def run(top=10):
+    failures = {}
+    print("=" * 70)
+    print("Backend import-time benchmark")
+    print("=" * 70)
+    for label, statement in ENTRY_POINTS.items():
+        seconds, modules = measure(statement)
+        heavy = heavy_imports(modules)
+        status = "OK" if not heavy else f"HEAVY: {', '.join(h for h in heavy if '.' not in h)}"
+        print(f"\n{label:<10} {statement:<52} {seconds * 1000:8.1f} ms  {status}")
+        for name, us in sorted(modules.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"     {us / 1000:8.1f} ms  {name}")
+        if heavy:
+            failures[label] = heavy
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backend import-time benchmark')
+    parser.add_argument('--top', type=int, default=10, help='Slowest modules to list')
+    args = parser.parse_args()
+    sys.exit(1 if run(top=args.top) else 0)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the NerAgent regex fallbacks before / after the precompiled matcher.
+
+"Before" is a frozen copy of the per-pattern re.search / keyword-scan
+extractors; "after" is NerAgent's matcher-backed implementation over a shared
+DocumentView. Both run over the Label Studio export texts and over long
+synthetic reports built by concatenating them. The script reports
+per-document regex cost and checks that both versions return identical
+fields on the region the current extractors scan (NER_SCAN_CHARS);
+test_ner_fallbacks.py runs that check under pytest.
+
+Usage:
+    python test/bench_ner_fallbacks.py [--repeat 5] [--report-kb 250]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+CORPUS = BACKEND_DIR / 'project-2-at-2025-12-08-22-51-95d10e80.json'
+
+
+# =====================================================================
+# Frozen pre-matcher extractors
+# =====================================================================
+_Q = r'["\'\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'
+_NQ = r'[^"\'\u201c\u201d\u2018\u2019\u00ab\u00bb]'
+
+
+def legacy_event_name(agent, text):
+    header_text = text[:1500] if len(text) > 1500 else text
+    high_priority_patterns = [
+        (rf'(?i)\bOn\s*{_Q}({_NQ}{{10,120}}){_Q}', 100),
+        (r'(?i)(?:^|\n)\s*On\s*\n\s*([^\n]{10,120}?)(?=\s*\n\s*\d{1,2})', 95),
+        (rf'^{_NQ}{{0,300}}{_Q}({_NQ}{{10,120}}){_Q}', 90),
+    ]
+    for pattern, priority in high_priority_patterns:
+        match = re.search(pattern, header_text, re.MULTILINE)
+        if match:
+            name = agent._clean_event_name(match.group(1).strip())
+            if agent._is_valid_event_name(name):
+                return name
+
+    medium_priority_patterns = [
+        rf'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*{_Q}({_NQ}{{8,120}}){_Q}',
+        r'(?i)(?:REPORT|CERTIFICATE)\s+(?:ON|OF|FOR|on)\s*[:\-]?\s*([^\n]{8,150}?)(?=\s*(?:\n\s*\d{1,2}|\n\s*Date|\n\s*Venue|\n\n))',
+        rf'(?i)\btitled\s+{_Q}({_NQ}{{8,120}}){_Q}',
+        r'(?i)(?:title|topic|subject|name of (?:the )?event)\s*[:\-]\s*([^\n]{10,150})',
+        r'(?i)(?:^|\n)\s*On\s+([A-Z][^\n]{8,150}?)(?=\s*\n)',
+        r'(?i)^[ \t]*(?:event|workshop|seminar|conference|training|competition)\s*(?:name)?[:\-]?\s*([A-Z][^\n]{10,120})',
+    ]
+    candidates = []
+    for pattern in medium_priority_patterns:
+        for match in re.finditer(pattern, text, re.MULTILINE):
+            position = match.start()
+            pos_score = 80 if position < 500 else (60 if position < 1000 else 40)
+            name = agent._clean_event_name(match.group(1).strip())
+            if agent._is_valid_event_name(name):
+                candidates.append((name, pos_score, position))
+    if candidates:
+        candidates.sort(key=lambda x: (-x[1], x[2]))
+        return candidates[0][0]
+
+    low_priority_text = text[:2000] if len(text) > 2000 else text
+    for pattern in [
+        r'(?:^|\n)([A-Z][A-Z\s&\-]{8,100})(?=\n)',
+        r'(?i)organized\s+(?:a|an)?\s*(?:event|workshop|seminar)\s+(?:on|about)?\s*["]?([A-Z][^\n"]{10,120})',
+    ]:
+        match = re.search(pattern, low_priority_text, re.MULTILINE)
+        if match:
+            name = agent._clean_event_name(match.group(1).strip())
+            if agent._is_valid_event_name(name):
+                return name
+    return ''
+
+
+def legacy_department(agent, text):
+    from agents.ner_agent import DEPARTMENT_PATTERNS, DEPARTMENT_MAPPING
+
+    text_upper = text.upper()
+    for pattern, _ in DEPARTMENT_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            dept_clean = re.sub(r'\s+', ' ', match.group(0).strip().upper())
+            dept_clean = re.sub(r'DEPARTMENT\s+OF\s+', '', dept_clean).strip()
+            for key, value in DEPARTMENT_MAPPING.items():
+                if key in dept_clean or dept_clean in key:
+                    return value
+
+    if 'AIML' in text_upper or 'AI & ML' in text_upper or 'AI&ML' in text_upper or 'ARTIFICIAL INTELLIGENCE' in text_upper:
+        return 'AIML'
+    elif 'AEROSPACE' in text_upper or 'AERO' in text_upper:
+        return 'AERO'
+    elif 'CYBERSECURITY' in text_upper or 'CYBER SECURITY' in text_upper:
+        return 'CSE-CY'
+    elif 'DATA SCIENCE' in text_upper:
+        return 'CSE-DS'
+    elif 'ISE' in text_upper or 'INFORMATION SCIENCE' in text_upper:
+        return 'ISE'
+    elif 'ECE' in text_upper or 'ELECTRONICS' in text_upper:
+        return 'ECE'
+    elif 'CSE' in text_upper or 'COMPUTER SCIENCE' in text_upper:
+        return 'CSE(Core)'
+    return ''
+
+
+def legacy_category(agent, text):
+    from agents.ner_agent import CATEGORY_KEYWORDS
+
+    text_lower = text.lower()
+    scores = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(len(kw.split()) for kw in keywords if kw in text_lower)
+        if score > 0:
+            scores[category] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return 'General / Department Activity'
+
+
+def legacy_doc_type(agent, text):
+    from agents.ner_agent import DOC_TYPE_KEYWORDS
+
+    text_lower = text.lower()
+    cert_score = sum(1 for kw in DOC_TYPE_KEYWORDS['Certificate'] if kw in text_lower)
+    report_score = sum(1 for kw in DOC_TYPE_KEYWORDS['Report'] if kw in text_lower)
+    return 'Certificate' if cert_score > report_score else 'Report'
+
+
+LEGACY = {
+    'event_name': legacy_event_name,
+    'department': legacy_department,
+    'category': legacy_category,
+    'doc_type': legacy_doc_type,
+}
+CURRENT = {
+    'event_name': '_extract_event_name_fallback',
+    'department': '_extract_department_fallback',
+    'category': '_extract_category_fallback',
+    'doc_type': '_extract_doc_type_fallback',
+}
+
+# Texts exercising the edge cases of the anchored matcher
+EDGE_CASES = [
+    "REPORT ON \u201cIntro to Open Source Tools\u201d\nDate: 12/03/2024",
+    "xreport on something long enough\n12 March",
+    "Department of Electronics and communication \u212a report",  # Kelvin sign → plain regex path
+    "\u0130stanbul workshop, department of ise",            # lower() changes length
+    "promise of the aerospace club\nTitle: Annual Aero Modelling Meet",
+    "Organized by the ai&ml club. DS lab. Certificate of participation",
+]
+
+
+# =====================================================================
+# Benchmark
+# =====================================================================
+def make_agent():
+    from agents.ner_agent import NerAgent
+    return NerAgent(use_model=False)
+
+
+def load_texts(report_kb):
+    items = json.loads(CORPUS.read_text(encoding='utf-8'))
+    docs = [it['data']['content'] for it in items if it.get('data', {}).get('content')]
+    corpus = "\n\n".join(docs)
+    report = (corpus * (report_kb * 1024 // max(1, len(corpus)) + 1))[:report_kb * 1024]
+    return docs, [report]
+
+
+def run_current(agent, field, text):
+    agent._view_memo.__dict__.clear()  # no reuse between timed runs
+    return getattr(agent, CURRENT[field])(text)
+
+
+def time_fields(fn, agent, texts, repeat):
+    """Mean milliseconds per document for each field, plus all outputs."""
+    timings, outputs = {}, {}
+    for field in LEGACY:
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = [fn(agent, field, text) for text in texts]
+            best = min(best, time.perf_counter() - t0)
+        timings[field] = best * 1000 / len(texts)
+        outputs[field] = out
+    return timings, outputs
+
+
+def time_total(fn, agent, texts, repeat):
+    """Mean milliseconds per document for all four fields in a row."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in texts:
+            fn(agent, text)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000 / len(texts)
+
+
+def legacy_all(agent, text):
+    return [legacy(agent, text) for legacy in LEGACY.values()]
+
+
+def current_all(agent, text):
+    # One matcher scan per document, shared by the four extractors
+    agent._view_memo.__dict__.clear()
+    return [getattr(agent, name)(text) for name in CURRENT.values()]
+
+
+def check_identical(agent, texts):
+    mismatches = []
+    limit = agent.scan_chars
+    for field, legacy in LEGACY.items():
+        for text in texts:
+            # The legacy extractors searched the whole text; compare on the
+            # bounded scan region
+            old = legacy(agent, text[:limit] if limit else text)
+            new = run_current(agent, field, text)
+            if old != new:
+                mismatches.append((field, text[:60], old, new))
+    return mismatches
+
+
+def run(repeat=5, report_kb=250):
+    import contextlib
+    import io
+
+    agent = make_agent()
+    docs, reports = load_texts(report_kb)
+
+    with contextlib.redirect_stdout(io.StringIO()):  # extractors log their picks
+        mismatches = check_identical(agent, docs + reports + EDGE_CASES)
+        results = {}
+        for label, texts in ((f"{len(docs)} Label Studio docs", docs),
+                             (f"{report_kb} KB synthetic report", reports)):
+            before, _ = time_fields(lambda a, f, t: LEGACY[f](a, t), agent, texts, repeat)
+            after, _ = time_fields(run_current, agent, texts, repeat)
+            before['total'] = time_total(legacy_all, agent, texts, repeat)
+            after['total'] = time_total(current_all, agent, texts, repeat)
+            results[label] = (before, after)
+
+    print("=" * 70)
+    print("NER regex fallbacks: per-document cost (ms), before → after")
+    print("(per-field rows include their own scan; 'total' shares one scan)")
+    print("=" * 70)
+    for label, (before, after) in results.items():
+        print(f"\n{label}")
+        for field in before:
+            # Per-field rows pay for their own scan; 'total' shares one
+            print(f"   {field:<12} {before[field]:9.3f} → {after[field]:9.3f}"
+                  f"   ({before[field] / max(after[field], 1e-9):5.1f}x)")
+
+    print(f"\nIdentical outputs: {'yes' if not mismatches else f'NO ({len(mismatches)} mismatches)'}")
+    for m in mismatches[:10]:
+        print("   ", m)
+    return mismatches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='NER fallback regex benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repeats (best of)')
+    parser.add_argument('--report-kb', type=int, default=250, help='Size of the synthetic long report')
+    args = parser.parse_args()
+    sys.exit(1 if run(repeat=args.repeat, report_kb=args.report_kb) else 0)
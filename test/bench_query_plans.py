@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Query-plan benchmark for the hot-path indexes (migrations 8ff2c2d9bdcb and
+35e877bcd523).
+
+Builds a SQLite database with the real migrations and seeds it with
+synthetic documents / events / entities. It then drops the hot-path indexes
+and stamps the revision before them: the state of a database whose columns
+were added by hand. It runs the ORM queries behind the tracker, validation
+and document list endpoints, upgrades to head and runs them again. For each
+query the script prints SQLite's EXPLAIN QUERY PLAN and the best-of-N time,
+before and after. test_query_plans.py checks the plans under pytest.
+
+Usage:
+    python test/bench_query_plans.py [--documents 50000] [--repeat 5]
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+MIGRATIONS_DIR = BACKEND_DIR / 'migrations'
+BEFORE_INDEXES = '23481020dd05'
+TABLES = ('document', 'event', 'extracted_entity')
+HOT_PATH_INDEXES = [
+    'ix_event_department_validated_status',
+    'ix_event_document_id',
+    'ix_document_uploaded_by',
+    'ix_document_department_uploaded_at',
+    'ix_extracted_entity_document_id_entity_type',
+    'ix_document_uploaded_at',
+]
+
+DEPARTMENTS = ['CSE', 'AIML', 'CSE-DS', 'CSE-CY', 'ISE', 'ECE', 'AERO', 'MECH', 'CIVIL', 'EEE', 'MCA', 'MBA']
+EVENT_STATUSES = ['pending', 'validated', 'rejected']
+ENTITY_TYPES = ['event_name', 'date', 'department', 'venue', 'organizer', 'category', 'doc_type']
+
+
+def make_app(db_path, work_dir):
+    from config import Config
+    for name, value in {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}",
+        'UPLOAD_FOLDER': str(Path(work_dir) / 'uploads'),
+        'JOB_QUEUE_PATH': str(Path(work_dir) / 'job_queue.db'),
+        'JOB_WORKERS': 0,
+    }.items():
+        setattr(Config, name, value)
+    import main
+    return main.create_app()
+
+
+def migrate(app, revision):
+    from flask_migrate import upgrade
+    with app.app_context():
+        upgrade(directory=str(MIGRATIONS_DIR), revision=revision)
+
+
+def unindex(app, db_path):
+    """Drop the hot-path indexes and stamp the revision before them."""
+    from flask_migrate import stamp
+    conn = sqlite3.connect(db_path)
+    try:
+        for name in HOT_PATH_INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        conn.commit()
+    finally:
+        conn.close()
+    with app.app_context():
+        stamp(directory=str(MIGRATIONS_DIR), revision=BEFORE_INDEXES)
+
+
+def seed(db_path, documents, seed=42):
+    """Insert `documents` documents, one event each and ~7 entities per document."""
+    rng = random.Random(seed)
+    students = [f"student{i}" for i in range(max(10, documents // 100))]
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(db_path)
+    try:
+        docs, events, entities = [], [], []
+        for doc_id in range(1, documents + 1):
+            dept = rng.choice(DEPARTMENTS)
+            status = rng.choices(EVENT_STATUSES, weights=[3, 6, 1])[0]
+            docs.append((doc_id, f"report_{doc_id}.pdf", rng.choice(students),
+                         start + timedelta(minutes=doc_id * 7), 'needs_review', dept, 'Workshop'))
+            events.append((doc_id, doc_id, f"Event {doc_id}", date(2024, 1, 1) + timedelta(days=doc_id % 365),
+                           dept, 'Workshop', status == 'validated', 'Report', status))
+            for entity_type in ENTITY_TYPES:
+                entities.append((doc_id, entity_type, f"{entity_type} of {doc_id}", 0.9))
+        conn.executemany("INSERT INTO document (id, filename, uploaded_by, uploaded_at, status, department, category) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", docs)
+        conn.executemany("INSERT INTO event (id, document_id, name, date, department, category, validated, type, status) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", events)
+        conn.executemany("INSERT INTO extracted_entity (document_id, entity_type, entity_value, confidence) "
+                         "VALUES (?, ?, ?, ?)", entities)
+        conn.commit()
+    finally:
+        conn.close()
+    return students
+
+
+def hot_queries(student, doc_id):
+    """(name, ORM query) for the queries main.py runs on every tracker,
+    validation and document list request."""
+    from models import Document, Event, ExtractedEntity
+    return [
+        ('tracker: validated count per department',
+         Event.query.filter_by(department='CSE', validated=True)),
+        ('validation: pending events of a department',
+         Event.query.filter_by(department='CSE', validated=False, status='pending')),
+        ('teacher: unvalidated events of a department',
+         Event.query.filter_by(validated=False, department='CSE')),
+        ('student: own documents, newest first',
+         Document.query.filter_by(uploaded_by=student).order_by(Document.uploaded_at.desc())),
+        ('teacher: department documents, newest first',
+         Document.query.filter_by(department='CSE').order_by(Document.uploaded_at.desc())),
+        ('student: rejected events',
+         Event.query.join(Document, Event.document_id == Document.id)
+         .filter(Document.uploaded_by == student, Event.status == 'rejected')),
+        ('document: events (doc.events)',
+         Event.query.filter_by(document_id=doc_id)),
+        ('document: entities of one type',
+         ExtractedEntity.query.filter_by(document_id=doc_id, entity_type='date')),
+    ]
+
+
+def compile_sql(query):
+    from sqlalchemy.dialects import sqlite
+    return str(query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+def query_plan(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def full_scans(plan):
+    """Plan steps that read a whole table instead of searching an index."""
+    return [step for step in plan
+            if step.startswith('SCAN') and step.split()[1] in TABLES and 'INDEX' not in step]
+
+
+def best_of(conn, sql, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def measure(app, db_path, student, doc_id, repeat):
+    with app.app_context():
+        queries = [(name, compile_sql(q)) for name, q in hot_queries(student, doc_id)]
+    conn = sqlite3.connect(db_path)
+    try:
+        return {name: (query_plan(conn, sql), best_of(conn, sql, repeat)) for name, sql in queries}
+    finally:
+        conn.close()
+
+
+def run(documents=50000, repeat=5, verbose=True):
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = Path(work_dir) / 'bench.db'
+        app = make_app(db_path, work_dir)
+        migrate(app, 'head')
+        students = seed(db_path, documents)
+        unindex(app, db_path)
+        before = measure(app, db_path, students[0], documents // 2, repeat)
+        migrate(app, 'head')
+        after = measure(app, db_path, students[0], documents // 2, repeat)
+
+    if verbose:
+        print("=" * 78)
+        print(f"Hot-path queries: {documents} documents, {documents} events, "
+              f"{documents * len(ENTITY_TYPES)} entities (best of {repeat})")
+        print("=" * 78)
+        for name in before:
+            (plan_b, ms_b), (plan_a, ms_a) = before[name], after[name]
+            print(f"\n{name}:  {ms_b:8.2f} ms → {ms_a:8.2f} ms   ({ms_b / max(ms_a, 1e-6):6.1f}x)")
+            print(f"   before: {' | '.join(plan_b)}")
+            print(f"   after:  {' | '.join(plan_a)}")
+    return before, after
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query-plan benchmark for the hot-path indexes')
+    parser.add_argument('--documents', type=int, default=50000, help='Documents to seed (one event each)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repeats (best of)')
+    args = parser.parse_args()
+    run(documents=args.documents, repeat=args.repeat)
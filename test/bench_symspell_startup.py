@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Startup-time benchmark for the OCR agent's SymSpell index.
+
+Runs in fresh interpreters against a copy of the frequency dictionary in a
+temporary directory:
+  - build:  SymSpell built from the text dictionary (the old start-up path)
+  - cold:   load_symspell() with no cache (build + write the cache)
+  - warm:   load_symspell() with the cache present (the normal start-up path)
+
+and checks that the cached index returns the same corrections as a freshly
+built one (test_symspell_cache.py covers that under pytest).
+
+Usage:
+    python test/bench_symspell_startup.py [--repeat 3]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+DICTIONARY = BACKEND_DIR / 'frequency_dictionary_en_82_765.txt'
+
+SAMPLE_WORDS = ['workshp', 'organized', 'departmnet', 'seminer', 'enginering', 'certficate', 'hackathon']
+
+TIMED = r'''
+import sys, time
+sys.path.insert(0, {backend!r})
+import symspell_cache
+t0 = time.perf_counter()
+sym = {call}
+elapsed = time.perf_counter() - t0
+terms = [(s[0].term if s else None) for s in (sym.lookup(w, 0, max_edit_distance=2) for w in {words!r})]
+print(elapsed)
+print('|'.join(str(t) for t in terms))
+'''
+
+
+def timed(call, dictionary):
+    code = TIMED.format(backend=str(BACKEND_DIR), call=call.format(dictionary=str(dictionary)), words=SAMPLE_WORDS)
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    seconds, terms = proc.stdout.strip().splitlines()[-2:]
+    return float(seconds), terms
+
+
+def run(repeat=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        dictionary = Path(tmp) / DICTIONARY.name
+        shutil.copy(DICTIONARY, dictionary)
+
+        build, built_terms = min(
+            timed("symspell_cache.build_symspell({dictionary!r})", dictionary) for _ in range(repeat))
+        cold, _ = timed("symspell_cache.load_symspell({dictionary!r})", dictionary)
+        warm, warm_terms = min(
+            timed("symspell_cache.load_symspell({dictionary!r})", dictionary) for _ in range(repeat))
+        caches = list(Path(tmp).glob('*.pkl'))
+        cache_mb = caches[0].stat().st_size / 1e6 if caches else 0.0
+
+    print("=" * 70)
+    print("SymSpell start-up time (fresh interpreter, best of %d)" % repeat)
+    print("=" * 70)
+    print(f"   build from dictionary      {build * 1000:9.1f} ms")
+    print(f"   first start (build+write)  {cold * 1000:9.1f} ms")
+    print(f"   cached start (load)        {warm * 1000:9.1f} ms   ({build / max(warm, 1e-9):.1f}x, cache {cache_mb:.1f} MB)")
+    same = built_terms == warm_terms
+    print(f"\nSame corrections from the cached index: {'yes' if same else 'NO'}")
+    print(f"   {warm_terms}")
+    return same and len(caches) == 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SymSpell start-up benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repeats (best of)')
+    args = parser.parse_args()
+    sys.exit(0 if run(repeat=args.repeat) else 1)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark and identity check for the text normalisation engine.
+
+"Before" is a frozen copy of the re.sub chains the OCR agent
+(_safe_character_cleanup, _normalize_digital_text, the OCR spacing step)
+and OCRPreprocessor used to run; "after" is text_normalizer.py. Both run
+over the Label Studio export texts (real OCR / PDF extractions) and over
+fuzzed strings built from the characters the rules care about. The script
+reports per-document cost and checks that every pipeline returns exactly
+the same text. test_text_normalizer.py runs the identity check under pytest.
+
+Usage:
+    python test/bench_text_normalizer.py [--repeat 5] [--fuzz 20000]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+CORPUS = BACKEND_DIR / 'project-2-at-2025-12-08-22-51-95d10e80.json'
+
+
+# =====================================================================
+# Frozen pre-engine implementations
+# =====================================================================
+def legacy_safe_character_cleanup(text):
+    text = re.sub(r'(?<=[A-Za-z])0(?=[A-Za-z])', 'O', text)
+    text = re.sub(r'\b0(?=[a-z]{2,})', 'O', text)
+    text = re.sub(r'(?<=[A-Za-z])1(?=[a-z])', 'l', text)
+    text = re.sub(r'\b1(?=[a-z]{2,})', 'I', text)
+    text = re.sub(r'\|(?=[A-Za-z])', 'I', text)
+    text = re.sub(r'(?<=[A-Za-z])\|', 'I', text)
+    text = re.sub(r'(?<=[0-9])O(?=[0-9])', '0', text)
+    text = re.sub(r'(?<=[0-9])l(?=[0-9])', '1', text)
+    text = re.sub(r'[~`^]', '', text)
+    text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
+    return text
+
+
+def legacy_digital_text(text):
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r' *\n *', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def legacy_ocr_spacing(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+class LegacyOCRPreprocessor:
+    def __init__(self):
+        self.char_fixes = {
+            r'\b0(?=[a-z])': 'O',
+            r'\b1(?=[a-z])': 'I',
+            r'(\w)1e': r'\1le',
+            r'(\w)1(\w)': r'\1l\2',
+            r'(?<=[0-9])O(?=[0-9])': '0',
+            r'(?<=[0-9])l(?=[0-9])': '1',
+            r'rn': 'm',
+        }
+        self.word_fixes = {
+            'arid': 'and', 'oi': 'of', '0f': 'of', 'tne': 'the', 'ine': 'the',
+            't0': 'to', 'tc': 'to', 'rneet': 'meet', 'rnachine': 'machine',
+            'cornputer': 'computer',
+        }
+
+    def normalize_whitespace(self, text):
+        text = re.sub(r' {2,}', ' ', text)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = re.sub(r'\s+([,.:;!?])', r'\1', text)
+        text = re.sub(r'([,.:;])(?=[A-Za-z])', r'\1 ', text)
+        text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
+        return text.strip()
+
+    def fix_character_errors(self, text):
+        for pattern, replacement in self.char_fixes.items():
+            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        return text
+
+    def fix_word_errors(self, text):
+        fixed_words = []
+        for word in text.split():
+            lower_word = word.lower()
+            if lower_word in self.word_fixes:
+                replacement = self.word_fixes[lower_word]
+                if word.isupper():
+                    replacement = replacement.upper()
+                elif word[0].isupper():
+                    replacement = replacement.capitalize()
+                fixed_words.append(replacement)
+            else:
+                fixed_words.append(word)
+        return ' '.join(fixed_words)
+
+    def remove_artifacts(self, text):
+        text = re.sub(r'^\s*\d+\s*$', '', text, flags=re.MULTILINE)
+        text = re.sub(r'\b[Pp]age\s+\d+\b', '', text)
+        text = re.sub(r'[.,;:]{2,}', ',', text)
+        text = re.sub(r'\s[*#@$%^&]{1,2}\s', ' ', text)
+        text = re.sub(r'[-_]{3,}', '', text)
+        return text
+
+    def normalize_dates(self, text):
+        text = re.sub(r'(\d{1,2}(?:st|nd|rd|th)?\s+\w+\s+)202(?!\d)',
+                      lambda m: m.group(1) + '2024', text, flags=re.IGNORECASE)
+        text = re.sub(r'(\w+\s+)202(?!\d)', lambda m: m.group(1) + '2024', text, flags=re.IGNORECASE)
+        return text
+
+    def expand_common_abbreviations(self, text):
+        dept_abbrev = {
+            r'\bCSE\b': 'Computer Science Engineering',
+            r'\bIT\b(?![\w])': 'Information Technology',
+            r'\bECE\b': 'Electronics and Communication Engineering',
+            r'\bMCA\b': 'Computer Applications',
+            r'\bMBA\b': 'Business Administration',
+        }
+        for abbrev, full_form in dept_abbrev.items():
+            text = re.sub(abbrev, full_form, text)
+        return text
+
+    def standardize_case(self, text):
+        processed_lines = []
+        for line in text.split('\n'):
+            line = line.strip()
+            words = line.split()
+            if len(words) > 3 and line.isupper():
+                line = line.title()
+            processed_lines.append(line)
+        return '\n'.join(processed_lines)
+
+    def clean(self, text, aggressive=False):
+        if not text:
+            return ""
+        text = self.normalize_whitespace(text)
+        text = self.remove_artifacts(text)
+        text = self.fix_character_errors(text)
+        text = self.fix_word_errors(text)
+        text = self.normalize_dates(text)
+        if aggressive:
+            text = self.expand_common_abbreviations(text)
+            text = self.standardize_case(text)
+        text = self.normalize_whitespace(text)
+        return text
+
+
+# =====================================================================
+# Pipelines under test
+# =====================================================================
+def pipelines():
+    import text_normalizer as tn
+    from ocr_preprocessor import OCRPreprocessor
+
+    legacy, current = LegacyOCRPreprocessor(), OCRPreprocessor()
+    return {
+        'safe_character_cleanup': (legacy_safe_character_cleanup, tn.SAFE_CHARACTER_CLEANUP),
+        'digital_text': (legacy_digital_text, tn.DIGITAL_TEXT),
+        'ocr_spacing': (legacy_ocr_spacing, tn.OCR_SPACING),
+        'whitespace': (legacy.normalize_whitespace, current.normalize_whitespace),
+        'artifacts': (legacy.remove_artifacts, current.remove_artifacts),
+        'character_errors': (legacy.fix_character_errors, current.fix_character_errors),
+        'dates': (legacy.normalize_dates, current.normalize_dates),
+        'abbreviations': (legacy.expand_common_abbreviations, current.expand_common_abbreviations),
+        'standardize_case': (legacy.standardize_case, current.standardize_case),
+        'clean': (legacy.clean, current.clean),
+        'clean_aggressive': (lambda t: legacy.clean(t, aggressive=True),
+                             lambda t: current.clean(t, aggressive=True)),
+    }
+
+
+def load_corpus():
+    items = json.loads(CORPUS.read_text(encoding='utf-8'))
+    return [it['data']['content'] for it in items if it.get('data', {}).get('content')]
+
+
+# Characters and fragments the rules look at
+FUZZ_ALPHABET = list("aAbeIlLoOrnxz0123|~^`-_.,;:!?*#@$%&()' \t\n") + [
+    'rn', '1e', '202', 'Page ', 'page 3', 'CSE', 'IT', 'ECE', 'MCA', 'MBA', 'th ', 'March ',
+    'tne', 'oi', '0f', ' # ', '---', '...', '\n\n\n', '  ', 'WORKSHOP ON AI ML\n',
+]
+
+
+def fuzz_texts(n, seed=1234):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(1, 40))) for _ in range(n)]
+
+
+def check_identical(texts):
+    mismatches = []
+    for name, (old, new) in pipelines().items():
+        for text in texts:
+            a, b = old(text), new(text)
+            if a != b:
+                mismatches.append((name, text[:60], a[:60], b[:60]))
+    return mismatches
+
+
+def best_of(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000 / len(texts)
+
+
+def run(repeat=5, fuzz=20000):
+    docs = load_corpus()
+    mismatches = check_identical(docs + fuzz_texts(fuzz))
+
+    print("=" * 70)
+    print(f"Text normalisation: per-document cost (ms) over {len(docs)} Label Studio docs")
+    print("=" * 70)
+    for name, (old, new) in pipelines().items():
+        before, after = best_of(old, docs, repeat), best_of(new, docs, repeat)
+        print(f"   {name:<24} {before:8.3f} → {after:8.3f}   ({before / max(after, 1e-9):5.2f}x)")
+
+    print(f"\nIdentical outputs ({len(docs)} docs + {fuzz} fuzzed strings): "
+          f"{'yes' if not mismatches else f'NO ({len(mismatches)} mismatches)'}")
+    for m in mismatches[:10]:
+        print("   ", m)
+    return mismatches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Text normalisation benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repeats (best of)')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Fuzzed strings in the identity check')
+    args = parser.parse_args()
+    sys.exit(1 if run(repeat=args.repeat, fuzz=args.fuzz) else 0)
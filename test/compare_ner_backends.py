@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare the ONNX Runtime NER backend against the FP32 PyTorch model.
+
+Runs both backends over the Label Studio export texts and reports
+per-document latency and entity-level agreement (spans with the same type
+and character offsets), using the PyTorch output as the reference. test_ner_backends.py checks the
+agreement under pytest.
+
+Usage:
+    python backend/export_ner_onnx.py --quantize
+    python test/compare_ner_backends.py [--limit 20] [--fp32]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+CORPUS = BACKEND_DIR / 'project-2-at-2025-12-08-22-51-95d10e80.json'
+
+
+def load_corpus(limit=None):
+    items = json.loads(CORPUS.read_text(encoding='utf-8'))
+    texts = [it['data']['content'] for it in items if it.get('data', {}).get('content')]
+    return texts[:limit] if limit else texts
+
+
+def run_backend(agent, texts):
+    """Return (entity sets per text, latencies in ms)."""
+    outputs, latencies = [], []
+    agent.predict_entities(texts[0])  # warm-up
+    for text in texts:
+        t0 = time.perf_counter()
+        preds = agent.predict_entities(text)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        outputs.append({(p.entity_type, p.start, p.end) for p in preds})
+    return outputs, latencies
+
+
+def agreement(reference, candidate):
+    """Micro-averaged precision / recall / F1 of candidate vs reference spans."""
+    tp = sum(len(r & c) for r, c in zip(reference, candidate))
+    n_ref = sum(len(r) for r in reference)
+    n_cand = sum(len(c) for c in candidate)
+    precision = tp / n_cand if n_cand else 1.0
+    recall = tp / n_ref if n_ref else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) else 0.0
+    return precision, recall, f1
+
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"   {name:<8} mean {statistics.mean(latencies):8.1f} ms   "
+          f"p50 {statistics.median(latencies):8.1f} ms   p95 {p95:8.1f} ms")
+    return statistics.mean(latencies)
+
+
+def compare(limit=None, quantized=True):
+    from config import Config
+    from agents.ner_agent import NerAgent
+
+    Config.NER_ONNX_QUANTIZED = quantized
+    texts = load_corpus(limit)
+
+    torch_agent = NerAgent(use_model=True, backend='torch', device=-1)
+    onnx_agent = NerAgent(use_model=True, backend='onnx', device=-1)
+    if onnx_agent.backend != 'onnx':
+        raise RuntimeError("ONNX backend unavailable — run backend/export_ner_onnx.py first")
+
+    ref, torch_ms = run_backend(torch_agent, texts)
+    cand, onnx_ms = run_backend(onnx_agent, texts)
+
+    print("=" * 70)
+    print(f"NER backend comparison over {len(texts)} documents "
+          f"(ONNX {'int8' if quantized else 'fp32'})")
+    print("=" * 70)
+    t = summarize('torch', torch_ms)
+    o = summarize('onnx', onnx_ms)
+    print(f"   speed-up {t / o:.2f}x")
+
+    precision, recall, f1 = agreement(ref, cand)
+    exact = sum(r == c for r, c in zip(ref, cand))
+    print(f"   entity agreement: P={precision:.3f} R={recall:.3f} F1={f1:.3f} "
+          f"({exact}/{len(texts)} documents identical)")
+    return f1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare NER backends')
+    parser.add_argument('--limit', type=int, default=None, help='Number of documents')
+    parser.add_argument('--fp32', action='store_true', help='Compare the FP32 ONNX graph')
+    args = parser.parse_args()
+    compare(limit=args.limit, quantized=not args.fp32)
@@ -0,0 +1,92 @@
+"""
+Shared fixtures for the backend endpoint tests.
+
+`app` runs the real app against a temporary SQLite database, upload folder
+and job queue, with no job workers, so nothing is OCR'd. Modules adjust it
+by overriding `app_config` (extra Config values) and `app_users` (the
+accounts to create; each password is the username).
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def app_config():
+    return {}
+
+
+@pytest.fixture
+def app_users():
+    return [('iqc', 'iqc', 'ALL')]
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, app_config, app_users):
+    pytest.importorskip('flask_sqlalchemy')
+    pytest.importorskip('flask_migrate')
+    pytest.importorskip('flask_cors')
+    pytest.importorskip('jwt')
+    pytest.importorskip('dotenv')
+    from config import Config
+    import main
+    from models import db, User
+
+    for name, value in {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'JOB_QUEUE_PATH': str(tmp_path / 'job_queue.db'),
+        'JOB_WORKERS': 0,
+        **app_config,
+    }.items():
+        monkeypatch.setattr(Config, name, value)
+
+    app = main.create_app()
+    with app.app_context():
+        db.create_all()
+        for username, role, dept in app_users:
+            user = User(username=username, role=role, department=dept)
+            user.set_password(username)
+            db.session.add(user)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def login(app):
+    """`login(username)` returns a test client that sends that user's token."""
+    def login(username):
+        client = app.test_client()
+        token = client.post('/api/auth/login', json={'username': username, 'password': username}).json['token']
+        client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        return client
+    return login
+
+
+@pytest.fixture
+def record_queries(app):
+    """`with record_queries() as statements:` collects the SQL run inside the block."""
+    from models import db
+    from sqlalchemy import event
+
+    @contextmanager
+    def record():
+        statements = []
+
+        def on_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', on_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', on_execute)
+    return record
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Golden test for the indexed department lookups.
+
+normalize_department() and map_department() must return exactly what the
+original linear scans over EXACT_DEPARTMENTS / DEPARTMENT_MAPPING returned,
+for every key of both tables and for common variants of them (lower case,
+"Department of" prefixes, extra whitespace, fragments, keyword-only text).
+
+Usage:
+    python test/test_department_index.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from agents.departments import (  # noqa: E402
+    DEPARTMENT_MAPPING,
+    EXACT_DEPARTMENTS,
+    map_department,
+    normalize_department,
+)
+
+
+# =====================================================================
+# Reference: the original linear-scan implementations
+# =====================================================================
+def legacy_normalize(dept_text):
+    if not dept_text:
+        return ''
+    dept_clean = re.sub(r'\s+', ' ', dept_text.upper().strip())
+    dept_clean = re.sub(r'^DEPARTMENT\s+OF\s+', '', dept_clean)
+    dept_clean = re.sub(r'^DEPT\.?\s+OF\s+', '', dept_clean)
+
+    if dept_clean in EXACT_DEPARTMENTS:
+        return EXACT_DEPARTMENTS[dept_clean]
+    for key, value in EXACT_DEPARTMENTS.items():
+        if key in dept_clean or dept_clean in key:
+            return value
+
+    if 'AIML' in dept_clean or 'AI' in dept_clean and 'ML' in dept_clean:
+        return 'AIML'
+    elif 'AEROSPACE' in dept_clean or 'AERO' in dept_clean:
+        return 'AERO'
+    elif 'CYBERSECURITY' in dept_clean or 'CYBER' in dept_clean:
+        return 'CSE-CY'
+    elif 'DATA' in dept_clean and 'SCIENCE' in dept_clean:
+        return 'CSE-DS'
+    elif 'ISE' in dept_clean or 'INFORMATION' in dept_clean:
+        return 'ISE'
+    elif 'ECE' in dept_clean or 'ELECTRONICS' in dept_clean:
+        return 'ECE'
+    elif 'CSE' in dept_clean or 'COMPUTER SCIENCE' in dept_clean:
+        return 'CSE(Core)'
+    return ''
+
+
+def legacy_map(matched_text):
+    dept_clean = re.sub(r'\s+', ' ', matched_text.strip().upper())
+    dept_clean = re.sub(r'DEPARTMENT\s+OF\s+', '', dept_clean).strip()
+    for key, value in DEPARTMENT_MAPPING.items():
+        if key in dept_clean or dept_clean in key:
+            return value
+    return ''
+
+
+# =====================================================================
+# Inputs
+# =====================================================================
+EXTRA = [
+    '', ' ', 'Mechanical Engineering', 'Civil', 'AI', 'ML', 'Data', 'Science',
+    'dept of ise', 'Dept. of Electronics', 'B.E. in CSE (Data Science)',
+    'cse  ( aiml )', 'Department   of\nComputer Science and Engineering',
+    'Artificial Intelligence & Machine Learning Club', 'NSS unit', 'COMPUTER',
+]
+
+
+def golden_inputs():
+    keys = list(dict.fromkeys(list(EXACT_DEPARTMENTS) + list(DEPARTMENT_MAPPING)))
+    inputs = list(EXTRA)
+    for key in keys:
+        inputs += [
+            key,
+            key.lower(),
+            key.title(),
+            f"Department of {key}",
+            f"DEPT. OF {key}",
+            f"  {key.replace(' ', '  ')}  ",
+            f"{key} Club",
+            key[:len(key) // 2],
+            key[len(key) // 2:],
+            key[1:-1],
+        ]
+    return inputs
+
+
+def run():
+    mismatches = []
+    for text in golden_inputs():
+        if normalize_department(text) != legacy_normalize(text):
+            mismatches.append(('normalize', text, legacy_normalize(text), normalize_department(text)))
+        if map_department(text) != legacy_map(text):
+            mismatches.append(('map', text, legacy_map(text), map_department(text)))
+    return mismatches
+
+
+def test_department_index_matches_linear_scan():
+    assert run() == []
+
+
+if __name__ == '__main__':
+    mismatches = run()
+    print(f"{len(golden_inputs())} inputs, {len(mismatches)} mismatches")
+    for m in mismatches[:20]:
+        print("   ", m)
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the department_stats rollup behind the IQC tracker.
+
+  - inserting, updating (department / validated / status), deleting and
+    rolling back events keeps the counters equal to a fresh recount, with
+    the native upsert and with the update-then-insert fallback
+  - the validate, save, reject and delete endpoints keep it in step, and
+    /api/tracker reports the rollup's validated counts
+  - rebuild() recounts from the event table with one GROUP BY
+
+Usage:
+    python -m pytest -q test/test_department_stats.py
+"""
+
+import sys
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def app_users():
+    return [('iqc', 'iqc', 'ALL'), ('student1', 'student', 'AIML')]
+
+
+def rollup():
+    from models import DepartmentStats
+    return {s.department: tuple(getattr(s, c) for c in DepartmentStats.COUNTERS)
+            for s in DepartmentStats.query if any(getattr(s, c) for c in DepartmentStats.COUNTERS)}
+
+
+def recount():
+    from models import Event
+    counts = {}
+    for e in Event.query:
+        totals = counts.setdefault(e.department, Counter())
+        totals['events'] += 1
+        totals['validated'] += bool(e.validated)
+        totals['pending'] += not e.validated and e.status == 'pending'
+        totals['rejected'] += e.status == 'rejected'
+    return {d: (c['events'], c['validated'], c['pending'], c['rejected']) for d, c in counts.items()}
+
+
+def add_event(department, uploaded_by='student1', **fields):
+    from models import db, Document, Event
+    doc = Document(filename='report.pdf', uploaded_by=uploaded_by, status='needs_review', department=department)
+    db.session.add(doc)
+    db.session.flush()
+    event = Event(document_id=doc.id, name='Workshop on Machine Learning', date=date(2024, 3, 15),
+                  department=department, category='Workshop', **fields)
+    db.session.add(event)
+    db.session.commit()
+    return event
+
+
+@pytest.mark.parametrize('upsert', ['native', 'update_then_insert'])
+def test_counters_follow_event_changes(app, monkeypatch, upsert):
+    from models import db
+
+    if upsert == 'update_then_insert':
+        # What dialects without an upsert construct get
+        monkeypatch.setattr(db.engine.dialect, 'name', 'generic')
+
+    a = add_event('AIML')
+    b = add_event('AIML', validated=True, status='validated')
+    c = add_event('CSE-DS')
+    assert rollup() == recount() == {'AIML': (2, 1, 1, 0), 'CSE-DS': (1, 0, 1, 0)}
+
+    # Expired after commit: the old values must still be counted out
+    a.department, a.validated = 'CSE-DS', True
+    c.status = 'rejected'
+    db.session.commit()
+    assert rollup() == recount() == {'AIML': (1, 1, 0, 0), 'CSE-DS': (2, 1, 0, 1)}
+
+    db.session.delete(b)
+    db.session.commit()
+    assert rollup() == recount() == {'CSE-DS': (2, 1, 0, 1)}
+
+    a.department = 'ECE'
+    db.session.flush()
+    db.session.rollback()
+    assert rollup() == recount() == {'CSE-DS': (2, 1, 0, 1)}
+
+
+def test_endpoints_keep_rollup_in_step(login):
+    from models import db, Event
+
+    ids = [add_event(dept).id for dept in ('AIML', 'AIML', 'AIML', 'CSE-DS')]
+    iqc = login('iqc')
+
+    res = iqc.post(f'/api/validate/{ids[0]}', json={
+        'name': 'Workshop on Machine Learning', 'date': '2024-03-15',
+        'category': 'Workshop', 'department': 'AIML'})
+    assert res.status_code == 200
+    # Validated into another department: both rows move
+    res = iqc.post(f'/api/validate/{ids[3]}', json={
+        'name': 'Hackathon on Cyber Security', 'date': '2024-04-02',
+        'category': 'Competition', 'department': 'CSE-CY'})
+    assert res.status_code == 200
+    assert iqc.post(f'/api/validate/{ids[1]}/reject', json={'comment': 'Blurred scan'}).status_code == 200
+    assert iqc.post(f'/api/validate/{ids[0]}/save', json={'comment': 'Needs venue'}).status_code == 200
+
+    db.session.expire_all()
+    assert rollup() == recount() == {'AIML': (3, 0, 2, 1), 'CSE-CY': (1, 1, 0, 0)}
+
+    tracker = iqc.get('/api/tracker').json
+    assert tracker['CSE-CY'] == {'validated': 1, 'total': 10, 'progress': 10.0}
+    assert tracker['AIML']['validated'] == 0 and tracker['ISE']['validated'] == 0
+
+    assert login('student1').delete(f'/api/events/{ids[1]}').status_code == 200
+    db.session.expire_all()
+    assert Event.query.count() == 3
+    assert rollup() == recount() == {'AIML': (2, 0, 2, 0), 'CSE-CY': (1, 1, 0, 0)}
+
+
+def test_rebuild_recounts_from_events(app):
+    from models import db, DepartmentStats
+
+    add_event('AIML', validated=True, status='validated')
+    add_event('ISE', status='rejected')
+    db.session.execute(db.text("UPDATE department_stats SET events = 99"))   # drifted
+    db.session.commit()
+
+    DepartmentStats.rebuild()
+    assert rollup() == recount() == {'AIML': (1, 1, 0, 0), 'ISE': (1, 0, 0, 1)}
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
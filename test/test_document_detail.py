@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the document detail and document text endpoints.
+
+  - GET /api/document/<id> loads the document, its entities and events in
+    one query, pivots entity values by type and leaves out raw_text
+  - GET /api/document/<id>/text serves the text with gzip, byte ranges
+    (206 / Content-Range, always on the uncompressed bytes) and ETag
+    revalidation (304)
+
+Usage:
+    python -m pytest -q test/test_document_detail.py
+"""
+
+import gzip
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+RAW_TEXT = "National Workshop on Machine Learning — Seminar Hall 2, 15 March 2024.\n" * 200
+
+
+@pytest.fixture(autouse=True)
+def document(app):
+    from models import db, Document, Event, ExtractedEntity
+    doc = Document(filename='report.pdf', uploaded_by='student1', status='needs_review',
+                   department='AIML', raw_text=RAW_TEXT)
+    db.session.add(doc)
+    db.session.flush()
+    db.session.add(Event(document_id=doc.id, name='National Workshop on Machine Learning',
+                         date=date(2024, 3, 15), department='AIML', category='Workshop', type='Report'))
+    for entity_type, value in [('event_name', 'National Workshop on Machine Learning'),
+                               ('Venue', 'Seminar Hall 2'), ('venue', 'Main Auditorium'),
+                               ('organizer', 'Department of AIML'), ('date', '2024-03-15')]:
+        db.session.add(ExtractedEntity(document_id=doc.id, entity_type=entity_type,
+                                       entity_value=value, confidence=0.9))
+    db.session.add(Document(filename='empty.pdf', uploaded_by='student1', status='failed'))
+    db.session.commit()
+
+
+@pytest.fixture
+def client(login):
+    return login('iqc')
+
+
+def test_detail_loads_in_one_query_without_raw_text(client, record_queries):
+    with record_queries() as statements:
+        res = client.get('/api/document/1')
+
+    assert res.status_code == 200
+    document_queries = [s for s in statements if 'FROM document' in s]
+    assert len(document_queries) == 1 and len(statements) == 2    # + the token's user lookup
+    assert not any('raw_text' in s for s in statements)
+
+    data = res.json
+    assert 'raw_text' not in data['document']
+    assert len(data['entities']) == 5 and data['events'][0]['type'] == 'Report'
+    assert data['entity_values']['venue'] == 'Seminar Hall 2'         # first of a type wins
+    assert (data['venue'], data['organizer'], data['abstract']) == ('Seminar Hall 2', 'Department of AIML', '')
+    assert client.get('/api/document/99').status_code == 404
+
+
+def test_text_endpoint_gzip_ranges_and_etag(client):
+    body = RAW_TEXT.encode('utf-8')
+
+    plain = client.get('/api/document/1/text')
+    assert plain.status_code == 200 and plain.data == body
+    assert plain.mimetype == 'text/plain' and 'Content-Encoding' not in plain.headers
+    assert plain.headers['Accept-Ranges'] == 'bytes'
+
+    packed = client.get('/api/document/1/text', headers={'Accept-Encoding': 'gzip'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.data) == body and len(packed.data) < len(body) // 10
+    assert packed.headers['ETag'] != plain.headers['ETag']
+
+    # Ranges count uncompressed UTF-8 bytes, even when gzip is acceptable
+    part = client.get('/api/document/1/text', headers={'Range': 'bytes=40-99', 'Accept-Encoding': 'gzip'})
+    assert part.status_code == 206 and part.data == body[40:100]
+    assert part.headers['Content-Range'] == f'bytes 40-99/{len(body)}'
+    assert 'Content-Encoding' not in part.headers
+
+    assert client.get('/api/document/1/text', headers={'If-None-Match': plain.headers['ETag']}).status_code == 304
+    assert client.get('/api/document/1/text', headers={'Range': f'bytes={len(body)}-'}).status_code == 416
+
+    empty = client.get('/api/document/2/text', headers={'Accept-Encoding': 'gzip'})
+    assert empty.status_code == 200 and empty.data == b''
+    assert client.get('/api/document/99/text').status_code == 404
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
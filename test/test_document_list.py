@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the paginated document list (GET /api/documents).
+
+  - raw_text is deferred: neither the list nor a plain Document query
+    selects it
+  - walking the pages with ?after= returns every visible document exactly
+    once, newest first (ties broken by id, no upload time last), at most
+    ?limit= per page
+  - status, department and upload-date filters, role scoping, bad args
+
+Usage:
+    python -m pytest -q test/test_document_list.py
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+STATUSES = ['queued', 'needs_review', 'needs_review', 'failed']
+
+
+@pytest.fixture
+def app_users():
+    return [('iqc', 'iqc', 'ALL'), ('teacher1', 'teacher', 'AIML'), ('student1', 'student', 'AIML')]
+
+
+@pytest.fixture(autouse=True)
+def documents(app):
+    """60 documents over 30 days, two per upload time, and 3 without one."""
+    from models import db, Document
+    start = datetime(2024, 3, 1, 9, 0)
+    for i in range(60):
+        db.session.add(Document(
+            filename=f'report_{i}.pdf', uploaded_by=f'student{i % 3}', status=STATUSES[i % 4],
+            department=['AIML', 'CSE-DS', 'ISE'][i % 3], uploaded_at=start + timedelta(hours=12 * (i // 2)),
+            raw_text='OCR text ' * 1000
+        ))
+    # Uploaded before uploaded_at was recorded
+    for i in range(3):
+        db.session.add(Document(filename=f'old_{i}.pdf', uploaded_by='student1', status='saved',
+                                department='AIML', raw_text='OCR text'))
+    db.session.flush()
+    Document.query.filter(Document.filename.like('old_%')).update({'uploaded_at': None})
+    db.session.commit()
+
+
+def walk(client, limit, **filters):
+    ids, after = [], None
+    while True:
+        res = client.get('/api/documents', query_string={'limit': limit, **filters, **({'after': after} if after else {})})
+        assert res.status_code == 200 and len(res.json['documents']) <= limit
+        ids += [d['id'] for d in res.json['documents']]
+        after = res.json['next_after']
+        if after is None:
+            return ids
+
+
+def newest_first(predicate=lambda d: True):
+    from models import Document
+    docs = [d for d in Document.query if predicate(d)]
+    return [d.id for d in sorted(docs, key=lambda d: (d.uploaded_at or datetime.min, d.id), reverse=True)]
+
+
+def test_raw_text_is_never_loaded_by_the_list(login, record_queries):
+    from models import Document
+    from sqlalchemy import inspect
+
+    iqc = login('iqc')
+    with record_queries() as statements:
+        res = iqc.get('/api/documents?limit=10')
+        doc = Document.query.first()
+
+    assert len(res.json['documents']) == 10
+    assert statements and not any('raw_text' in s for s in statements)
+    assert 'raw_text' not in inspect(doc).dict
+    assert doc.raw_text.startswith('OCR text')      # still loads on access
+
+
+def test_pages_cover_visible_documents_newest_first(login):
+    assert walk(login('iqc'), limit=7) == newest_first()
+    assert walk(login('teacher1'), limit=5) == newest_first(lambda d: d.department == 'AIML')
+    assert walk(login('student1'), limit=50) == newest_first(lambda d: d.uploaded_by == 'student1')
+
+
+def test_filters(login):
+    iqc = login('iqc')
+
+    assert walk(iqc, 8, status='failed,queued') == newest_first(lambda d: d.status in ('failed', 'queued'))
+    assert walk(iqc, 8, department='ISE') == newest_first(lambda d: d.department == 'ISE')
+    in_range = walk(iqc, 8, **{'from': '2024-03-05', 'to': '2024-03-09'})
+    assert in_range == newest_first(lambda d: d.uploaded_at and datetime(2024, 3, 5) <= d.uploaded_at < datetime(2024, 3, 10))
+    assert len(in_range) == 20
+
+    # A teacher's department filter cannot widen their scope
+    assert login('teacher1').get('/api/documents?department=ISE').json['documents'] == []
+
+    assert iqc.get('/api/documents?from=March').status_code == 400
+    assert iqc.get('/api/documents?after=x').status_code == 400
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
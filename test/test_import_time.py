@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests that the backend's light entry points (the app factory, models,
+config and the validator) import no heavy ML module (torch, transformers,
+docTR, OpenCV, ...). Models must only load when a document is processed.
+
+Each entry point is imported in a fresh interpreter by
+bench_import_time.py, which also reports the import times.
+
+Usage:
+    python -m pytest -q test/test_import_time.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_import_time import ENTRY_POINTS, heavy_imports, measure
+
+
+@pytest.mark.parametrize('statement', ENTRY_POINTS.values(), ids=ENTRY_POINTS.keys())
+def test_light_entry_point_does_not_import_models(statement):
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_sqlalchemy')
+    _, modules = measure(statement)
+    assert heavy_imports(modules) == []
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for recovering jobs orphaned by a dead worker (job_queue.py).
+
+  - an idle worker requeues a stale running job while the pool is up, not
+    only when a pool starts
+  - a stale job that used up JOB_MAX_ATTEMPTS fails its document and ends
+    its progress stream with a "failed" event
+  - a stale job that a reprocess has superseded leaves the document alone
+
+Usage:
+    python -m pytest -q test/test_job_queue.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def app_config():
+    return {'JOB_STALE_SECONDS': 0, 'JOB_MAX_ATTEMPTS': 2}
+
+
+def add_document(status='processing'):
+    from models import db, Document
+    doc = Document(filename='report.pdf', uploaded_by='student1', status=status, department='AIML')
+    db.session.add(doc)
+    db.session.commit()
+    return doc.id
+
+
+def test_idle_worker_requeues_orphaned_job(app, monkeypatch):
+    import job_queue
+    from job_queue import JobWorkerPool
+    from models import db, Document
+
+    processed = threading.Event()
+
+    def process(doc_id, file_path=None, progress=None):
+        db.session.get(Document, doc_id).status = 'needs_review'
+        db.session.commit()
+        processed.set()
+
+    queue = app.extensions['job_queue']
+    pool = JobWorkerPool(app, queue, process, num_workers=1, poll_interval=0.05)
+    monkeypatch.setattr(job_queue, 'STALE_CHECK_SECONDS', 0)
+    pool.start()
+    try:
+        # Left running by a worker in a process that died after this pool started
+        doc_id = add_document()
+        conn = queue._connect()
+        try:
+            conn.execute(
+                "INSERT INTO processing_job (document_id, status, attempts, worker, created_at, claimed_at) "
+                "VALUES (?, 'running', 1, 'dead-worker', ?, ?)", (doc_id, queue._now(), queue._now()))
+        finally:
+            conn.close()
+        assert processed.wait(10)
+    finally:
+        pool.stop()
+
+    assert queue.latest_job(doc_id)['attempts'] == 2
+    db.session.expire_all()
+    assert db.session.get(Document, doc_id).status == 'needs_review'
+
+
+def test_exhausted_stale_job_fails_its_document(app):
+    from job_queue import JobWorkerPool, STALE_JOB_ERROR
+    from models import db, Document
+
+    queue = app.extensions['job_queue']
+    pool = JobWorkerPool(app, queue, process_fn=None, num_workers=0)
+
+    doc_id, superseded_id = add_document(), add_document()
+    queue.enqueue(doc_id)
+    queue.enqueue(superseded_id)
+    # Both jobs die mid-run twice
+    queue.claim('dead-worker')
+    queue.claim('dead-worker')
+    assert queue.requeue_stale() == (2, [])
+    queue.claim('dead-worker')
+    queue.claim('dead-worker')
+    queue.enqueue(superseded_id)               # reprocessed before the check
+
+    pool.requeue_stale()
+
+    assert queue.latest_job(doc_id)['status'] == 'failed'
+    assert queue.latest_events([doc_id])[doc_id]['stage'] == 'failed'
+    db.session.expire_all()
+    doc = db.session.get(Document, doc_id)
+    assert (doc.status, doc.last_error) == ('failed', STALE_JOB_ERROR)
+
+    assert queue.latest_events([superseded_id])[superseded_id]['stage'] == 'queued'
+    assert db.session.get(Document, superseded_id).status == 'processing'
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests that the ONNX Runtime NER backend finds the same entities as the
+FP32 PyTorch model.
+
+  - the int8 ONNX graph reaches F1 >= 0.95 against the PyTorch spans
+    (same type and character offsets) on the first Label Studio texts
+
+Needs torch, transformers, onnxruntime and an export made by
+backend/export_ner_onnx.py; skipped otherwise. compare_ner_backends.py
+reports the latencies as well.
+
+Usage:
+    python backend/export_ner_onnx.py --quantize
+    python -m pytest -q test/test_ner_backends.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from compare_ner_backends import compare
+
+
+def test_onnx_backend_agrees_with_torch(monkeypatch):
+    pytest.importorskip('torch')
+    pytest.importorskip('transformers')
+    pytest.importorskip('onnxruntime')
+    if not (BACKEND_DIR / 'ml_models' / 'ner_model' / 'onnx').exists():
+        pytest.skip("no ONNX export of the NER model")
+    from config import Config
+
+    # compare() switches the graph on Config; put it back afterwards
+    monkeypatch.setattr(Config, 'NER_ONNX_QUANTIZED', Config.NER_ONNX_QUANTIZED)
+    assert compare(limit=10, quantized=True) >= 0.95
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests that NerAgent's matcher-backed regex fallbacks (event name,
+department, date, venue) return what the per-pattern extractors they
+replaced returned, on the region they scan (NER_SCAN_CHARS).
+
+  - on the Label Studio export texts
+  - on a long synthetic report built by concatenating them
+  - on hand-written edge cases (curly quotes, Unicode case folding that
+    changes lengths, keywords inside other words)
+
+The frozen extractors live in bench_ner_fallbacks.py.
+
+Usage:
+    python -m pytest -q test/test_ner_fallbacks.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_ner_fallbacks import EDGE_CASES, check_identical, load_texts, make_agent
+
+
+@pytest.fixture(scope='module')
+def agent():
+    pytest.importorskip('dotenv')
+    return make_agent()
+
+
+def test_fallbacks_match_legacy_on_corpus(agent):
+    docs, _ = load_texts(report_kb=0)
+    assert check_identical(agent, docs) == []
+
+
+def test_fallbacks_match_legacy_on_long_report(agent):
+    _, reports = load_texts(report_kb=50)
+    assert check_identical(agent, reports) == []
+
+
+def test_fallbacks_match_legacy_on_edge_cases(agent):
+    assert check_identical(agent, EDGE_CASES) == []
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the NerAgent.predict() result cache.
+
+  - the same text is served from the cache (as a copy), other text is not
+  - the on-disk level answers for a fresh process-level cache
+  - the cache fingerprint changes when the model files or the label set
+    change, so a retrained model never sees old entries
+
+Runs the agent in fallback-only mode (no BERT model needed).
+
+Usage:
+    python -m pytest -q test/test_ner_result_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+CERTIFICATE = """CERTIFICATE OF PARTICIPATION
+This is to certify that Priya Sharma has participated in the
+National Workshop on Machine Learning organized by the Department of
+Computer Science and Engineering held on 15th March 2024 at Seminar Hall 2.
+"""
+
+
+@pytest.fixture
+def agent():
+    pytest.importorskip('dotenv')
+    from agents.ner_agent import NerAgent
+    from caching import LRUCache, TieredCache
+
+    agent = NerAgent(use_model=False)
+    agent.result_cache = TieredCache(LRUCache(100))
+    return agent
+
+
+def test_repeated_text_is_served_from_cache(agent):
+    first = agent.predict(CERTIFICATE)
+    first['event_name'] = 'changed by the caller'
+
+    again = agent.predict(CERTIFICATE)
+    assert again == agent._predict_uncached(CERTIFICATE)
+    assert again['event_name'] != 'changed by the caller'
+
+    agent.predict(CERTIFICATE + "\nCoordinator: Dr. Rao")
+    stats = agent.result_cache_stats()['memory']
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 2)
+
+
+def test_disk_level_survives_a_new_process_cache(agent, tmp_path):
+    from caching import LRUCache, SqliteLRUCache, TieredCache
+
+    agent.result_cache = TieredCache(LRUCache(100), SqliteLRUCache(tmp_path / 'ner.db'))
+    expected = agent.predict(CERTIFICATE)
+
+    # A "restarted" process: empty memory level, same SQLite file
+    agent.result_cache = TieredCache(LRUCache(100), SqliteLRUCache(tmp_path / 'ner.db'))
+    assert agent.predict(CERTIFICATE) == expected
+    stats = agent.result_cache_stats()
+    assert stats['disk']['hits'] == 1 and stats['memory']['size'] == 1
+
+
+def test_fingerprint_tracks_model_files_and_labels(agent, tmp_path):
+    model_dir = tmp_path / 'ner_model'
+    model_dir.mkdir()
+    (model_dir / 'config.json').write_text('{"id2label": {}}')
+    (model_dir / 'model.safetensors').write_bytes(b'weights v1')
+
+    # Pretend a model from model_dir is loaded
+    agent.use_model, agent.ner_pipeline = True, object()
+    agent.model_path = str(model_dir)
+    agent.id2label = {0: 'O', 1: 'B-DATE', 2: 'I-DATE'}
+
+    fingerprint = agent._cache_fingerprint()
+    assert agent._cache_fingerprint() == fingerprint
+
+    (model_dir / 'model.safetensors').write_bytes(b'weights v2')   # retrained
+    retrained = agent._cache_fingerprint()
+    assert retrained != fingerprint
+
+    agent.id2label = {0: 'O', 1: 'B-DATE', 2: 'I-DATE', 3: 'B-VENUE'}
+    assert agent._cache_fingerprint() not in (fingerprint, retrained)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
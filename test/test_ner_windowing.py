@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for windowed NER decoding (NerAgent._decode_window,
+_dedupe_overlapping_spans and the routing in predict_entities).
+
+  - a window's tags are grouped by the pipeline's 'simple' rules: an O or
+    B- token always ends the current span, even inside a word
+  - a span cut at a window edge and the full span from the next window
+    collapse into one; other overlaps and repeats are handled per type
+  - text that fits one window goes through the pipeline unchanged
+
+The model is never loaded: probabilities, offsets and word ids are built
+by hand.
+
+Usage:
+    python -m pytest -q test/test_ner_windowing.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+np = pytest.importorskip('numpy')
+
+ID2LABEL = {0: 'O', 1: 'B-EVENT', 2: 'I-EVENT', 3: 'B-DATE', 4: 'I-DATE'}
+LABEL2ID = {v: k for k, v in ID2LABEL.items()}
+
+TEXT = "Hackathon on AI held 15 March 2024 at Seminar Hall"
+
+
+@pytest.fixture
+def agent():
+    pytest.importorskip('dotenv')
+    from agents.ner_agent import NerAgent
+
+    agent = NerAgent(use_model=False)
+    agent.id2label = ID2LABEL
+    return agent
+
+
+def window(tokens):
+    """(probs, offsets, word_ids) for [(label, start, end, word_id, p)];
+    label None is a special token. Each token's label gets probability p."""
+    probs = np.full((len(tokens), len(ID2LABEL)), 0.0)
+    offsets, word_ids = [], []
+    for i, (label, start, end, word, p) in enumerate(tokens):
+        probs[i, :] = (1 - p) / (len(ID2LABEL) - 1)
+        probs[i, LABEL2ID[label or 'O']] = p
+        offsets.append((start, end))
+        word_ids.append(None if label is None else word)
+    return probs, np.array(offsets), word_ids
+
+
+def spans(predictions):
+    return [(p.entity_type, p.text, p.start, p.end) for p in predictions]
+
+
+def test_decode_groups_tokens_into_spans(agent):
+    probs, offsets, word_ids = window([
+        (None, 0, 0, None, 1.0),                    # [CLS]
+        ('B-EVENT', 0, 4, 0, 0.9),                  # Hack
+        ('I-EVENT', 4, 9, 0, 0.7),                  # ##athon
+        ('I-EVENT', 10, 12, 1, 0.8),                # on
+        ('I-EVENT', 13, 15, 2, 0.6),                # AI
+        ('O', 16, 20, 3, 0.9),                      # held
+        ('B-DATE', 21, 23, 4, 0.9),                 # 15
+        ('I-DATE', 24, 29, 5, 0.9),                 # March
+        ('I-DATE', 30, 34, 6, 0.9),                 # 2024
+        ('I-EVENT', 38, 45, 8, 0.9),                # Seminar: I- after O opens a span
+        (None, 0, 0, None, 1.0),                    # [SEP]
+        (None, 0, 0, None, 1.0),                    # [PAD]
+    ])
+    out = agent._decode_window(TEXT, probs, offsets, word_ids)
+
+    assert spans(out) == [('EVENT', 'Hackathon on AI', 0, 15), ('DATE', '15 March 2024', 21, 34),
+                          ('EVENT', 'Seminar', 38, 45)]
+    assert out[0].score == pytest.approx((0.9 + 0.7 + 0.8 + 0.6) / 4)
+
+
+def test_decode_splits_inside_a_word_like_simple_aggregation(agent):
+    probs, offsets, word_ids = window([
+        ('B-EVENT', 0, 4, 0, 0.9),                  # Hack
+        ('O', 4, 9, 0, 0.9),                        # ##athon: O ends the span
+        ('B-DATE', 21, 22, 4, 0.9),                 # 1
+        ('B-DATE', 22, 23, 4, 0.9),                 # ##5: B- starts another
+        ('I-EVENT', 24, 29, 5, 0.9),                # type change ends it too
+    ])
+    out = agent._decode_window(TEXT, probs, offsets, word_ids)
+
+    assert spans(out) == [('EVENT', 'Hack', 0, 4), ('DATE', '1', 21, 22), ('DATE', '5', 22, 23),
+                          ('EVENT', 'March', 24, 29)]
+
+
+def test_span_cut_at_window_edge_is_merged_with_next_window(agent):
+    # Window 1 ends inside "Seminar Hall"; window 2 starts in the stride
+    # region before it and sees the whole name
+    first = agent._decode_window(TEXT, *window([
+        ('B-DATE', 21, 23, 4, 0.9),
+        ('I-DATE', 24, 29, 5, 0.9),
+        ('O', 35, 37, 7, 0.9),
+        ('B-EVENT', 38, 45, 8, 0.6),                # Seminar | window edge
+        (None, 0, 0, None, 1.0),
+    ]))
+    second = agent._decode_window(TEXT, *window([
+        (None, 0, 0, None, 1.0),
+        ('B-DATE', 21, 23, 4, 0.8),                 # stride region, seen again
+        ('I-DATE', 24, 29, 5, 0.8),
+        ('O', 35, 37, 7, 0.9),
+        ('B-EVENT', 38, 45, 8, 0.9),
+        ('I-EVENT', 46, 50, 9, 0.9),                # Hall
+    ]))
+    assert spans(first)[-1] == ('EVENT', 'Seminar', 38, 45)
+
+    merged = agent._dedupe_overlapping_spans(TEXT, first + second)
+    assert spans(merged) == [('DATE', '15 March', 21, 29), ('EVENT', 'Seminar Hall', 38, 50)]
+    assert [p.score for p in merged] == [pytest.approx(0.9), pytest.approx(0.9)]
+
+
+def test_dedupe_keeps_other_types_and_separate_spans(agent):
+    from agents.ner_agent import NerPrediction
+
+    def p(etype, start, end, score=0.5):
+        return NerPrediction(entity_type=etype, text=TEXT[start:end], start=start, end=end, score=score)
+
+    merged = agent._dedupe_overlapping_spans(TEXT, [
+        p('EVENT', 0, 15), p('DATE', 13, 20),       # overlapping, different types
+        p('EVENT', 0, 15, 0.7),                     # repeated in the next window
+        p('EVENT', 38, 45), p('EVENT', 46, 50),     # adjacent, not overlapping
+    ])
+    assert spans(merged) == [('EVENT', 'Hackathon on AI', 0, 15), ('DATE', 'AI held', 13, 20),
+                             ('EVENT', 'Seminar', 38, 45), ('EVENT', 'Hall', 46, 50)]
+    assert merged[0].score == 0.7
+
+
+def test_only_text_longer_than_a_window_is_windowed(agent):
+    calls = []
+    agent.windowed = True
+    agent.window_tokens = 8
+    agent.ner_tokenizer = lambda text, truncation: {'input_ids': text.split()}
+    agent.ner_pipeline = lambda text: calls.append('pipeline') or []
+    agent._predict_windowed = lambda text: calls.append('windowed') or []
+
+    agent.predict_entities("one two three four five six seven eight")
+    agent.predict_entities("one two three four five six seven eight nine")
+    assert calls == ['pipeline', 'windowed']
+
+    agent.onnx_session = object()                   # ONNX only has the windowed path
+    agent.predict_entities("short text")
+    assert calls[-1] == 'windowed'
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
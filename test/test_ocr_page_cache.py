@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the persistent OCR page cache.
+
+  - SqliteLRUCache: values survive a new instance on the same file, the
+    least recently used entries are evicted beyond max_bytes, counters.
+  - OcrAgent: reprocessing a scanned PDF or image reads every page from the
+    cache instead of running the OCR engine again; a different DPI or OCR
+    engine version misses. The docTR predictor is replaced by a counting
+    fake, so no models are needed (PyMuPDF, OpenCV and numpy are).
+
+Usage:
+    python -m pytest -q test/test_ocr_page_cache.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from caching import LRUCache, SqliteLRUCache  # noqa: E402
+
+
+# =====================================================================
+# SqliteLRUCache
+# =====================================================================
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = tmp_path / 'cache.db'
+    SqliteLRUCache(path).put('page', {'text': 'Annual Tech Fest', 'confidences': [0.9, 0.8]}, cost=2.5)
+
+    cache = SqliteLRUCache(path)
+    assert cache.get('page') == {'text': 'Annual Tech Fest', 'confidences': [0.9, 0.8]}
+    assert cache.get('other') is None
+    assert 'page' in cache and len(cache) == 1
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['saved_seconds']) == (1, 1, 2.5)
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SqliteLRUCache(tmp_path / 'cache.db', max_bytes=80)
+    cache.put('a', 'x' * 30)
+    cache.put('b', 'y' * 30)
+    cache.get('a')                 # 'b' is now the least recently used
+    cache.put('c', 'z' * 30)       # 3 x 32 bytes of JSON > 80
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats()['bytes'] <= 80
+
+
+# =====================================================================
+# OcrAgent
+# =====================================================================
+class FakePredictor:
+    """Stands in for the docTR predictor: one line of text per image."""
+
+    def __init__(self):
+        self.pages_read = 0
+
+    def __call__(self, images):
+        pages = []
+        for _ in images:
+            self.pages_read += 1
+            words = [SimpleNamespace(value=w, confidence=0.9)
+                     for w in f"Workshop page {self.pages_read}".split()]
+            line = SimpleNamespace(words=words)
+            pages.append(SimpleNamespace(blocks=[SimpleNamespace(lines=[line])]))
+        return SimpleNamespace(pages=pages)
+
+
+@pytest.fixture
+def ocr_agent_module():
+    pytest.importorskip('fitz')
+    pytest.importorskip('cv2')
+    pytest.importorskip('dotenv')
+    from agents import ocr_agent
+    return ocr_agent
+
+
+def make_agent(ocr_agent_module, cache_path, engine_id='fake-engine'):
+    """An OcrAgent wired to a fake predictor, without loading any model."""
+    agent = ocr_agent_module.OcrAgent.__new__(ocr_agent_module.OcrAgent)
+    agent.doctr_model = FakePredictor()
+    agent.easyocr_reader = None
+    agent.gpu_available = False
+    agent.last_preprocess_timings = {}
+    agent.symspell = None
+    agent.spelling_cache = LRUCache(100)
+    agent.ocr_engine_id = engine_id
+    agent.page_cache = SqliteLRUCache(cache_path)
+    return agent
+
+
+def make_scanned_pdf(path, pages=3):
+    import fitz
+    pdf = fitz.open()
+    for _ in range(pages):
+        pdf.new_page(width=200, height=200)   # no text layer → OCR
+    pdf.save(str(path))
+    pdf.close()
+
+
+def test_reprocessing_pdf_reads_pages_from_cache(ocr_agent_module, tmp_path, monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'OCR_DPI', 72)
+    pdf_path, cache_path = tmp_path / 'scan.pdf', tmp_path / 'ocr_cache.db'
+    make_scanned_pdf(pdf_path)
+
+    first = make_agent(ocr_agent_module, cache_path)
+    result = first._extract_from_pdf(str(pdf_path))
+    assert first.doctr_model.pages_read == 3
+    assert len(first.page_cache) == 3
+
+    again = make_agent(ocr_agent_module, cache_path)
+    cached = again._extract_from_pdf(str(pdf_path))
+    assert again.doctr_model.pages_read == 0
+    assert cached['page_texts'] == result['page_texts']
+    assert cached['text'] == result['text']
+
+    # Another DPI or engine version is another cache entry
+    monkeypatch.setattr(Config, 'OCR_DPI', 96)
+    other_dpi = make_agent(ocr_agent_module, cache_path)
+    other_dpi._extract_from_pdf(str(pdf_path))
+    assert other_dpi.doctr_model.pages_read == 3
+
+    other_engine = make_agent(ocr_agent_module, cache_path, engine_id='fake-engine-v2')
+    other_engine._extract_from_pdf(str(pdf_path))
+    assert other_engine.doctr_model.pages_read == 3
+
+
+def test_reprocessing_image_reads_from_cache(ocr_agent_module, tmp_path):
+    import cv2
+    import numpy as np
+    image_path, cache_path = tmp_path / 'poster.png', tmp_path / 'ocr_cache.db'
+    cv2.imwrite(str(image_path), np.full((50, 50, 3), 255, dtype=np.uint8))
+
+    first = make_agent(ocr_agent_module, cache_path)
+    result = first._extract_from_image(str(image_path))
+
+    again = make_agent(ocr_agent_module, cache_path)
+    assert again._extract_from_image(str(image_path)) == result
+    assert (first.doctr_model.pages_read, again.doctr_model.pages_read) == (1, 0)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests that the hot-path indexes (migrations 8ff2c2d9bdcb and 35e877bcd523)
+are used by the tracker, validation and document list queries.
+
+  - with the indexes dropped, every hot query scans a whole table (so the
+    check below can fail)
+  - after upgrading to head, none of them does
+
+The database is built and seeded by bench_query_plans.py, which also times
+the queries.
+
+Usage:
+    python -m pytest -q test/test_query_plans.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_query_plans import full_scans, run
+
+
+@pytest.fixture(scope='module')
+def plans():
+    pytest.importorskip('flask_migrate')
+    pytest.importorskip('flask_cors')
+    pytest.importorskip('jwt')
+    pytest.importorskip('dotenv')
+
+    before, after = run(documents=2000, repeat=1, verbose=False)
+    return ({name: full_scans(plan) for name, (plan, _) in before.items()},
+            {name: full_scans(plan) for name, (plan, _) in after.items()})
+
+
+def test_hot_queries_scan_tables_without_indexes(plans):
+    before, _ = plans
+    assert all(before.values()), before
+
+
+def test_hot_queries_use_indexes_at_head(plans):
+    _, after = plans
+    assert after == {name: [] for name in after}
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the prebuilt SymSpell index (symspell_cache.py).
+
+  - the first load_symspell() builds the index and writes one cache file
+  - the next one loads that cache and gives the same corrections as an
+    index built from the text dictionary
+
+Runs against a copy of the frequency dictionary in a temporary directory;
+bench_symspell_startup.py times the same paths.
+
+Usage:
+    python -m pytest -q test/test_symspell_cache.py
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+pytest.importorskip('symspellpy')
+
+from bench_symspell_startup import DICTIONARY, SAMPLE_WORDS
+
+
+def corrections(symspell):
+    return [(s[0].term if s else None) for s in (symspell.lookup(w, 0, max_edit_distance=2) for w in SAMPLE_WORDS)]
+
+
+def test_cached_symspell_index_matches_build(tmp_path, monkeypatch):
+    import symspell_cache
+
+    dictionary = tmp_path / DICTIONARY.name
+    shutil.copy(DICTIONARY, dictionary)
+    expected = corrections(symspell_cache.build_symspell(dictionary))
+
+    assert corrections(symspell_cache.load_symspell(str(dictionary))) == expected
+    assert list(tmp_path.glob('*.pkl')) == [symspell_cache.cache_path_for(dictionary)]
+
+    def rebuild(*args):
+        raise AssertionError("rebuilt although the cache is up to date")
+
+    monkeypatch.setattr(symspell_cache, 'build_symspell', rebuild)
+    assert corrections(symspell_cache.load_symspell(str(dictionary))) == expected
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests that the text normalisation engine (text_normalizer.py) returns
+exactly what the re.sub chains it replaced returned.
+
+  - every pipeline matches its frozen copy in bench_text_normalizer.py on
+    the Label Studio export texts
+  - and on fuzzed strings built from the characters the rules look at
+
+Usage:
+    python -m pytest -q test/test_text_normalizer.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bench_text_normalizer import check_identical, fuzz_texts, load_corpus
+
+
+def test_normalizer_matches_legacy_pipeline_on_corpus():
+    assert check_identical(load_corpus()) == []
+
+
+def test_normalizer_matches_legacy_pipeline_on_fuzzed_text():
+    assert check_identical(fuzz_texts(5000)) == []
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
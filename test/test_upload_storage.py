@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for content-addressed uploads (upload_storage.py, POST /api/upload).
+
+  - the upload is stored once as <sha256>.<ext>, whatever it was called,
+    and Document.stored_filename names that file even for non-ASCII names
+  - a second upload of already processed bytes reuses the text, event and
+    entities (new pending event, no job queued); unprocessed bytes are queued
+  - a file over MAX_UPLOAD_MB is refused with 413 and leaves no part file
+
+Nothing is OCR'd; "processing" is written straight to the database.
+
+Usage:
+    python -m pytest -q test/test_upload_storage.py
+"""
+
+import hashlib
+import io
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+PDF_BYTES = b"%PDF-1.4\n% Workshop on Machine Learning, 15 March 2024\n%%EOF\n"
+
+
+@pytest.fixture
+def app_config():
+    return {'MAX_UPLOAD_MB': 1, 'MAX_CONTENT_LENGTH': 2 * 1024 * 1024}
+
+
+@pytest.fixture
+def app_users():
+    return [('student1', 'student', 'CSE'), ('student2', 'student', 'ECE')]
+
+
+@pytest.fixture
+def client(login, tmp_path):
+    client = login('student1')
+    client.tmp_path = tmp_path
+    return client
+
+
+def upload(client, data, name='certificate.pdf'):
+    return client.post('/api/upload', data={'file': (io.BytesIO(data), name)},
+                       content_type='multipart/form-data')
+
+
+def queued_jobs(client):
+    conn = sqlite3.connect(client.tmp_path / 'job_queue.db')
+    try:
+        return conn.execute("SELECT COUNT(*) FROM processing_job").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def mark_processed(doc_id, department_confidence=0.0):
+    """Write what the orchestrator would have saved for `doc_id`; by default
+    its department is the uploader's fallback (confidence 0), not NER's."""
+    from models import db, Document, Event, ExtractedEntity
+    doc = db.session.get(Document, doc_id)
+    doc.raw_text = "Workshop on Machine Learning held on 15 March 2024"
+    doc.category = "Workshop"
+    doc.status = "needs_review"
+    db.session.add(Event(document_id=doc_id, name="Workshop on Machine Learning",
+                         date=date(2024, 3, 15), department="CSE", category="Workshop",
+                         type="Certificate", status="validated", validated=True))
+    for entity_type, value in [('event_name', 'Workshop on Machine Learning'), ('date', '2024-03-15')]:
+        db.session.add(ExtractedEntity(document_id=doc_id, entity_type=entity_type,
+                                       entity_value=value, confidence=0.9))
+    db.session.add(ExtractedEntity(document_id=doc_id, entity_type='department',
+                                   entity_value='CSE', confidence=department_confidence))
+    db.session.commit()
+
+
+def test_upload_is_stored_under_its_hash(client):
+    res = upload(client, PDF_BYTES, name='My Certificate.pdf')
+    assert res.status_code == 202 and res.json['status'] == 'queued'
+
+    stored = sorted(p.name for p in (client.tmp_path / 'uploads').iterdir())
+    assert stored == [f"{hashlib.sha256(PDF_BYTES).hexdigest()}.pdf"]
+
+    file_res = client.get(f"/api/document/{res.json['document_id']}/file")
+    assert file_res.status_code == 200 and file_res.data == PDF_BYTES
+
+
+def test_non_ascii_name_keeps_its_extension(client):
+    from models import db, Document
+
+    res = upload(client, PDF_BYTES, name='报告.pdf')
+    doc = db.session.get(Document, res.json['document_id'])
+    assert doc.filename == 'upload.pdf'
+    assert doc.stored_filename == f"{hashlib.sha256(PDF_BYTES).hexdigest()}.pdf"
+
+    file_res = client.get(f"/api/document/{doc.id}/file")
+    assert file_res.status_code == 200 and file_res.data == PDF_BYTES
+
+    doc.filename = 'pdf'        # stored before uploads fell back to upload.<ext>
+    assert doc.stored_filename == f"{hashlib.sha256(PDF_BYTES).hexdigest()}.pdf"
+
+
+def test_duplicate_of_processed_upload_reuses_results(client):
+    from models import db, Document
+
+    first = upload(client, PDF_BYTES).json['document_id']
+    # Not processed yet: the same bytes are simply queued again
+    assert upload(client, PDF_BYTES, name='again.pdf').status_code == 202
+    mark_processed(first)
+    jobs = queued_jobs(client)
+
+    res = upload(client, PDF_BYTES, name='copy.pdf')
+    assert res.status_code == 201
+    assert res.json['duplicate_of'] == first and res.json['status'] == 'needs_review'
+    assert queued_jobs(client) == jobs
+    assert len(list((client.tmp_path / 'uploads').iterdir())) == 1
+
+    doc = db.session.get(Document, res.json['document_id'])
+    source = db.session.get(Document, first)
+    assert doc.raw_text == source.raw_text and doc.filename == 'copy.pdf'
+    assert [e.id for e in doc.events] == [res.json['event_id']]
+    event = doc.events[0]
+    assert (event.name, event.date, event.type) == ("Workshop on Machine Learning", date(2024, 3, 15), "Certificate")
+    assert (event.status, event.validated) == ("pending", False)
+    assert sorted((e.entity_type, e.entity_value) for e in doc.entities) == \
+        sorted((e.entity_type, e.entity_value) for e in source.entities)
+
+
+def test_duplicate_keeps_uploader_department_unless_extracted(client, login):
+    from models import db, Document, Event
+
+    mark_processed(upload(client, PDF_BYTES).json['document_id'])
+    other = login('student2')
+
+    # CSE was only student1's fallback: student2's copy stays in ECE
+    res = upload(other, PDF_BYTES, name='mine.pdf')
+    doc = db.session.get(Document, res.json['document_id'])
+    assert doc.department == 'ECE' and db.session.get(Event, res.json['event_id']).department == 'ECE'
+    assert {e.entity_type: e.entity_value for e in doc.entities}['department'] == 'ECE'
+
+    # Named in the text itself: the department travels with the file
+    first = upload(client, PDF_BYTES + b'%', name='other.pdf').json['document_id']
+    mark_processed(first, department_confidence=0.9)
+    res = upload(other, PDF_BYTES + b'%', name='mine.pdf')
+    assert db.session.get(Document, res.json['document_id']).department == 'CSE'
+    assert db.session.get(Event, res.json['event_id']).department == 'CSE'
+
+
+def test_oversized_upload_is_refused_while_streaming(client):
+    res = upload(client, b"%PDF-1.4\n" + b"0" * (1024 * 1024 + 1))
+    assert res.status_code == 413 and res.json['success'] is False
+    assert list((client.tmp_path / 'uploads').iterdir()) == []
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
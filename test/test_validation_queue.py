@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the paginated validation queue (GET /api/validate/events).
+
+  - one request costs the same number of SQL queries whatever the queue
+    size (no per-row lazy load of the uploader)
+  - walking the pages with ?after= returns every unvalidated event exactly
+    once, oldest upload first (ties broken by event id)
+  - teachers only see their department; bad ?after= / ?limit= is a 400
+
+Usage:
+    python -m pytest -q test/test_validation_queue.py
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def app_users():
+    return [('iqc', 'iqc', 'ALL'), ('teacher1', 'teacher', 'AIML')]
+
+
+def seed(count, start_id=0):
+    """`count` events, one document each; every third pair shares an upload time."""
+    from models import db, Document, Event
+    start = datetime(2024, 1, 1)
+    for i in range(start_id, start_id + count):
+        doc = Document(filename=f'report_{i}.pdf', uploaded_by=f'student{i % 5}', status='needs_review',
+                       department='AIML' if i % 2 else 'CSE-DS', uploaded_at=start + timedelta(hours=i - i % 3))
+        db.session.add(doc)
+        db.session.flush()
+        db.session.add(Event(document_id=doc.id, name=f'Event {i}', date=date(2024, 3, 1),
+                             department=doc.department, category='Workshop', validated=(i % 7 == 0)))
+    db.session.commit()
+
+
+def expected_order(department=None):
+    from models import Event
+    rows = [(e.document.uploaded_at, e.id) for e in Event.query.filter_by(validated=False)
+            if department in (None, e.department)]
+    return [event_id for _, event_id in sorted(rows)]
+
+
+def test_query_count_does_not_grow_with_queue(login, record_queries):
+    iqc = login('iqc')
+    fetch = lambda: iqc.get('/api/validate/events?limit=200')
+
+    seed(10)
+    with record_queries() as small:
+        res = fetch()
+    assert len(res.json['events']) == len(expected_order())
+
+    seed(150, start_id=10)
+    with record_queries() as large:
+        res = fetch()
+    assert len(res.json['events']) == len(expected_order())
+    assert len(large) == len(small)
+
+
+def test_pages_cover_queue_in_upload_order(login):
+    seed(40)
+    iqc = login('iqc')
+
+    ids, after, pages = [], None, 0
+    while True:
+        res = iqc.get('/api/validate/events', query_string={'limit': 7, **({'after': after} if after else {})})
+        assert res.status_code == 200 and len(res.json['events']) <= 7
+        ids += [e['id'] for e in res.json['events']]
+        after, pages = res.json['next_after'], pages + 1
+        if after is None:
+            break
+
+    assert ids == expected_order()
+    assert pages == -(-len(ids) // 7)
+    first = iqc.get('/api/validate/events?limit=1').json['events'][0]
+    assert first['uploaded_by'] == 'student1' and first['validated'] is False
+
+
+def test_teacher_sees_own_department_and_bad_args_rejected(login):
+    seed(20)
+    teacher = login('teacher1')
+
+    res = teacher.get('/api/validate/events')
+    assert [e['id'] for e in res.json['events']] == expected_order('AIML')
+    assert res.json['next_after'] is None
+
+    assert teacher.get('/api/validate/events?after=abc').status_code == 400
+    assert teacher.get('/api/validate/events?limit=ten').status_code == 400
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))